@@ -5,6 +5,8 @@
 #
 #		--fIn <file> : Nom du fichier de paramètre au format Json (par défaut "./examples/johanna.json")
 #
+# Les tests (doctests de tous les modules) se lancent à part avec ./tests.sh
+#
 
 SRC="./src"
 
@@ -14,12 +16,4 @@ else
     FILE=${1}
 fi
 
-${SRC}/Geom.py && \
-${SRC}/Direction.py && \
-${SRC}/Models.py && \
-${SRC}/Zbrent.py && \
-${SRC}/Zbrac.py && \
-${SRC}/Chainette.py && \
-${SRC}/Developp.py && \
-
 time -p ${SRC}/Pyjunk.py --fIn ${FILE}
@@ -0,0 +1,463 @@
+#! /bin/env python3
+# -*- coding: utf-8 -*-
+
+################################################################################
+#
+#   This file is part of PYJUNK.
+#
+#   Copyright © 2021 Marc JOURDAIN
+#
+#   Permission is hereby granted, free of charge, to any person obtaining a
+#   copy of this software and associated documentation files (the “Software”),
+#   to deal in the Software without restriction, including without limitation
+#   the rights to use, copy, modify, merge, publish, distribute, sublicense,
+#   and/or sell copies of the Software, and to permit persons to whom the
+#   Software is furnished to do so, subject to the following conditions:
+#
+#   The above copyright notice and this permission notice shall be included
+#   in all copies or substantial portions of the Software.
+#
+#   THE SOFTWARE IS PROVIDED “AS IS”, WITHOUT WARRANTY OF ANY KIND, EXPRESS
+#   OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+#   FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+#   AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+#   LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+#   FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER
+#   DEALINGS IN THE SOFTWARE.
+#
+#   You should have received a copy of the MIT License
+#   along with PYJUNK.  If not, see <https://mit-license.org/>.
+#
+################################################################################
+
+"""
+    Cache.py rassemble la définition des classes:
+        Cache
+        Cachedisque
+"""
+
+import sys
+import pathlib
+import os
+import json
+from collections import OrderedDict
+
+import numpy as np
+
+#----- constantes pour finir le programme
+NORMAL_TERMINATION = 0
+ABNORMAL_TERMINATION = 1
+
+#----- Classe représentant un cache borné avec éviction LRU et stockage disque facultatif
+class Cache:
+
+    """
+
+        Classe Cache
+        ============
+
+        La classe Cache est un cache clé -> valeur de taille bornée construit par dict.
+        Les clés sont des tuples d'entiers, les valeurs des flottants.
+        En mémoire, les entrées sont rangées de la moins récemment utilisée à la plus
+        récemment utilisée, au delà de nMax entrées la moins récemment utilisée est évincée.
+        Si un fichier est donné, le cache est relu au départ et sauvé à la fin
+        (au format json) pour survivre d'une exécution à l'autre.
+
+        :datas:
+
+            self.dictCache:  dict
+            self.nMax:       int
+            self.fileCache:  str
+            self.odEntrees:  OrderedDict
+            self.nHits:      int
+            self.nMisses:    int
+            self.nEvictions: int
+
+        :Example:
+
+        >>> a = Cache({"nMax": 2})
+        >>> a.put((1, 2), 10.)
+        >>> a.put((3, 4), 20.)
+        >>> a.get((1, 2))
+        10.0
+        >>> a.put((5, 6), 30.)
+        >>> print(a.get((3, 4)))
+        None
+        >>> a.getStats()
+        {'entrees': 2, 'hits': 1, 'misses': 1, 'evictions': 1}
+        >>> print(a)
+        Cache --> 2/2 entrées, hits = 1, misses = 1, evictions = 1
+
+        .. seealso::
+        .. warning::
+        .. note::
+        .. todo::
+
+    """
+
+    __version = 1
+
+    #-----
+    def __init__(self, dictCache: dict) -> None:
+
+        self.dictCache = dictCache
+
+        # nMax : entier >= 1, par défaut 100000
+        self.nMax = 100000
+        if "nMax" in self.dictCache:
+            if isinstance(self.dictCache["nMax"], int) and self.dictCache["nMax"] >= 1:
+                self.nMax = self.dictCache["nMax"]
+            else:
+                print(f'< !!!! > Clé "nMax" incorrecte pour le cache valeur par défaut affectée')
+
+        # fileCache : facultatif, pas de stockage disque par défaut
+        self.fileCache = None
+        if "fileCache" in self.dictCache and isinstance(self.dictCache["fileCache"], str):
+            self.fileCache = self.dictCache["fileCache"]
+
+        self.odEntrees = OrderedDict()
+        self.nHits = 0
+        self.nMisses = 0
+        self.nEvictions = 0
+
+    #-----
+    def get(self, tKey: tuple) -> float:
+
+        """
+            retourne la valeur associée à la clé, None si la clé est absente
+
+            :param: tuple
+            :rtype: float
+
+        """
+
+        if tKey in self.odEntrees:
+            self.odEntrees.move_to_end(tKey)
+            self.nHits += 1
+            return self.odEntrees[tKey]
+
+        self.nMisses += 1
+        return None
+
+    #-----
+    def put(self, tKey: tuple, fValue: float) -> None:
+
+        """
+            range la valeur associée à la clé, en évinçant si besoin
+
+            :param: tuple, float
+            :rtype: None
+
+        """
+
+        self.odEntrees[tKey] = fValue
+        self.odEntrees.move_to_end(tKey)
+        while len(self.odEntrees) > self.nMax:
+            self.odEntrees.popitem(last=False)
+            self.nEvictions += 1
+
+    #-----
+    def load(self) -> None:
+
+        """
+            relit le cache depuis le fichier s'il existe
+            un fichier illisible (Json invalide ou de forme inattendue) ou d'une autre version
+            est ignoré
+
+            :param: aucun
+            :rtype: None
+
+            :Example:
+
+            >>> import tempfile
+            >>> fileCache = os.path.join(tempfile.mkdtemp(), 'cache.json')
+            >>> a = Cache({"nMax": 10, "fileCache": fileCache})
+            >>> for i in ('[1, 2]', '{"version": 1, "entrees": [3]}', '{"version": 1, "entrees": [[[1], 2]]}'):
+            ...     with open(fileCache, 'w') as fileOut:
+            ...         n = fileOut.write(i)
+            ...     a.load()  # doctest: +ELLIPSIS
+            < !!!! > Fichier cache ".../cache.json" illisible, il est ignoré
+            < !!!! > Fichier cache ".../cache.json" illisible, il est ignoré
+            < !!!! > Fichier cache ".../cache.json" illisible, il est ignoré
+            >>> len(a.odEntrees)
+            0
+
+        """
+
+        if self.fileCache is None or not os.path.isfile(self.fileCache):
+            return
+
+        try:
+
+            with open(self.fileCache, 'r') as fileIn:
+                dictFile = json.load(fileIn)
+
+        except (OSError, json.JSONDecodeError):
+
+            dictFile = None
+
+        # chaque entrée est une liste [*clé, valeur], les éléments de la clé sont des scalaires
+        if not isinstance(dictFile, dict) or not isinstance(dictFile.get("entrees", []), list) or \
+           not all(isinstance(i, list) and len(i) > 1 and not any(isinstance(j, (list, dict)) for j in i[:-1])
+                   for i in dictFile.get("entrees", [])):
+            print(f'< !!!! > Fichier cache "{self.fileCache}" illisible, il est ignoré')
+            return
+
+        if dictFile.get("version") != Cache.__version:
+            print(f'< !!!! > Fichier cache "{self.fileCache}" d\'une autre version, il est ignoré')
+            return
+
+        for i in dictFile.get("entrees", []):
+            self.put(tuple(i[:-1]), i[-1])
+
+    #-----
+    def save(self) -> None:
+
+        """
+            sauve le cache dans le fichier, de la moins récemment utilisée
+            à la plus récemment utilisée, l'écriture passe par un fichier temporaire
+
+            :param: aucun
+            :rtype: None
+
+            :Example:
+
+            >>> import tempfile
+            >>> fileCache = os.path.join(tempfile.mkdtemp(), 'cache.json')
+            >>> a = Cache({"nMax": 10, "fileCache": fileCache})
+            >>> a.put((1, 2), 10.)
+            >>> a.save()
+            >>> b = Cache({"nMax": 10, "fileCache": fileCache})
+            >>> b.load()
+            >>> b.get((1, 2))
+            10.0
+
+        """
+
+        if self.fileCache is None:
+            return
+
+        dictFile = {"version": Cache.__version,
+                    "entrees": [[*k, v] for (k, v) in self.odEntrees.items()]}
+
+        fileTmp = f'{self.fileCache}.tmp'
+        with open(fileTmp, 'w') as fileOut:
+            json.dump(dictFile, fileOut)
+        os.replace(fileTmp, self.fileCache)
+
+    #-----
+    def getStats(self) -> dict:
+
+        """ retourne les compteurs du cache """
+
+        return {"entrees": len(self.odEntrees), "hits": self.nHits, "misses": self.nMisses,
+                "evictions": self.nEvictions}
+
+    #-----
+    def __str__(self) -> str:
+
+        return f'Cache --> {len(self.odEntrees)}/{self.nMax} entrées, hits = {self.nHits}, ' \
+               f'misses = {self.nMisses}, evictions = {self.nEvictions}'
+
+#----- Classe représentant un cache disque de tableaux, borné en octets
+class Cachedisque:
+
+    """
+
+        Classe Cachedisque
+        ==================
+
+        La classe Cachedisque range des dict de tableaux numpy dans un répertoire,
+        un fichier .npz par clé, pour les retrouver d'une exécution à l'autre.
+        Les clés sont des tuples (de chaînes, d'entiers, de booléens) transformés en nom de fichier.
+        Le cache est borné en octets : au delà de nMaxOctets, les fichiers les moins récemment
+        utilisés (date de modification, mise à jour à chaque lecture) sont supprimés.
+        Les écritures passent par un fichier temporaire, plusieurs processus peuvent
+        partager le même répertoire.
+
+        :datas:
+
+            self.dictCache:  dict
+            self.dirCache:   str
+            self.nMaxOctets: int
+            self.nOctets:    int
+            self.nHits:      int
+            self.nMisses:    int
+            self.nEvictions: int
+
+        :Example:
+
+        >>> import tempfile
+        >>> a = Cachedisque({"dirCache": tempfile.mkdtemp(), "nMaxOctets": 8400})
+        >>> a.put(("abc", "table", True), {"npA": np.arange(3.)})
+        >>> a.get(("abc", "table", True))
+        {'npA': array([0., 1., 2.])}
+        >>> print(a.get(("abc", "table", False)))
+        None
+        >>> a.put(("def", "table", True), {"npA": np.zeros(1000)})
+        >>> print(a.get(("abc", "table", True)))
+        None
+        >>> {k: v for (k, v) in a.getStats().items() if k != "octets"}
+        {'entrees': 1, 'hits': 1, 'misses': 2, 'evictions': 1}
+
+        .. seealso:: Cache
+        .. warning::
+        .. note::
+        .. todo::
+
+    """
+
+    #-----
+    def __init__(self, dictCache: dict) -> None:
+
+        self.dictCache = dictCache
+
+        # dirCache : répertoire du cache, créé si besoin
+        if "dirCache" in self.dictCache and isinstance(self.dictCache["dirCache"], str):
+            self.dirCache = self.dictCache["dirCache"]
+        else:
+            print(f'< !!!! > Pas de clé "dirCache" ou clé incorrecte pour le cache disque')
+            print(f'program aborted')
+            sys.exit(ABNORMAL_TERMINATION)
+        os.makedirs(self.dirCache, exist_ok=True)
+
+        # nMaxOctets : entier >= 1, par défaut 500 Mo
+        self.nMaxOctets = 500*1024*1024
+        if "nMaxOctets" in self.dictCache:
+            if isinstance(self.dictCache["nMaxOctets"], int) and self.dictCache["nMaxOctets"] >= 1:
+                self.nMaxOctets = self.dictCache["nMaxOctets"]
+            else:
+                print(f'< !!!! > Clé "nMaxOctets" incorrecte pour le cache disque valeur par défaut affectée')
+
+        self.nOctets = sum(i.stat().st_size for i in self.getFichiers())
+        self.nHits = 0
+        self.nMisses = 0
+        self.nEvictions = 0
+
+    #-----
+    def getFichiers(self) -> list:
+
+        """ retourne les fichiers du cache (os.DirEntry) """
+
+        return [i for i in os.scandir(self.dirCache) if i.is_file() and i.name.endswith('.npz')]
+
+    #-----
+    def getChemin(self, tKey: tuple) -> str:
+
+        """ retourne le chemin du fichier associé à la clé """
+
+        return os.path.join(self.dirCache, '_'.join(str(i) for i in tKey) + '.npz')
+
+    #-----
+    def get(self, tKey: tuple) -> dict:
+
+        """
+            retourne le dict de tableaux associé à la clé, None si la clé est absente
+            un fichier illisible est supprimé et compte comme absent
+
+            :param: tuple
+            :rtype: dict
+
+        """
+
+        sChemin = self.getChemin(tKey)
+        try:
+
+            with np.load(sChemin, allow_pickle=False) as npzFile:
+                dictTableaux = {k: npzFile[k] for k in npzFile.files}
+            os.utime(sChemin)
+
+        except FileNotFoundError:
+
+            self.nMisses += 1
+            return None
+
+        except (OSError, ValueError):
+
+            print(f'< !!!! > Fichier cache "{sChemin}" illisible, il est supprimé')
+            self.supprimer(sChemin)
+            self.nMisses += 1
+            return None
+
+        self.nHits += 1
+        return dictTableaux
+
+    #-----
+    def put(self, tKey: tuple, dictTableaux: dict) -> None:
+
+        """
+            range le dict de tableaux associé à la clé, en évinçant si besoin
+            les fichiers les moins récemment utilisés
+
+            :param: tuple, dict
+            :rtype: None
+
+        """
+
+        sChemin = self.getChemin(tKey)
+        fileTmp = f'{sChemin}.{os.getpid()}.tmp'
+        with open(fileTmp, 'wb') as fileOut:
+            np.savez(fileOut, **dictTableaux)
+        if os.path.isfile(sChemin):
+            self.nOctets -= os.path.getsize(sChemin)
+        os.replace(fileTmp, sChemin)
+        self.nOctets += os.path.getsize(sChemin)
+
+        if self.nOctets > self.nMaxOctets:
+            self.evincer(sGarde=sChemin)
+
+    #-----
+    def evincer(self, sGarde: str = None) -> None:
+
+        """ supprime les fichiers les moins récemment utilisés jusqu'à repasser sous nMaxOctets """
+
+        lFichiers = sorted(self.getFichiers(), key=lambda i: i.stat().st_mtime_ns)
+        self.nOctets = sum(i.stat().st_size for i in lFichiers)
+        for i in lFichiers:
+            if self.nOctets <= self.nMaxOctets:
+                break
+            if i.path == sGarde:
+                continue
+            self.nOctets -= i.stat().st_size
+            self.supprimer(i.path)
+            self.nEvictions += 1
+
+    #-----
+    def supprimer(self, sChemin: str) -> None:
+
+        """ supprime un fichier du cache, il a pu l'être par un autre processus """
+
+        try:
+            os.remove(sChemin)
+        except FileNotFoundError:
+            pass
+
+    #-----
+    def getStats(self) -> dict:
+
+        """ retourne les compteurs du cache """
+
+        return {"entrees": len(self.getFichiers()), "octets": self.nOctets, "hits": self.nHits,
+                "misses": self.nMisses, "evictions": self.nEvictions}
+
+    #-----
+    def __str__(self) -> str:
+
+        return f'Cachedisque --> {self.dirCache} {self.nOctets}/{self.nMaxOctets} octets, ' \
+               f'hits = {self.nHits}, misses = {self.nMisses}, evictions = {self.nEvictions}'
+
+#----- start here
+if __name__ == '__main__':
+
+    import doctest
+
+    (failureCount, testCount) = doctest.testmod(verbose=False)
+
+    print(f'nombre de tests : {testCount:>3d}, nombre d\'erreurs : {failureCount:>3d}', end='')
+
+    if failureCount != 0:
+        print(f' --> Arrêt du programme {pathlib.Path(__file__)}')
+        sys.exit(ABNORMAL_TERMINATION)
+    else:
+        print(f' --> All Ok {pathlib.Path(__file__)}')
+        sys.exit(NORMAL_TERMINATION)
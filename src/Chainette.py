@@ -34,19 +34,177 @@
     Chainette.py rassemble la définition des classes:
         Chainette
             Chainettedict(Chainette)
+        Chainettesdict
+        Tablechainette
 """
 
+from __future__ import annotations
+
 import sys
 import pathlib
 import math
 
+import numpy as np
+
 import Zbrac as zc
 import Zbrent as zb
+import Znewton as zn
+import Cache as ca
 
 #----- constantes pour finir le programme
 NORMAL_TERMINATION = 0
 ABNORMAL_TERMINATION = 1
 
+#----- pas de quantification (mm) des clés du cache des chainettes
+QUANTUM_CACHE = 1.e-6
+
+#-----
+def getCacheKey(fDist: float, fCreux: float) -> tuple:
+
+    """
+        retourne la clé quantifiée d'une chainette pour le cache
+
+        :param: float, float
+        :rtype: tuple
+
+        :Example:
+
+        >>> getCacheKey(4.435682544533595, 1.)
+        (4435683, 1000000)
+
+    """
+
+    return (int(round(fDist/QUANTUM_CACHE)), int(round(fCreux/QUANTUM_CACHE)))
+
+#-----
+def interpMonotone(npX: np.ndarray, npY: np.ndarray, npXFin: np.ndarray) -> np.ndarray:
+
+    """
+        interpolation cubique d'Hermite monotone (Fritsch-Carlson) des points (npX, npY),
+        npX strictement croissant : la courbe est lisse, passe par les points et ne dépasse
+        pas les valeurs voisines (pas d'oscillation aux cassures des modèles de creux)
+
+        :param: np.ndarray, np.ndarray, np.ndarray
+        :rtype: np.ndarray
+
+        :Example:
+
+        >>> interpMonotone(np.array([0., 1., 2., 3.]), np.array([0., 1., 1., 1.]), np.array([0.5, 1.5, 3.]))
+        array([0.6875, 1.    , 1.    ])
+        >>> interpMonotone(np.array([0., 1., 2.]), np.array([0., 1., 4.]), np.array([0.5, 1.5]))
+        array([0.3125, 2.1875])
+
+    """
+
+    npH = np.diff(npX)
+    npPentes = np.diff(npY)/npH
+    if npX.size < 3:
+        return np.interp(npXFin, npX, npY)
+
+    # dérivées aux points : moyenne harmonique pondérée des pentes voisines, nulle aux extrema
+    npD = np.zeros_like(npY)
+    (npP0, npP1) = (npPentes[:-1], npPentes[1:])
+    (npW0, npW1) = (2.*npH[1:] + npH[:-1], npH[1:] + 2.*npH[:-1])
+    with np.errstate(divide='ignore', invalid='ignore'):
+        npD[1:-1] = np.where(npP0*npP1 > 0., (npW0 + npW1)/(npW0/npP0 + npW1/npP1), 0.)
+
+    # aux extrémités, formule à 3 points bornée
+    for (i, h0, h1, p0, p1) in ((0, npH[0], npH[1], npPentes[0], npPentes[1]),
+                                (-1, npH[-1], npH[-2], npPentes[-1], npPentes[-2])):
+        fD = ((2.*h0 + h1)*p0 - h0*p1)/(h0 + h1)
+        if fD*p0 <= 0.:
+            fD = 0.
+        elif p0*p1 <= 0. and abs(fD) > abs(3.*p0):
+            fD = 3.*p0
+        npD[i] = fD
+
+    # les polynômes d'Hermite de chaque intervalle
+    npI = np.clip(np.searchsorted(npX, npXFin, side='right') - 1, 0, npX.size - 2)
+    npT = (npXFin - npX[npI])/npH[npI]
+    npT2 = npT*npT
+    npT3 = npT2*npT
+    return (2.*npT3 - 3.*npT2 + 1.)*npY[npI] + (npT3 - 2.*npT2 + npT)*npH[npI]*npD[npI] \
+           + (-2.*npT3 + 3.*npT2)*npY[npI+1] + (npT3 - npT2)*npH[npI]*npD[npI+1]
+
+#----- Class Tablechainette
+class Tablechainette:
+
+    """
+
+        Classe Tablechainette
+        =====================
+
+        La classe Tablechainette résout l'équation de la chainette c = a*(cosh(d/a) - 1)
+        par une table inverse adimensionnelle :
+            avec t = d/a, on a r = c/d = (cosh(t) - 1)/t, qui ne dépend que de t
+            r est strictement croissant avec t, on tabule donc log(t) en fonction de log(r)
+        La table est calculée une fois pour toutes au chargement du module.
+        Pour un couple (d, c), t est interpolé dans la table puis corrigé par
+        nIterNewton pas de Newton, d'où a = d/t.
+        En dehors de la table, la résolution est laissée à Zbrac et Zbrent.
+
+        :datas:
+
+            npT:     np.ndarray
+            npLogT:  np.ndarray
+            npLogR:  np.ndarray
+            fRmin:   float
+            fRmax:   float
+
+        :Example:
+
+        >>> (fA, bIn) = Tablechainette.solve(4.435682544533595, 1.)
+        >>> print(f'{float(fA):.8f} {bool(bIn)}')
+        10.00000000 True
+        >>> Tablechainette.solve(np.array([10., 10., 10.]), np.array([1., 1.e-8, 1.e5]))[1]
+        array([ True, False, False])
+
+        .. seealso:: Chainettedict, Chainettesdict
+        .. warning:: d (demi écartement) doit être strictement positif
+        .. note::
+        .. todo::
+
+    """
+
+    nIterNewton = 2
+
+    npT = np.geomspace(1.e-6, 1.e1, 4096)
+    npLogT = np.log(npT)
+    npLogR = np.log(2.*np.sinh(npT/2.)**2/npT)
+    fRmin = float(np.exp(npLogR[0]))
+    fRmax = float(np.exp(npLogR[-1]))
+
+    #-----
+    @staticmethod
+    def solve(npDist, npCreux) -> tuple:
+
+        """
+            retourne les "a" des chainettes et l'indicateur "dans la table"
+            fonctionne indifféremment avec des float ou des np.ndarray
+            les éléments hors table ont un "a" sans signification
+
+            :param npDist: demi écartement
+            :param npCreux: creux
+            :return: (a, dans la table)
+            :rtype: tuple
+
+        """
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+
+            npR = npCreux/npDist
+            npIn = (npR >= Tablechainette.fRmin) & (npR <= Tablechainette.fRmax)
+            npR = np.where(npIn, npR, Tablechainette.fRmin)
+
+            # interpolation dans la table puis polissage par Newton
+            # g(t) = (cosh(t)-1)/t - r, g'(t) = (t*sinh(t) - (cosh(t)-1))/t²
+            npT = np.exp(np.interp(np.log(npR), Tablechainette.npLogR, Tablechainette.npLogT))
+            for _ in range(Tablechainette.nIterNewton):
+                npCm1 = 2.*np.sinh(npT/2.)**2
+                npT = npT - (npCm1/npT - npR)*npT*npT/(npT*np.sinh(npT) - npCm1)
+
+        return (npDist/npT, npIn)
+
 #----- Class Chainette
 class Chainette:
 
@@ -132,6 +290,30 @@ class Chainette:
         self.fA = fX
         return self.comp(fD)
 
+    #-----
+    def compBisDeriv(self, fX:float, fD:float) -> float:
+
+        """
+            la dérivée de compBis par rapport à x
+            y' = cosh(d/x) - 1 - (d/x) * sinh(d/x)
+
+            :param: float
+            :rtype: float
+
+            :Example:
+
+            >>> a = Chainette(fA=10., fC=1.)
+            >>> a.compBisDeriv(fX=10., fD=5.)
+            -0.132921687540493
+            >>> fH = 1.e-6
+            >>> round((a.compBis(fX=10.+fH, fD=5.) - a.compBis(fX=10.-fH, fD=5.))/(2.*fH), 8)
+            -0.13292169
+
+        """
+
+        fU = fD/fX
+        return math.cosh(fU) - 1. - fU*math.sinh(fU)
+
     #-----
     def compCurv(self, fX: float= 0.) -> float:
 
@@ -173,21 +355,50 @@ class Chainettedict(Chainette):
         En fait il s'agit, pour un creux donné et un écartement donné,
         de trouver le "a" de la chainette
         l'écartement est l'écartement "total" entre les 2 "zéros"
+        le solveur est choisi par la clé facultative "solveur" :
+            "table"  (par défaut) le "a" est lu dans la table Tablechainette,
+                     Zbrac et Zbrent ne sont utilisés qu'en dehors de la table
+            "newton" encadrement par Zbrac puis Newton-Raphson sécurisé (Znewton)
+                     avec la dérivée analytique compBisDeriv, à partir de la clé
+                     facultative "aInit" (par exemple le "a" de la section voisine)
+            "brent"  encadrement par Zbrac puis Zbrent, à partir de écartement/4
+        la clé facultative "cache" (un Cache) évite de refaire un calcul d'optimisation
+        pour un couple (écartement, creux) déjà résolu, à QUANTUM_CACHE près
 
         :datas:
 
             self.dictChainette: dict
             self.fDist:         float
             self.fCreux:        float
+            self.sSolveur:      str
             self._oK:           boolean
             self.fA:            float
+            self.nItersZbrac:   int
+            self.nItersZbrent:  int
+            self.nItersZnewton: int
 
         :Example:
 
         >>> a = Chainettedict({"creux":1.,"ecartement":8.87136508906719})
         >>> print(a)
-        Chainette --> A = 10.00000000474504, C = 1.0
+        Chainette --> A = 10.000000003028365, C = 1.0
         >>> b = Chainettedict({"creux":0,"ecartement":8.87136508906719})
+        >>> c = Chainettedict({"creux":2000.,"ecartement":2.})
+        >>> print(c.nItersZbrac, c.nItersZbrent)
+        4 7
+        >>> d = Chainettedict({"creux":1.,"ecartement":8.87136508906719, "solveur": "brent"})
+        >>> d.getNiters()
+        {'zbrac': 4, 'zbrent': 6, 'znewton': 0}
+        >>> e = Chainettedict({"creux":1.,"ecartement":8.87136508906719, "solveur": "newton", "aInit": 9.8})
+        >>> e.getNiters()
+        {'zbrac': 2, 'zbrent': 0, 'znewton': 4}
+        >>> print(f'{e.fA:.8f}')
+        10.00000000
+        >>> cache = ca.Cache({"nMax": 10})
+        >>> f = Chainettedict({"creux":1.,"ecartement":8.87136508906719, "solveur": "brent", "cache": cache})
+        >>> g = Chainettedict({"creux":1.,"ecartement":8.87136508906719, "solveur": "brent", "cache": cache})
+        >>> print(f.getNiters()["zbrent"], g.getNiters()["zbrent"], g.fA == f.fA)
+        6 0 True
 
         .. seealso::
         .. warning::
@@ -217,36 +428,87 @@ class Chainettedict(Chainette):
             print(f'program aborted')
             sys.exit(ABNORMAL_TERMINATION)
 
+        # solveur : facultatif, par défaut "table"
+        self.sSolveur = "table"
+        if "solveur" in self.dictChainette:
+            if self.dictChainette["solveur"] in ("table", "newton", "brent"):
+                self.sSolveur = self.dictChainette["solveur"]
+            else:
+                print(f'< !!!! > Clé "solveur" incorrecte valeur par défaut affectée')
+
         Chainette.__init__(self, fA=1., fC=self.fCreux)
 
         self._oK = False
+        self.nItersZbrac = 0
+        self.nItersZbrent = 0
+        self.nItersZnewton = 0
 
         # on effectue le calcul d'optimisation qu'à la condition que fCreux ne soit pas nul
         # sinon la chainette est dégénérée en droite
         if self.fCreux != 0.:
 
             self._oK = True
+
+            # d'abord la table, le calcul d'optimisation n'est fait qu'en dehors de la table
+            if self.sSolveur == "table":
+                (fA, bIn) = Tablechainette.solve(self.fDist, self.fCreux)
+                if bIn:
+                    self.fA = float(fA)
+                    return
+
+            # ensuite le cache des solutions déjà calculées
+            cache = self.dictChainette.get("cache")
+            if cache is not None:
+                tKey = getCacheKey(self.fDist, self.fCreux)
+                fA = cache.get(tKey)
+                if fA is not None:
+                    self.fA = fA
+                    return
+
+            # le point de départ : la solution voisine pour newton si elle est fournie
+            fInit = self.fDist/2.
+            if self.sSolveur == "newton" and "aInit" in self.dictChainette:
+                fInit = self.dictChainette["aInit"]
+
             zBrac = zc.Zbrac(self.compBis, self.fDist)
-            if zBrac.solve(self.fDist/2., "D") != 0:
+            if zBrac.solve(fInit, "D") != 0:
 
                 print(f'Encadrement non trouvé pour la chainette --> voile inconstructible')
                 print(f'd = {self.fDist} c = {self.fCreux}')
                 sys.exit(ABNORMAL_TERMINATION)
 
-            #print(f'Nombre d\'itérations zchainette = {zBrac.getNiters():d}')
+            self.nItersZbrac = zBrac.getNiters()
             (fX1, fX2) = zBrac.getFresult()
 
             fErr = 1.e-8
-            zBrent = zb.Zbrent(self.compBis, fErr, self.fDist)
-            if zBrent.solve(fX1, fX2) != 0:
+            if self.sSolveur == "newton":
 
-                print(f'Pas de solution pour la chainette --> voile inconstructible')
-                print(f'x1 = {fX1} x2 = {fX2}')
-                print(f'd = {self.fDist} c = {self.fCreux}')
-                sys.exit(ABNORMAL_TERMINATION)
+                zNewton = zn.Znewton(self.compBis, self.compBisDeriv, fErr, self.fDist)
+                if zNewton.solve(fX1, fX2, fInit) != 0:
+
+                    print(f'Pas de solution pour la chainette --> voile inconstructible')
+                    print(f'x1 = {fX1} x2 = {fX2}')
+                    print(f'd = {self.fDist} c = {self.fCreux}')
+                    sys.exit(ABNORMAL_TERMINATION)
+
+                self.nItersZnewton = zNewton.getNiters()
+                self.fA = zNewton.getFresult()
+
+            else:
+
+                zBrent = zb.Zbrent(self.compBis, fErr, self.fDist)
+                if zBrent.solve(fX1, fX2) != 0:
+
+                    print(f'Pas de solution pour la chainette --> voile inconstructible')
+                    print(f'x1 = {fX1} x2 = {fX2}')
+                    print(f'd = {self.fDist} c = {self.fCreux}')
+                    sys.exit(ABNORMAL_TERMINATION)
 
-            #print(f'Nombre d\'itérations chainette = {zBrent.getNiters():d}')
-            self.fA = zBrent.getFresult()
+                self.nItersZbrent = zBrent.getNiters()
+                self.fA = zBrent.getFresult()
+
+            if cache is not None:
+                cache.put(tKey, self.fA)
 
     #-----
     def comp(self, fX: float) -> float:
@@ -266,6 +528,13 @@ class Chainettedict(Chainette):
             return Chainette.compCurv(self, fX=fX)
         return fX
 
+    #-----
+    def getNiters(self) -> dict:
+
+        """ retourne les nombres d'itérations de chaque solveur """
+
+        return {"zbrac": self.nItersZbrac, "zbrent": self.nItersZbrent, "znewton": self.nItersZnewton}
+
     #-----
     def getDict(self) -> dict:
 
@@ -273,6 +542,319 @@ class Chainettedict(Chainette):
 
         return {"a": self.fA, "l": 2.*self.compCurv(self.fDist)}
 
+#----- Class Chainettesdict
+class Chainettesdict:
+
+    """
+
+        Classe Chainettesdict
+        =====================
+
+        La classe Chainettesdict représente un ensemble de chainettes construit par dict
+        de tableaux. C'est la version tableau de Chainettedict : pour chaque couple
+        (creux, écartement) on cherche le "a" de la chainette dans la table Tablechainette,
+        les chainettes hors table étant résolues d'un seul appel à ZbracArray et ZbrentArray.
+        Si le dict contient déjà les "a", aucun calcul n'est effectué.
+        La clé facultative "cache" (un Cache) est consultée pour les chainettes hors table.
+
+        :datas:
+
+            self.dictChainettes: dict
+            self.npDist:         np.ndarray
+            self.npCreux:        np.ndarray
+            self.npOk:           np.ndarray (bool)
+            self.npA:            np.ndarray
+            self.npNitersZbrac:  np.ndarray (int)
+            self.npNitersZbrent: np.ndarray (int)
+
+        :Example:
+
+        >>> a = Chainettesdict({"creux": np.array([1., 0., 1., 2000.]),
+        ...                     "ecartement": np.array([8.87136508906719, 8.87136508906719, 20., 2.])})
+        >>> print(a)
+        Chainettes --> 4 chainettes, A = [10.          1.         50.16578635  0.09380285]
+        >>> a.getNiters()
+        (array([0, 0, 0, 4]), array([0, 0, 0, 7]))
+
+        .. seealso:: Chainettedict
+        .. warning::
+        .. note::
+        .. todo::
+
+    """
+
+    #-----
+    def __init__(self, dictChainettes: dict) -> None:
+
+        self.dictChainettes = dictChainettes
+
+        # ecartement : obligatoire
+        if "ecartement" in self.dictChainettes:
+            self.npDist = np.asarray(self.dictChainettes["ecartement"], dtype=float)/2.
+        else:
+            print(f'< !!!! > Pas de clé "ecartement" dans le Json')
+            print(f'program aborted')
+            sys.exit(ABNORMAL_TERMINATION)
+
+        # creux : obligatoire
+        if "creux" in self.dictChainettes:
+            self.npCreux = np.asarray(self.dictChainettes["creux"], dtype=float)
+        else:
+            print(f'< !!!! > Pas de clé "creux" dans le Json')
+            print(f'program aborted')
+            sys.exit(ABNORMAL_TERMINATION)
+
+        # les chainettes à creux nul sont dégénérées en droite
+        self.npOk = self.npCreux != 0.
+        self.npA = np.ones_like(self.npDist)
+        self.npNitersZbrac = np.zeros(self.npDist.shape, dtype=int)
+        self.npNitersZbrent = np.zeros(self.npDist.shape, dtype=int)
+
+        # a : facultatif, les chainettes sont déjà résolues
+        if "a" in self.dictChainettes:
+            self.npA = np.asarray(self.dictChainettes["a"], dtype=float)
+            return
+
+        if not self.npOk.any():
+            return
+
+        # d'abord la table, le calcul d'optimisation n'est fait qu'en dehors de la table
+        (npA, npIn) = Tablechainette.solve(self.npDist[self.npOk], self.npCreux[self.npOk])
+        self.npA[self.npOk] = npA
+        npOut = np.zeros_like(self.npOk)
+        npOut[self.npOk] = ~npIn
+        if not npOut.any():
+            return
+
+        # ensuite le cache des solutions déjà calculées
+        cache = self.dictChainettes.get("cache")
+        if cache is not None:
+            for i in np.flatnonzero(npOut):
+                fA = cache.get(getCacheKey(float(self.npDist[i]), float(self.npCreux[i])))
+                if fA is not None:
+                    self.npA[i] = fA
+                    npOut[i] = False
+            if not npOut.any():
+                return
+
+        npDist = self.npDist[npOut]
+        npCreux = self.npCreux[npOut]
+
+        zBrac = zc.ZbracArray(Chainettesdict.compBis, npDist, npCreux)
+        if zBrac.solve(npDist/2., "D") != 0:
+
+            nFirst = np.flatnonzero(zBrac.npError)[0]
+            print(f'Encadrement non trouvé pour la chainette --> voile inconstructible')
+            print(f'd = {npDist[nFirst]} c = {npCreux[nFirst]}')
+            sys.exit(ABNORMAL_TERMINATION)
+
+        self.npNitersZbrac[npOut] = zBrac.getNiters()
+        (npX1, npX2) = zBrac.getFresult()
+
+        fErr = 1.e-8
+        zBrent = zb.ZbrentArray(Chainettesdict.compBis, fErr, npDist, npCreux)
+        if zBrent.solve(npX1, npX2) != 0:
+
+            nFirst = np.flatnonzero(zBrent.npError)[0]
+            print(f'Pas de solution pour la chainette --> voile inconstructible')
+            print(f'x1 = {npX1[nFirst]} x2 = {npX2[nFirst]}')
+            print(f'd = {npDist[nFirst]} c = {npCreux[nFirst]}')
+            sys.exit(ABNORMAL_TERMINATION)
+
+        self.npNitersZbrent[npOut] = zBrent.getNiters()
+        self.npA[npOut] = zBrent.getFresult()
+
+        if cache is not None:
+            for i in np.flatnonzero(npOut):
+                cache.put(getCacheKey(float(self.npDist[i]), float(self.npCreux[i])), float(self.npA[i]))
+
+    #-----
+    @staticmethod
+    def compBis(npX: np.ndarray, npD: np.ndarray, npC: np.ndarray) -> np.ndarray:
+
+        """
+            version tableau de Chainette.compBis
+            y = x * (cosh(d/x) - 1) - c
+
+            :param: np.ndarray
+            :rtype: np.ndarray
+
+            :Example:
+
+            >>> Chainettesdict.compBis(np.array([10., 10.]), np.array([2., 5.]), np.array([1., 1.]))
+            array([-0.79933244,  0.27625965])
+
+        """
+
+        return npX*(np.cosh(npD/npX)-1.)-npC
+
+    #-----
+    def comp(self, npX: np.ndarray) -> np.ndarray:
+
+        """
+            retourne le calcul des chainettes, npX est un tableau dont le premier axe
+            correspond aux chainettes, (nChainettes, ...)
+
+            :param: np.ndarray
+            :rtype: np.ndarray
+
+            :Example:
+
+            >>> a = Chainettesdict({"creux": np.array([1., 0.]), "ecartement": np.array([10., 10.]),
+            ...                     "a": np.array([10., 1.])})
+            >>> a.comp(np.array([[0., 4.], [0., 4.]]))
+            array([[-1.        , -0.18927628],
+                   [ 0.        ,  0.        ]])
+
+        """
+
+        npX = np.asarray(npX, dtype=float)
+        npShape = (-1,) + (1,)*(npX.ndim-1)
+        npA = self.npA[self.npOk].reshape(npShape)
+        npY = np.zeros_like(npX)
+        npY[self.npOk] = npA*(np.cosh(npX[self.npOk]/npA)-1.) - self.npCreux[self.npOk].reshape(npShape)
+        return npY
+
+    #-----
+    def compCurv(self, npX: np.ndarray) -> np.ndarray:
+
+        """
+            retourne l'abscisse curviligne des chainettes, npX est un tableau dont le premier axe
+            correspond aux chainettes, (nChainettes, ...)
+
+            :param: np.ndarray
+            :rtype: np.ndarray
+
+            :Example:
+
+            >>> a = Chainettesdict({"creux": np.array([1., 0.]), "ecartement": np.array([10., 10.]),
+            ...                     "a": np.array([10., 1.])})
+            >>> a.compCurv(np.array([4., 4.]))
+            array([4.10752326, 4.        ])
+
+        """
+
+        npX = np.asarray(npX, dtype=float)
+        npShape = (-1,) + (1,)*(npX.ndim-1)
+        npA = self.npA[self.npOk].reshape(npShape)
+        npL = npX.copy()
+        npL[self.npOk] = npA*np.sinh(npX[self.npOk]/npA)
+        return npL
+
+    #-----
+    def compAdaptatif(self, fTol: float, nMax: int, nFin: int = 256) -> tuple:
+
+        """
+            échantillonne chaque demi chainette de 0 à d/2 en plaçant les points là où
+            elle s'écarte le plus de sa corde : l'écart d'une corde de longueur h est
+            h².y''/8, avec y'' = cosh(x/a)/a, les points équirépartissent donc l'intégrale
+            de sqrt(y''/(8.fTol)) et le nombre d'intervalles est l'arrondi supérieur
+            de cette intégrale (au moins 1, au plus nMax), une droite n'a qu'un intervalle
+            l'écart réel est ensuite mesuré sur une grille fine de nFin intervalles
+
+            retourne le tableau (nChainettes, max(N)+1) des abscisses, complété par d/2,
+            le tableau des nombres d'intervalles N et celui des écarts mesurés
+
+            :param: float, int, int
+            :rtype: tuple
+
+            :Example:
+
+            >>> a = Chainettesdict({"creux": np.array([1., 0.]), "ecartement": np.array([10., 10.]),
+            ...                     "a": np.array([10., 1.])})
+            >>> (npFx, npN, npErreur) = a.compAdaptatif(fTol=0.01, nMax=500)
+            >>> npN
+            array([6, 1])
+            >>> print(np.round(npFx, 3))
+            [[0.    0.85  1.697 2.538 3.371 4.192 5.   ]
+             [0.    5.    5.    5.    5.    5.    5.   ]]
+            >>> bool((npErreur <= 0.01).all())
+            True
+
+        """
+
+        nChainettes = self.npDist.size
+
+        # la densité de points sur une grille fine, nulle pour les droites
+        npXFin = np.outer(self.npDist, np.linspace(0., 1., nFin+1))
+        npDensite = np.zeros_like(npXFin)
+        npA = self.npA[self.npOk][:, np.newaxis]
+        npDensite[self.npOk] = np.sqrt(np.cosh(npXFin[self.npOk]/npA)/npA/(8.*fTol))
+
+        # son intégrale cumulée (trapèzes) donne le nombre d'intervalles et leur placement
+        npCumul = np.zeros_like(npXFin)
+        npCumul[:, 1:] = np.cumsum((npDensite[:, 1:] + npDensite[:, :-1])/2.*np.diff(npXFin, axis=1), axis=1)
+        npN = np.clip(np.ceil(npCumul[:, -1]).astype(int), 1, nMax)
+
+        npFx = np.repeat(self.npDist[:, np.newaxis], npN.max()+1, axis=1)
+        for i in range(nChainettes):
+            if npCumul[i, -1] > 0.:
+                npFx[i, :npN[i]+1] = np.interp(np.linspace(0., npCumul[i, -1], npN[i]+1), npCumul[i], npXFin[i])
+            else:
+                npFx[i, :npN[i]+1] = np.linspace(0., self.npDist[i], npN[i]+1)
+
+        # l'écart entre chaque chainette et ses cordes
+        npYFin = self.comp(npXFin)
+        npY = self.comp(npFx)
+        npErreur = np.array([np.abs(np.interp(npXFin[i], npFx[i, :npN[i]+1], npY[i, :npN[i]+1]) - npYFin[i]).max()
+                             for i in range(nChainettes)])
+
+        return (npFx, npN, npErreur)
+
+    #-----
+    def compSurech(self, npFrac: np.ndarray, npFracFin: np.ndarray, npEcartFin: np.ndarray) -> Chainettesdict:
+
+        """
+            retourne les chainettes de sections intermédiaires, sans aucune résolution :
+            la courbure au creux 1/a des chainettes (rangées selon npFrac, nulle pour une droite)
+            est interpolée (interpMonotone) aux fractions npFracFin, le creux de chaque
+            chainette intermédiaire est celui de sa courbure et de son écartement npEcartFin,
+            elle s'appuie donc toujours sur le haut et le bas de sa section
+
+            :param: np.ndarray, np.ndarray, np.ndarray
+            :rtype: Chainettesdict
+
+            :Example:
+
+            >>> a = Chainettesdict({"creux": np.array([0., 1., 1.]), "ecartement": np.array([10., 10., 10.])})
+            >>> b = a.compSurech(np.array([0., 0.5, 1.]), np.array([0., 0.25, 0.5, 1.]), np.full(4, 10.))
+            >>> print(np.round(b.npCreux, 6))
+            [0.       0.682815 1.       1.      ]
+            >>> bool(np.abs(b.comp(np.full((4, 1), 5.))).max() < 1.e-12)
+            True
+
+        """
+
+        npCourbure = np.where(self.npOk, 1./self.npA, 0.)
+        npCourbureFin = interpMonotone(npFrac, npCourbure, npFracFin)
+
+        npOk = npCourbureFin > 0.
+        npA = np.ones_like(npCourbureFin)
+        npA[npOk] = 1./npCourbureFin[npOk]
+        npCreux = np.zeros_like(npCourbureFin)
+        npCreux[npOk] = 2.*npA[npOk]*np.sinh(npEcartFin[npOk]/(4.*npA[npOk]))**2
+
+        return Chainettesdict({"ecartement": npEcartFin, "creux": npCreux, "a": npA})
+
+    #-----
+    def getNiters(self) -> tuple:
+
+        """ retourne les nombres d'itérations Zbrac et Zbrent par chainette """
+
+        return (self.npNitersZbrac, self.npNitersZbrent)
+
+    #-----
+    def getDict(self) -> dict:
+
+        """ retourne la description des chainettes """
+
+        return {"a": self.npA, "l": 2.*self.compCurv(self.npDist)}
+
+    #-----
+    def __str__(self) -> str:
+
+        return f'Chainettes --> {self.npA.size} chainettes, A = {self.npA}'
+
 #----- start here
 if __name__ == '__main__':
 
@@ -43,6 +43,9 @@ import pathlib
 import math
 from datetime import datetime
 
+import numpy as np
+
+import Geom as ge
 import Direction as di
 
 #----- constantes pour finir le programme
@@ -61,6 +64,64 @@ couleur = {
     "gris":    8
 }
 
+#----- les polylignes du développé mis à l'horizontale
+POLYLIGNES = ("points2DMil", "points2DHaut", "points2DBas", "points2DHautChainette",
+              "points2DBasChainette", "points2DHautCouture")
+
+#----- intersection de 2 cercles, sur des float
+def intersectionCercles(a: float, b: float, c: float, d: float, r0: float, r1: float) -> tuple:
+
+    """
+        soit 2 cercles (x-a)²+(y-b)²=r0² et (x-c)²+(y-d)²=r1², on cherche les points d'intersection
+            la Distance entre les centres est D = sqrt[(c-a)²+(d-b)²]
+            la condition pour qu'il y ait une intersection :
+                D < r0+r1 et D > abs(r0-r1)
+            les solutions sont données par :
+                avec δ = 1/4*sqrt((D+r0+r1)(D+r0-r1)(D-r0+r1)(-D+r0+r1))
+                x1,2 = (a+c)/2 + (c-a)(r0²-r1²)/(2D²) +- 2δ(b-d)/D²
+                y1,2 = (b+d)/2 + (d-b)(r0²-r1²)/(2D²) -+ 2δ(a-c)/D²
+        retourne la solution d'abscisse la plus grande
+
+        :param: float, float, float, float, float, float
+        :rtype: tuple
+
+        :Example:
+
+        >>> intersectionCercles(0., 0., 0., 8., 5., 5.)
+        (3.0, 4.0)
+        >>> intersectionCercles(0., 0., 0., 20., 5., 5.)
+        Traceback (most recent call last):
+        ...
+        SystemExit: 1
+
+    """
+
+    dD = math.hypot((c-a), (d-b))
+    if not (dD < (r0+r1) and dD > math.fabs(r0-r1)):
+        print(f'pas de solutions')
+        print(f'a -> {a} b -> {b} c -> {c} d -> {d} r0 -> {r0} r1 -> {r1}')
+        print(f' --> Arrêt du programme')
+        sys.exit(ABNORMAL_TERMINATION)
+
+    part1X = (a+c)/2.
+    part1Y = (b+d)/2.
+
+    part2 = (r0*r0-r1*r1)/(2.*dD*dD)
+    part2X = (c-a)*part2
+    part2Y = (d-b)*part2
+
+    delta = math.sqrt((dD+r0+r1)*(dD+r0-r1)*(dD-r0+r1)*(-dD+r0+r1))/(2.*dD*dD)
+    deltaX = (b-d)*delta
+    deltaY = (a-c)*delta
+
+    x = part1X + part2X
+    x1 = x + deltaX
+    x2 = x - deltaX
+
+    if x1 > x2:
+        return (x1, part1Y + part2Y - deltaY)
+    return (x2, part1Y + part2Y + deltaY)
+
 #----- Classe représentant le modèle pour le calcul du développé
 class Developp2D:
 
@@ -84,6 +145,12 @@ class Developp2D:
             self.endroit2DMil:            Endroit2D
             self.endroit2DHaut:           Endroit2D
             self.endroit2DBas:            Endroit2D
+            self.points2DMil:             Points
+            self.points2DHaut:            Points
+            self.points2DBas:             Points
+            self.points2DHautChainette:   Points
+            self.points2DBasChainette:    Points
+            self.points2DHautCouture:     Points
 
         :Example:
 
@@ -124,53 +191,26 @@ class Developp2D:
         self.endroit2DHaut = None
         self.endroit2DBas = None
 
+        # les polylignes mises à l'horizontale par horiz, chacune dans un tableau
+        self.points2DMil = None
+        self.points2DHaut = None
+        self.points2DBas = None
+        self.points2DHautChainette = None
+        self.points2DBasChainette = None
+        self.points2DHautCouture = None
+
     #-----
     @staticmethod
     def calc(dictCalc: dict) -> tuple:
 
         """
-            soit 2 cercles (x-a)²+(y-b)²=r0² et (x-c)²+(y-d)²=r1², on cherche les points d'intersection
-                la Distance entre les centres est D = sqrt[(c-a)²+(d-b)²]
-                la condition pour qu'il y ait une intersection :
-                    D < r0+r1 et D > abs(r0-r1)
-                les solutions sont données par :
-                    avec δ = 1/4*sqrt((D+r0+r1)(D+r0-r1)(D-r0+r1)(-D+r0+r1))
-                    x1,2 = (a+c)/2 + (c-a)(r0²-r1²)/(2D²) +- 2δ(b-d)/D²
-                    y1,2 = (b+d)/2 + (d-b)(r0²-r1²)/(2D²) -+ 2δ(a-c)/D²
+            intersection des 2 cercles de centres "c0" et "c1" (Point2D) et de rayons "r0" et "r1",
+            le calcul est fait sur les coordonnées par intersectionCercles
         """
 
-        a = dictCalc["c0"]["x"]
-        b = dictCalc["c0"]["y"]
-        c = dictCalc["c1"]["x"]
-        d = dictCalc["c1"]["y"]
-        r0 = dictCalc["r0"]
-        r1 = dictCalc["r1"]
-
-        dD = math.hypot((c-a), (d-b))
-        if not (dD < (r0+r1) and dD > math.fabs(r0-r1)):
-            print(f'pas de solutions')
-            print(f'a -> {a} b -> {b} c -> {c} d -> {d} r0 -> {r0} r1 -> {r1}')
-            print(f' --> Arrêt du programme')
-            sys.exit(ABNORMAL_TERMINATION)
-
-        part1X = (a+c)/2.
-        part1Y = (b+d)/2.
-
-        part2 = (r0*r0-r1*r1)/(2.*dD*dD)
-        part2X = (c-a)*part2
-        part2Y = (d-b)*part2
-
-        delta = math.sqrt((dD+r0+r1)*(dD+r0-r1)*(dD-r0+r1)*(-dD+r0+r1))/(2.*dD*dD)
-        deltaX = (b-d)*delta
-        deltaY = (a-c)*delta
-
-        x = part1X + part2X
-        x1 = x + deltaX
-        x2 = x - deltaX
-
-        if x1 > x2:
-            return (x1, part1Y + part2Y - deltaY)
-        return (x2, part1Y + part2Y + deltaY)
+        return intersectionCercles(dictCalc["c0"].p2dx(), dictCalc["c0"].p2dy(),
+                                   dictCalc["c1"].p2dx(), dictCalc["c1"].p2dy(),
+                                   dictCalc["r0"], dictCalc["r1"])
 
     #-----
     @staticmethod
@@ -207,16 +247,16 @@ class Developp2D:
             print(f'program aborted')
             sys.exit(ABNORMAL_TERMINATION)
 
-        angleChainette = di.Direction2D(endroitFin - endroitDeb).angle2D()
-        direction2DDeb = di.Direction2D({"vect2D": {"x": fCouture / math.tan(angleR) , "y": fCouture}})
-        endroit2DCoutureDeb = endroitDeb + di.Direction2D(direction2DDeb.rot2d(angleChainette))
+        angleChainette = endroitFin.subDirection2D(endroitDeb).angle2D()
+        direction2DDeb = di.Direction2D.fromV2d(ge.Vect2D(fX=fCouture / math.tan(angleR), fY=fCouture))
+        endroit2DCoutureDeb = endroitDeb.addEndroit2D(direction2DDeb.rotDirection2D(angleChainette))
 
-        angleChainette = di.Direction2D(endroitDeb - endroitFin).angle2D()
-        direction2DFin = di.Direction2D({"vect2D": {"x": fCouture / math.tan(angleR) , "y": -fCouture}})
-        endroit2DCoutureFin = endroitFin + di.Direction2D(direction2DFin.rot2d(angleChainette))
+        angleChainette = endroitDeb.subDirection2D(endroitFin).angle2D()
+        direction2DFin = di.Direction2D.fromV2d(ge.Vect2D(fX=fCouture / math.tan(angleR), fY=-fCouture))
+        endroit2DCoutureFin = endroitFin.addEndroit2D(direction2DFin.rotDirection2D(angleChainette))
 
-        return (endroit2DCoutureDeb["point2D"]["x"], endroit2DCoutureDeb["point2D"]["y"], \
-                endroit2DCoutureFin["point2D"]["x"], endroit2DCoutureFin["point2D"]["y"] \
+        return (endroit2DCoutureDeb.p2ddict.p2dx(), endroit2DCoutureDeb.p2ddict.p2dy(), \
+                endroit2DCoutureFin.p2ddict.p2dx(), endroit2DCoutureFin.p2ddict.p2dy() \
                )
 
     #-----
@@ -228,23 +268,23 @@ class Developp2D:
 
         if dictDevelopp2D["index"] == 0:
 
-            endroit2DMil = di.Endroit2D({"point2D": {"x": 0., "y": 0.}})
+            endroit2DMil = di.Endroit2D.fromXy(0., 0.)
             self.lendroit2DMil.append(endroit2DMil)
 
             fdist3DMilHaut = dictDevelopp2D["fdist3DMilHaut"]
-            endroit2DHaut = di.Endroit2D({"point2D": {"x": 0., "y": fdist3DMilHaut}})
+            endroit2DHaut = di.Endroit2D.fromXy(0., fdist3DMilHaut)
             self.lendroit2DHaut.append(endroit2DHaut)
 
             fdist3DMilBas = dictDevelopp2D["fdist3DMilBas"]
-            endroit2DBas = di.Endroit2D({"point2D": {"x": 0., "y": -fdist3DMilBas}})
+            endroit2DBas = di.Endroit2D.fromXy(0., -fdist3DMilBas)
             self.lendroit2DBas.append(endroit2DBas)
 
             fdist3DMilHautChainette = dictDevelopp2D["fdist3DMilHautChainette"]
-            endroit2DHautChainette = di.Endroit2D({"point2D": {"x": 0., "y": fdist3DMilHautChainette}})
+            endroit2DHautChainette = di.Endroit2D.fromXy(0., fdist3DMilHautChainette)
             self.lendroit2DHautChainette.append(endroit2DHautChainette)
 
             fdist3DMilBasChainette = dictDevelopp2D["fdist3DMilBasChainette"]
-            endroit2DBasChainette = di.Endroit2D({"point2D": {"x": 0., "y": -fdist3DMilBasChainette}})
+            endroit2DBasChainette = di.Endroit2D.fromXy(0., -fdist3DMilBasChainette)
             self.lendroit2DBasChainette.append(endroit2DBasChainette)
 
             self.lendroit2DHautCouture.append(endroit2DHautChainette)
@@ -252,44 +292,44 @@ class Developp2D:
         else:
 
             dictCalc = {}
-            dictCalc['c0'] = self.endroit2DMil.p2ddict.getDict()
+            dictCalc['c0'] = self.endroit2DMil.p2ddict
             dictCalc["r0"] = dictDevelopp2D["fdist3DMilMil"]
-            dictCalc['c1'] = self.endroit2DHaut.p2ddict.getDict()
+            dictCalc['c1'] = self.endroit2DHaut.p2ddict
             dictCalc["r1"] = dictDevelopp2D["fdist3DHautMil"]
             (x, y) = Developp2D.calc(dictCalc=dictCalc)
-            endroit2DMil = di.Endroit2D({"point2D": {"x": x, "y": y}})
+            endroit2DMil = di.Endroit2D.fromXy(x, y)
             self.lendroit2DMil.append(endroit2DMil)
 
-            dictCalc['c0'] = self.endroit2DMil.p2ddict.getDict()
+            dictCalc['c0'] = self.endroit2DMil.p2ddict
             dictCalc["r0"] = dictDevelopp2D["fdist3DMilHaut"]
-            dictCalc['c1'] = self.endroit2DHaut.p2ddict.getDict()
+            dictCalc['c1'] = self.endroit2DHaut.p2ddict
             dictCalc["r1"] = dictDevelopp2D["fdist3DHautHaut"]
             (x, y) = Developp2D.calc(dictCalc=dictCalc)
-            endroit2DHaut = di.Endroit2D({"point2D": {"x": x, "y": y}})
+            endroit2DHaut = di.Endroit2D.fromXy(x, y)
             self.lendroit2DHaut.append(endroit2DHaut)
 
-            dictCalc['c0'] = self.endroit2DMil.p2ddict.getDict()
+            dictCalc['c0'] = self.endroit2DMil.p2ddict
             dictCalc["r0"] = dictDevelopp2D["fdist3DMilBas"]
-            dictCalc['c1'] = self.endroit2DBas.p2ddict.getDict()
+            dictCalc['c1'] = self.endroit2DBas.p2ddict
             dictCalc["r1"] = dictDevelopp2D["fdist3DBasBas"]
             (x, y) = Developp2D.calc(dictCalc=dictCalc)
-            endroit2DBas = di.Endroit2D({"point2D": {"x": x, "y": y}})
+            endroit2DBas = di.Endroit2D.fromXy(x, y)
             self.lendroit2DBas.append(endroit2DBas)
 
-            dictCalc['c0'] = self.endroit2DMil.p2ddict.getDict()
+            dictCalc['c0'] = self.endroit2DMil.p2ddict
             dictCalc["r0"] = dictDevelopp2D["fdist3DMilHautChainette"]
-            dictCalc['c1'] = self.endroit2DHaut.p2ddict.getDict()
+            dictCalc['c1'] = self.endroit2DHaut.p2ddict
             dictCalc["r1"] = dictDevelopp2D["fdist3DHautHautChainette"]
             (x, y) = Developp2D.calc(dictCalc=dictCalc)
-            endroit2DHautChainette = di.Endroit2D({"point2D": {"x": x, "y": y}})
+            endroit2DHautChainette = di.Endroit2D.fromXy(x, y)
             self.lendroit2DHautChainette.append(endroit2DHautChainette)
 
-            dictCalc['c0'] = self.endroit2DMil.p2ddict.getDict()
+            dictCalc['c0'] = self.endroit2DMil.p2ddict
             dictCalc["r0"] = dictDevelopp2D["fdist3DMilBasChainette"]
-            dictCalc['c1'] = self.endroit2DBas.p2ddict.getDict()
+            dictCalc['c1'] = self.endroit2DBas.p2ddict
             dictCalc["r1"] = dictDevelopp2D["fdist3DBasBasChainette"]
             (x, y) = Developp2D.calc(dictCalc=dictCalc)
-            endroit2DBasChainette = di.Endroit2D({"point2D": {"x": x, "y": y}})
+            endroit2DBasChainette = di.Endroit2D.fromXy(x, y)
             self.lendroit2DBasChainette.append(endroit2DBasChainette)
 
             dictCouture = {}
@@ -297,9 +337,9 @@ class Developp2D:
             dictCouture["endroitFin"] = self.lendroit2DHautChainette[-1]
             dictCouture["fCouture"] = dictDevelopp2D["fCouture"]
             (x1, y1, x2, y2) = Developp2D.couture(dictCouture=dictCouture)
-            endroit2DHautCouture = di.Endroit2D({"point2D": {"x": x1, "y": y1}})
+            endroit2DHautCouture = di.Endroit2D.fromXy(x1, y1)
             self.lendroit2DHautCouture.append(endroit2DHautCouture)
-            endroit2DHautCouture = di.Endroit2D({"point2D": {"x": x2, "y": y2}})
+            endroit2DHautCouture = di.Endroit2D.fromXy(x2, y2)
             self.lendroit2DHautCouture.append(endroit2DHautCouture)
             #self.lendroit2DHautCouture.append(self.lendroit2DHautChainette[-1])
 
@@ -315,126 +355,182 @@ class Developp2D:
             à "l'horizontale" définie par l'axe du millieu du panneau
         """
 
-        alpha = di.Direction2D(self.lendroit2DMil[-1] - self.lendroit2DMil[0]).angle2D()
-
-        lendroit2DMil = []
-        lendroit2DHaut = []
-        lendroit2DBas = []
-        lendroit2DHautChainette = []
-        lendroit2DBasChainette = []
-        lendroit2DHautCouture = []
-
-        for i in self.lendroit2DMil:
-            lendroit2DMil.append(i.rot2d(fAth=-alpha))
-        for i in self.lendroit2DHaut:
-            lendroit2DHaut.append(i.rot2d(fAth=-alpha))
-        for i in self.lendroit2DBas:
-            lendroit2DBas.append(i.rot2d(fAth=-alpha))
-        for i in self.lendroit2DHautChainette:
-            lendroit2DHautChainette.append(i.rot2d(fAth=-alpha))
-        for i in self.lendroit2DBasChainette:
-            lendroit2DBasChainette.append(i.rot2d(fAth=-alpha))
-        for i in self.lendroit2DHautCouture:
-            lendroit2DHautCouture.append(i.rot2d(fAth=-alpha))
-
-        self.lendroit2DMil = lendroit2DMil
-        self.lendroit2DHaut = lendroit2DHaut
-        self.lendroit2DBas = lendroit2DBas
-        self.lendroit2DHautChainette = lendroit2DHautChainette
-        self.lendroit2DBasChainette = lendroit2DBasChainette
-        self.lendroit2DHautCouture = lendroit2DHautCouture
+        pointsMil = ge.Points.fromPoints([i.p2ddict for i in self.lendroit2DMil])
+        alpha = (pointsMil[-1] - pointsMil[0]).angle2d()[0]
+
+        # chaque polyligne est tournée d'un bloc
+        self.points2DMil = pointsMil.rot2d(ath=-alpha)
+        self.points2DHaut = ge.Points.fromPoints([i.p2ddict for i in self.lendroit2DHaut]).rot2d(ath=-alpha)
+        self.points2DBas = ge.Points.fromPoints([i.p2ddict for i in self.lendroit2DBas]).rot2d(ath=-alpha)
+        self.points2DHautChainette = ge.Points.fromPoints([i.p2ddict for i in self.lendroit2DHautChainette]) \
+                                              .rot2d(ath=-alpha)
+        self.points2DBasChainette = ge.Points.fromPoints([i.p2ddict for i in self.lendroit2DBasChainette]) \
+                                             .rot2d(ath=-alpha)
+        self.points2DHautCouture = ge.Points.fromPoints([i.p2ddict for i in self.lendroit2DHautCouture]) \
+                                            .rot2d(ath=-alpha)
+
+    #-----
+    def getPolylignes(self) -> dict:
+
+        """
+            retourne les polylignes du développé mis à l'horizontale, un tableau (N, 2) chacune,
+            c'est tout ce dont createDxf et getMetriques ont besoin
+
+            :param: aucun
+            :rtype: dict
+
+            :Example:
+
+            >>> a = Developp2D({"numPanneau": 0})
+            >>> for i in POLYLIGNES:
+            ...     setattr(a, i, ge.Points(np.array([[0., 0.], [1., 2.]])))
+            >>> b = Developp2D({"numPanneau": 0})
+            >>> b.setPolylignes(a.getPolylignes())
+            >>> print(b.points2DHautCouture.getArray())
+            [[0. 0.]
+             [1. 2.]]
+
+        """
+
+        return {i: getattr(self, i).getArray() for i in POLYLIGNES}
 
     #-----
-    def createDxf(self, block) -> None:
+    def getContour(self) -> np.ndarray:
+
+        """
+            retourne le contour du développé avant sa mise à l'horizontale, un tableau
+            (nSections, 4, 2) des points haut, bas, haut de chainette et bas de chainette
+            de chaque section, la première section étant toujours placée de la même façon
+            les contours de 2 découpages d'un même panneau sont donc directement comparables
+
+            :param: aucun
+            :rtype: np.ndarray
+
+            :Example:
+
+            >>> a = Developp2D({"numPanneau": 0})
+            >>> a.comp({"index": 0, "fCouture": 0., "fdist3DMilHaut": 2., "fdist3DMilBas": 2.,
+            ...         "fdist3DMilHautChainette": 1., "fdist3DMilBasChainette": 1.})
+            >>> a.getContour()
+            array([[[ 0.,  2.],
+                    [ 0., -2.],
+                    [ 0.,  1.],
+                    [ 0., -1.]]])
+
+        """
+
+        lContour = [self.lendroit2DHaut, self.lendroit2DBas, self.lendroit2DHautChainette, self.lendroit2DBasChainette]
+        return np.array([[[i.p2ddict.p2dx(), i.p2ddict.p2dy()] for i in j] for j in lContour]).transpose(1, 0, 2)
+
+    #-----
+    def setPolylignes(self, dictPolylignes: dict) -> None:
+
+        """ remet en place les polylignes retournées par getPolylignes """
+
+        for i in POLYLIGNES:
+            setattr(self, i, ge.Points(dictPolylignes[i]))
+
+    #-----
+    def getMetriques(self) -> dict:
+
+        """
+            retourne les longueurs du panneau développé (bas et haut de chainette,
+            guindant et chute) et sa surface, le contour étant le bas de chainette
+            puis le haut de chainette parcouru en sens inverse
+
+            :param: aucun
+            :rtype: dict
+
+            :Example:
+
+            >>> a = Developp2D({"numPanneau": 0})
+            >>> a.points2DBasChainette = ge.Points(np.array([[0., 0.], [3., 0.], [6., 0.]]))
+            >>> a.points2DHautChainette = ge.Points(np.array([[0., 4.], [3., 4.], [6., 2.]]))
+            >>> {k: round(v, 3) for (k, v) in a.getMetriques().items()}
+            {'longueurBas': 6.0, 'longueurHaut': 6.606, 'longueurGuindant': 4.0, 'longueurChute': 2.0, 'surface': 21.0}
+
+        """
+
+        npBas = self.points2DBasChainette.getArray()
+        npHaut = self.points2DHautChainette.getArray()
+
+        # la surface par la formule du lacet sur le contour fermé
+        npContour = np.concatenate((npBas, npHaut[::-1]))
+        npSuivant = np.roll(npContour, -1, axis=0)
+        fSurface = abs(float(np.sum(npContour[:, 0]*npSuivant[:, 1] - npSuivant[:, 0]*npContour[:, 1])))/2.
+
+        return {"longueurBas": float(np.linalg.norm(np.diff(npBas, axis=0), axis=1).sum()),
+                "longueurHaut": float(np.linalg.norm(np.diff(npHaut, axis=0), axis=1).sum()),
+                "longueurGuindant": float(np.linalg.norm(npHaut[0] - npBas[0])),
+                "longueurChute": float(np.linalg.norm(npHaut[-1] - npBas[-1])),
+                "surface": fSurface}
+
+    #-----
+    def createDxf(self, block, dateCreation: datetime = None) -> int:
 
         """
             la mise en place du dxf
+            dateCreation est la date inscrite sur la chute, maintenant (UTC) par défaut
+            retourne le nombre de polylignes tracées
         """
 
         # la ligne millieu en pointillé
-        polyLineMil = block.add_lwpolyline([], dxfattribs={'color': couleur["jaune"], 'linetype': 'DOT2'})
-        for i in self.lendroit2DMil:
-            polyLineMil.append_points(points=[(i["point2D"]["x"], \
-                                               i["point2D"]["y"])], \
-                                               format='xy')
+        block.add_lwpolyline(self.points2DMil.getList(), format='xy',
+                             dxfattribs={'color': couleur["jaune"], 'linetype': 'DOT2'})
 
         # la ligne du haut en pointillé
-        polyLineHaut = block.add_lwpolyline([], dxfattribs={'color': couleur["jaune"], 'linetype': 'DOT2'})
-        for i in self.lendroit2DHaut:
-            polyLineHaut.append_points(points=[(i["point2D"]["x"], \
-                                                i["point2D"]["y"])], \
-                                                format='xy')
+        block.add_lwpolyline(self.points2DHaut.getList(), format='xy',
+                             dxfattribs={'color': couleur["jaune"], 'linetype': 'DOT2'})
 
         # la ligne du haut de chainette en plein
-        polyLineHautChainette = block.add_lwpolyline([], dxfattribs={'color': couleur["bleu"]})
-        for i in self.lendroit2DHautChainette:
-            polyLineHautChainette.append_points(points=[(i["point2D"]["x"], \
-                                                         i["point2D"]["y"])], \
-                                                         format='xy')
+        block.add_lwpolyline(self.points2DHautChainette.getList(), format='xy',
+                             dxfattribs={'color': couleur["bleu"]})
 
         # la ligne du bas en pointillé
-        polyLineBas = block.add_lwpolyline([], dxfattribs={'color': couleur["jaune"], 'linetype': 'DOT2'})
-        for i in self.lendroit2DBas:
-            polyLineBas.append_points(points=[(i["point2D"]["x"], \
-                                               i["point2D"]["y"])], \
-                                               format='xy')
+        block.add_lwpolyline(self.points2DBas.getList(), format='xy',
+                             dxfattribs={'color': couleur["jaune"], 'linetype': 'DOT2'})
 
         # la ligne du bas de chainette en plein
-        polyLineBasChainette = block.add_lwpolyline([], dxfattribs={'color': couleur["bleu"]})
-        for i in self.lendroit2DBasChainette:
-            polyLineBasChainette.append_points(points=[(i["point2D"]["x"], \
-                                                        i["point2D"]["y"])], \
-                                                        format='xy')
+        block.add_lwpolyline(self.points2DBasChainette.getList(), format='xy',
+                             dxfattribs={'color': couleur["bleu"]})
 
         # la ligne de la couture en plein
-        polyLineHautCouture = block.add_lwpolyline([], dxfattribs={'color': couleur["bleu"]})
-        for i in self.lendroit2DHautCouture:
-            polyLineHautCouture.append_points(points=[(i["point2D"]["x"], \
-                                                       i["point2D"]["y"])], \
-                                                       format='xy')
+        block.add_lwpolyline(self.points2DHautCouture.getList(), format='xy',
+                             dxfattribs={'color': couleur["bleu"]})
 
         # les lignes de section (la première et la dernière sont différentes)
-        for i in range(len(self.lendroit2DBasChainette)):
+        lBasChainette = self.points2DBasChainette.getList()
+        lHautChainette = self.points2DHautChainette.getList()
+        for i in range(len(lBasChainette)):
 
-            if i == 0 or i == len(self.lendroit2DBasChainette)-1:
-                polyLineSection = block.add_lwpolyline([], dxfattribs={'color': couleur["bleu"]})
+            if i == 0 or i == len(lBasChainette)-1:
+                dxfattribs = {'color': couleur["bleu"]}
             else:
-                polyLineSection = block.add_lwpolyline([], dxfattribs={'color': couleur["rouge"], 'lineweight': 20})
-
-            polyLineSection.append_points(points=[(self.lendroit2DBasChainette[i]["point2D"]["x"], \
-                                                   self.lendroit2DBasChainette[i]["point2D"]["y"])], \
-                                                   format='xy')
-            polyLineSection.append_points(points=[(self.lendroit2DHautChainette[i]["point2D"]["x"], \
-                                                   self.lendroit2DHautChainette[i]["point2D"]["y"])], \
-                                                   format='xy')
+                dxfattribs = {'color': couleur["rouge"], 'lineweight': 20}
+            block.add_lwpolyline([lBasChainette[i], lHautChainette[i]], format='xy', dxfattribs=dxfattribs)
 
         # une inscription du numéro de panneau
-        endroit2DDeb = di.Endroit2D(self.lendroit2DHaut[0])
-        endroit2DFin = di.Endroit2D(self.lendroit2DHaut[-1])
-        intHautText = di.Endroit2D(endroit2DDeb.lin2d(k=0.97, endroit2D=endroit2DFin))
-        endroit2DDeb = di.Endroit2D(self.lendroit2DBas[0])
-        endroit2DFin = di.Endroit2D(self.lendroit2DBas[-1])
-        intBasText = di.Endroit2D(endroit2DDeb.lin2d(k=0.97, endroit2D=endroit2DFin))
-        debText = intHautText.lin2d(k=0.55, endroit2D=intBasText)
-        finText = intHautText.lin2d(k=0.45, endroit2D=intBasText)
+        intHautText = self.points2DHaut[0].lin(k=0.97, points=self.points2DHaut[-1])
+        intBasText = self.points2DBas[0].lin(k=0.97, points=self.points2DBas[-1])
+        debText = intHautText.lin(k=0.55, points=intBasText).getList()[0]
+        finText = intHautText.lin(k=0.45, points=intBasText).getList()[0]
         panneauNum = f'<-- bas Panneau numéro : {self.numPanneau} (chute) haut -->'
         block.add_text(panneauNum, \
                        dxfattribs={'style': 'OpenSansCondensed-Bold'} \
-                      ).set_pos([debText["point2D"]["x"], debText["point2D"]["y"]], \
-                                [finText["point2D"]["x"], finText["point2D"]["y"]], \
-                                align='ALIGNED')
+                      ).set_pos(debText, finText, align='ALIGNED')
 
         # une inscription sur la chute
-        endroit2DDeb = di.Endroit2D(self.lendroit2DMil[0])
-        endroit2DFin = di.Endroit2D(self.lendroit2DMil[-1])
-        debText = endroit2DDeb.lin2d(k=0.10, endroit2D=endroit2DFin)
-        finText = endroit2DDeb.lin2d(k=0.15, endroit2D=endroit2DFin)
-        copyRight = f'Créé par Pyjunk le {datetime.utcnow():%c} UTC±00:00'
+        debText = self.points2DMil[0].lin(k=0.10, points=self.points2DMil[-1]).getList()[0]
+        finText = self.points2DMil[0].lin(k=0.15, points=self.points2DMil[-1]).getList()[0]
+        if dateCreation is None:
+            dateCreation = datetime.utcnow()
+        copyRight = f'Créé par Pyjunk le {dateCreation:%c} UTC±00:00'
         block.add_text(copyRight, \
                        dxfattribs={'style': 'OpenSansCondensed-Bold'} \
-                      ).set_pos([debText["point2D"]["x"], debText["point2D"]["y"]], \
-                                [finText["point2D"]["x"], finText["point2D"]["y"]], \
-                                align='ALIGNED')
+                      ).set_pos(debText, finText, align='ALIGNED')
+
+        # les 6 lignes du contour et une ligne par section
+        return 6 + len(lBasChainette)
 
     #-----
     def __str__(self) -> str:
@@ -494,23 +590,31 @@ class Developp(Developp2D):
             Le principe : en 3D, on mesure les distances du point recherché par rapport à
             2 autres points, on reporte ces distances en 2D à partir de 2 autres points 2D
             pour trouver le point 2D sur le développé
+            Les points 3D sont passés directement ("endroit3DBas", "endroit3DHaut", "endroit3DMil")
+            ou sous forme de dict ("dictBas", "dictHaut", "dictMil")
         """
 
-        if "dictBas" in dictDevelopp and isinstance(dictDevelopp["dictBas"], dict):
+        if "endroit3DBas" in dictDevelopp and isinstance(dictDevelopp["endroit3DBas"], di.Endroit3D):
+            endroit3DBas = dictDevelopp["endroit3DBas"]
+        elif "dictBas" in dictDevelopp and isinstance(dictDevelopp["dictBas"], dict):
             endroit3DBas = di.Endroit3D(dictDevelopp["dictBas"])
         else:
             print(f'< !!!! > dictionnaire incorrect pour dictDevelopp')
             print(f'program aborted')
             sys.exit(ABNORMAL_TERMINATION)
 
-        if "dictHaut" in dictDevelopp and isinstance(dictDevelopp["dictHaut"], dict):
+        if "endroit3DHaut" in dictDevelopp and isinstance(dictDevelopp["endroit3DHaut"], di.Endroit3D):
+            endroit3DHaut = dictDevelopp["endroit3DHaut"]
+        elif "dictHaut" in dictDevelopp and isinstance(dictDevelopp["dictHaut"], dict):
             endroit3DHaut = di.Endroit3D(dictDevelopp["dictHaut"])
         else:
             print(f'< !!!! > dictionnaire incorrect pour dictDevelopp')
             print(f'program aborted')
             sys.exit(ABNORMAL_TERMINATION)
 
-        if "dictMil" in dictDevelopp and isinstance(dictDevelopp["dictMil"], dict):
+        if "endroit3DMil" in dictDevelopp and isinstance(dictDevelopp["endroit3DMil"], di.Endroit3D):
+            endroit3DMil = dictDevelopp["endroit3DMil"]
+        elif "dictMil" in dictDevelopp and isinstance(dictDevelopp["dictMil"], dict):
             endroit3DMil = di.Endroit3D(dictDevelopp["dictMil"])
         else:
             print(f'< !!!! > dictionnaire incorrect pour dictDevelopp')
@@ -550,10 +654,10 @@ class Developp(Developp2D):
             dictDevelopp2D["fdist3DMilHaut"] = endroit3DMil.dist3d(endroit3DHaut)
             dictDevelopp2D["fdist3DMilBas"] = endroit3DMil.dist3d(endroit3DBas)
 
-            endroit3DHautChainette = di.Endroit3D(endroit3DMil.lin3d(k=frac, endroit3D=endroit3DHaut))
+            endroit3DHautChainette = endroit3DMil.linEndroit3D(k=frac, endroit3D=endroit3DHaut)
             dictDevelopp2D["fdist3DMilHautChainette"] = endroit3DMil.dist3d(endroit3DHautChainette)
 
-            endroit3DBasChainette = di.Endroit3D(endroit3DMil.lin3d(k=frac, endroit3D=endroit3DBas))
+            endroit3DBasChainette = endroit3DMil.linEndroit3D(k=frac, endroit3D=endroit3DBas)
             dictDevelopp2D["fdist3DMilBasChainette"] = endroit3DMil.dist3d(endroit3DBasChainette)
 
         else:
@@ -569,11 +673,11 @@ class Developp(Developp2D):
             dictDevelopp2D["fdist3DMilBas"] = self.endroit3DMil.dist3d(endroit3DBas)
             dictDevelopp2D["fdist3DBasBas"] = self.endroit3DBas.dist3d(endroit3DBas)
 
-            endroit3DHautChainette = di.Endroit3D(endroit3DMil.lin3d(k=frac, endroit3D=endroit3DHaut))
+            endroit3DHautChainette = endroit3DMil.linEndroit3D(k=frac, endroit3D=endroit3DHaut)
             dictDevelopp2D["fdist3DMilHautChainette"] = self.endroit3DMil.dist3d(endroit3DHautChainette)
             dictDevelopp2D["fdist3DHautHautChainette"] = self.endroit3DHaut.dist3d(endroit3DHautChainette)
 
-            endroit3DBasChainette = di.Endroit3D(endroit3DMil.lin3d(k=frac, endroit3D=endroit3DBas))
+            endroit3DBasChainette = endroit3DMil.linEndroit3D(k=frac, endroit3D=endroit3DBas)
             dictDevelopp2D["fdist3DMilBasChainette"] = self.endroit3DMil.dist3d(endroit3DBasChainette)
             dictDevelopp2D["fdist3DBasBasChainette"] = self.endroit3DBas.dist3d(endroit3DBasChainette)
 
@@ -585,6 +689,73 @@ class Developp(Developp2D):
         self.endroit3DHaut = endroit3DHaut
         self.endroit3DBas = endroit3DBas
 
+    #-----
+    @staticmethod
+    def compContour(npBas: np.ndarray, npHaut: np.ndarray, npMil: np.ndarray, npFrac: np.ndarray) -> np.ndarray:
+
+        """
+            calcule d'un bloc le contour du développé (celui retourné par getContour) de sections
+            données par leurs points 3D (nSections, 3) et leurs fractions de chainette,
+            les intersections de cercles (intersectionCercles) sont faites directement sur des float,
+            sans Endroit ni dict : le résultat est identique à 1.e-9 mm près, sans la couture
+
+            :param: np.ndarray, np.ndarray, np.ndarray, np.ndarray
+            :rtype: np.ndarray
+
+            :Example:
+
+            >>> npBas = np.array([[0., 0., 0.], [500., 0., 40.], [1000., 0., 100.]])
+            >>> npHaut = np.array([[0., 10., 900.], [500., -20., 930.], [1000., -60., 950.]])
+            >>> npMil = (npBas + npHaut)/2.
+            >>> npFrac = np.array([1., 1.02, 1.01])
+            >>> a = Developp({"numPanneau": 0})
+            >>> for i in range(3):
+            ...     a.comp({"index": i, "fCouture": 12., "frac": float(npFrac[i]),
+            ...             "endroit3DBas": di.Endroit3D.fromXyz(*npBas[i]),
+            ...             "endroit3DHaut": di.Endroit3D.fromXyz(*npHaut[i]),
+            ...             "endroit3DMil": di.Endroit3D.fromXyz(*npMil[i])})
+            >>> npContour = Developp.compContour(npBas, npHaut, npMil, npFrac)
+            >>> npContour.shape
+            (3, 4, 2)
+            >>> bool(np.abs(npContour - a.getContour()).max() < 1.e-9)
+            True
+
+        """
+
+        # les points de chainette et toutes les distances 3D utiles, d'un bloc
+        npHautChainette = npMil + npFrac[:, np.newaxis]*(npHaut - npMil)
+        npBasChainette = npMil + npFrac[:, np.newaxis]*(npBas - npMil)
+        (npMilMil, npHautMil, npMilHaut, npHautHaut, npMilBas, npBasBas,
+         npMilHautCh, npHautHautCh, npMilBasCh, npBasBasCh) = \
+            np.linalg.norm(np.array([npMil[1:] - npMil[:-1], npMil[1:] - npHaut[:-1],
+                                     npHaut[1:] - npMil[:-1], npHaut[1:] - npHaut[:-1],
+                                     npBas[1:] - npMil[:-1], npBas[1:] - npBas[:-1],
+                                     npHautChainette[1:] - npMil[:-1], npHautChainette[1:] - npHaut[:-1],
+                                     npBasChainette[1:] - npMil[:-1], npBasChainette[1:] - npBas[:-1]]),
+                           axis=2).tolist()
+
+        npContour = np.empty((npMil.shape[0], 4, 2))
+        npContour[0, :, 0] = 0.
+        npContour[0, :, 1] = [np.linalg.norm(npHaut[0] - npMil[0]), -np.linalg.norm(npBas[0] - npMil[0]),
+                              np.linalg.norm(npHautChainette[0] - npMil[0]),
+                              -np.linalg.norm(npBasChainette[0] - npMil[0])]
+
+        (xMil, yMil) = (0., 0.)
+        (xHaut, yHaut) = npContour[0, 0].tolist()
+        (xBas, yBas) = npContour[0, 1].tolist()
+        for i in range(npMil.shape[0] - 1):
+
+            npContour[i+1, 2] = intersectionCercles(xMil, yMil, xHaut, yHaut, npMilHautCh[i], npHautHautCh[i])
+            npContour[i+1, 3] = intersectionCercles(xMil, yMil, xBas, yBas, npMilBasCh[i], npBasBasCh[i])
+            (xHaut, yHaut, xBas, yBas, xMil, yMil) = \
+                intersectionCercles(xMil, yMil, xHaut, yHaut, npMilHaut[i], npHautHaut[i]) + \
+                intersectionCercles(xMil, yMil, xBas, yBas, npMilBas[i], npBasBas[i]) + \
+                intersectionCercles(xMil, yMil, xHaut, yHaut, npMilMil[i], npHautMil[i])
+            npContour[i+1, 0] = (xHaut, yHaut)
+            npContour[i+1, 1] = (xBas, yBas)
+
+        return npContour
+
     #-----
     def __str__(self) -> str:
 
@@ -91,6 +91,28 @@ class Direction2D:
             print(f'program aborted')
             sys.exit(ABNORMAL_TERMINATION)
 
+    #-----
+    @classmethod
+    def fromV2d(cls, v2d: ge.Vect2D) -> Direction2D:
+
+        """
+            construit directement la Direction2D à partir d'un Vect2D, sans dict ni validation
+
+            :param: Vect2D
+            :rtype: Direction2D
+
+            :Example:
+
+            >>> print(Direction2D.fromV2d(ge.Vect2D(fX=10., fY=10.)))
+            Vect2D  --> (X,Y) = (   10.000,   10.000) mm
+
+        """
+
+        direction2D = cls.__new__(cls)
+        direction2D.dictDirection2D = None
+        direction2D.v2ddict = v2d
+        return direction2D
+
     #-----
     def norm2d(self) -> float:
 
@@ -150,6 +172,13 @@ class Direction2D:
 
         return {'vect2D': self.v2ddict.rot2d(ath=fAth).getDict()}
 
+    #-----
+    def rotDirection2D(self, fAth: float) -> Direction2D:
+
+        """ comme rot2d mais retourne directement une Direction2D """
+
+        return Direction2D.fromV2d(self.v2ddict.rot2d(ath=fAth))
+
     #-----
     def __str__(self) -> None:
 
@@ -195,6 +224,23 @@ class Direction3D:
             print(f'program aborted')
             sys.exit(ABNORMAL_TERMINATION)
 
+    #-----
+    @classmethod
+    def fromV3d(cls, v3d: ge.Vect3D) -> Direction3D:
+
+        """
+            construit directement la Direction3D à partir d'un Vect3D, sans dict ni validation
+
+            :param: Vect3D
+            :rtype: Direction3D
+
+        """
+
+        direction3D = cls.__new__(cls)
+        direction3D.dictDirection3D = None
+        direction3D.v3ddict = v3d
+        return direction3D
+
     #-----
     def norm3d(self) -> float:
 
@@ -298,6 +344,47 @@ class Endroit2D:
             print(f'program aborted')
             sys.exit(ABNORMAL_TERMINATION)
 
+    #-----
+    @classmethod
+    def fromP2d(cls, p2d: ge.Point2D) -> Endroit2D:
+
+        """
+            construit directement l'Endroit2D à partir d'un Point2D, sans dict ni validation
+
+            :param: Point2D
+            :rtype: Endroit2D
+
+        """
+
+        endroit2D = cls.__new__(cls)
+        endroit2D.dictEndroit2D = None
+        endroit2D.p2ddict = p2d
+        return endroit2D
+
+    #-----
+    @classmethod
+    def fromXy(cls, fX: float, fY: float) -> Endroit2D:
+
+        """
+            construit directement l'Endroit2D à partir de ses coordonnées
+
+            :param: float, float
+            :rtype: Endroit2D
+
+            :Example:
+
+            >>> a = Endroit2D.fromXy(10., 20.)
+            >>> print(a)
+            Point2D --> (X,Y) = (   10.000,   20.000) mm
+            >>> print(a.subDirection2D(Endroit2D.fromXy(0., 10.)))
+            Vect2D  --> (X,Y) = (   10.000,   10.000) mm
+            >>> print(a.addEndroit2D(Direction2D.fromV2d(ge.Vect2D(fX=1., fY=1.))))
+            Point2D --> (X,Y) = (   11.000,   21.000) mm
+
+        """
+
+        return cls.fromP2d(ge.Point2D(fX=fX, fY=fY))
+
     #-----
     def dist2d(self, endroit2D: Endroit2D) -> float:
 
@@ -399,6 +486,13 @@ class Endroit2D:
 
         return {'point2D': self.p2ddict.trans2d(direction2D.v2ddict).getDict()}
 
+    #-----
+    def addEndroit2D(self, direction2D: Direction2D) -> Endroit2D:
+
+        """ comme + mais retourne directement un Endroit2D """
+
+        return Endroit2D.fromP2d(self.p2ddict.trans2d(direction2D.v2ddict))
+
     #-----
     def __sub__(self, endroit2D: Endroit2D) -> ge.Vect2Ddict:
 
@@ -421,6 +515,13 @@ class Endroit2D:
 
         return {'vect2D': (self.p2ddict - endroit2D.p2ddict).getDict()}
 
+    #-----
+    def subDirection2D(self, endroit2D: Endroit2D) -> Direction2D:
+
+        """ comme - mais retourne directement une Direction2D """
+
+        return Direction2D.fromV2d(self.p2ddict - endroit2D.p2ddict)
+
     #-----
     def __str__(self) -> None:
 
@@ -466,6 +567,46 @@ class Endroit3D:
             print(f'program aborted')
             sys.exit(ABNORMAL_TERMINATION)
 
+    #-----
+    @classmethod
+    def fromP3d(cls, p3d: ge.Point3D) -> Endroit3D:
+
+        """
+            construit directement l'Endroit3D à partir d'un Point3D, sans dict ni validation
+
+            :param: Point3D
+            :rtype: Endroit3D
+
+        """
+
+        endroit3D = cls.__new__(cls)
+        endroit3D.dictEndroit3D = None
+        endroit3D.p3ddict = p3d
+        return endroit3D
+
+    #-----
+    @classmethod
+    def fromXyz(cls, fX: float, fY: float, fZ: float) -> Endroit3D:
+
+        """
+            construit directement l'Endroit3D à partir de ses coordonnées
+
+            :param: float, float, float
+            :rtype: Endroit3D
+
+            :Example:
+
+            >>> a = Endroit3D.fromXyz(10., 10., 10.)
+            >>> b = Endroit3D.fromXyz(20., 30., 40.)
+            >>> print(a.linEndroit3D(k=0.5, endroit3D=b))
+            Point3D --> (X,Y,Z) = (   15.000,   20.000,   25.000) mm
+            >>> print(a.subDirection3D(b))
+            Vect3D  --> (X,Y,Z) = (  -10.000,  -20.000,  -30.000) mm
+
+        """
+
+        return cls.fromP3d(ge.Point3D(fX=fX, fY=fY, fZ=fZ))
+
     #-----
     def getHt(self) -> float:
 
@@ -545,6 +686,20 @@ class Endroit3D:
 
         return {'point3D': self.p3ddict.lin3d(k, endroit3D.p3ddict).getDict()}
 
+    #-----
+    def linEndroit3D(self, k: float, endroit3D: Endroit3D) -> Endroit3D:
+
+        """ comme lin3d mais retourne directement un Endroit3D """
+
+        return Endroit3D.fromP3d(self.p3ddict.lin3d(k, endroit3D.p3ddict))
+
+    #-----
+    def midEndroit3D(self, endroit3D: Endroit3D) -> Endroit3D:
+
+        """ comme mid3d mais retourne directement un Endroit3D """
+
+        return Endroit3D.fromP3d(self.p3ddict.mid3d(endroit3D.p3ddict))
+
     #-----
     def __sub__(self, endroit3D: Endroit3D) -> ge.Vect3Ddict:
 
@@ -567,6 +722,13 @@ class Endroit3D:
 
         return {'vect3D': (self.p3ddict - endroit3D.p3ddict).getDict()}
 
+    #-----
+    def subDirection3D(self, endroit3D: Endroit3D) -> Direction3D:
+
+        """ comme - mais retourne directement une Direction3D """
+
+        return Direction3D.fromV3d(self.p3ddict - endroit3D.p3ddict)
+
     #-----
     def applyTwists(self, fAtwistr: float) -> dict:
 
@@ -643,6 +805,28 @@ class Extremite3D(Endroit3D):
             print(f'program aborted')
             sys.exit(ABNORMAL_TERMINATION)
 
+    #-----
+    @classmethod
+    def fromTypeXyz(cls, sType: str, fX: float, fY: float, fZ: float) -> Extremite3D:
+
+        """
+            construit directement l'Extremite3D à partir de son type et de ses coordonnées
+
+            :param: str, float, float, float
+            :rtype: Extremite3D
+
+            :Example:
+
+            >>> print(Extremite3D.fromTypeXyz("Chute", 10., 20., 30.))
+            Chute      : Point3D --> (X,Y,Z) = (   10.000,   20.000,   30.000) mm
+
+        """
+
+        extremite3D = cls.fromP3d(ge.Point3D(fX=fX, fY=fY, fZ=fZ))
+        extremite3D.dictExtremite3D = None
+        extremite3D.type = sType
+        return extremite3D
+
     #-----
     def mid3d(self, extremite3D: Extremite3D) -> dict:
 
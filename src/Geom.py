@@ -44,6 +44,9 @@
                 Point2Ddict(Point2D)
                 Point3D(Point2D)
                     Point3Ddict(Point3D)
+        Coords
+            Points(Coords)
+            Vects(Coords)
 """
 
 from __future__ import annotations
@@ -52,6 +55,8 @@ import sys
 import pathlib
 import math
 
+import numpy as np
+
 #----- constantes pour finir le programme
 NORMAL_TERMINATION = 0
 ABNORMAL_TERMINATION = 1
@@ -1503,6 +1508,279 @@ class Point3Ddict(Point3D):
             print(f'program aborted')
             sys.exit(ABNORMAL_TERMINATION)
 
+#----- Classe de base des collections de coordonnées rangées dans un tableau (N, 2) ou (N, 3)
+class Coords:
+
+    """
+
+        Classe Coords
+        =============
+
+        La classe Coords range N points ou N vecteurs 2D ou 3D dans un seul tableau
+        numpy float64 contigu (N, 2) ou (N, 3), une ligne par élément.
+        Les opérations portent sur toute la collection à la fois.
+
+        :datas:
+
+            self.npCoords: np.ndarray
+
+        :Example:
+
+        >>> a = Coords([[1., 2.], [3., 4.]])
+        >>> len(a), a.getDim()
+        (2, 2)
+        >>> print(a[-1])
+        Coords  --> 1 élément(s) 2D
+        >>> np.round(a.rot2d(ath=math.radians(90.)).getArray(), 9).tolist()
+        [[-2.0, 1.0], [-4.0, 3.0]]
+
+        .. seealso:: Vect2D, Vect3D, Point2D, Point3D
+        .. warning::
+        .. note:: les lignes extraites par [] restent des collections (1, 2) ou (1, 3)
+        .. todo::
+
+    """
+
+    __slots__ = ("npCoords",)
+
+    #-----
+    def __init__(self, npCoords: np.ndarray) -> None:
+
+        self.npCoords = np.ascontiguousarray(npCoords, dtype=np.float64)
+        if self.npCoords.ndim != 2 or self.npCoords.shape[1] not in (2, 3):
+            print(f'< !!!! > tableau incorrect pour {type(self).__name__} : {self.npCoords.shape}')
+            print(f'program aborted')
+            sys.exit(ABNORMAL_TERMINATION)
+
+    #-----
+    def __len__(self) -> int:
+
+        return self.npCoords.shape[0]
+
+    #-----
+    def __getitem__(self, key) -> Coords:
+
+        """ retourne la sous collection des lignes key (entier, tranche ou tableau d'indices) """
+
+        return type(self)(np.atleast_2d(self.npCoords[key]))
+
+    #-----
+    def getDim(self) -> int:
+
+        """ retourne la dimension 2 ou 3 """
+
+        return self.npCoords.shape[1]
+
+    #-----
+    def getArray(self) -> np.ndarray:
+
+        """ retourne le tableau (N, 2) ou (N, 3) des coordonnées """
+
+        return self.npCoords
+
+    #-----
+    def getList(self) -> list:
+
+        """ retourne la liste des tuples de coordonnées, par exemple pour ezdxf """
+
+        return list(map(tuple, self.npCoords.tolist()))
+
+    #-----
+    def rot2d(self, ath) -> Coords:
+
+        """
+            effectue une rotation autour de l'axe z d'un angle ath en radian
+            (un flottant ou un tableau de N angles), la coordonnée z est inchangée
+
+            :param: ath (angle(s) en radian)
+            :rtype: Coords
+
+        """
+
+        npCos = np.cos(ath)
+        npSin = np.sin(ath)
+        npCoords = self.npCoords.copy()
+        npCoords[:, 0] = npCos*self.npCoords[:, 0] - npSin*self.npCoords[:, 1]
+        npCoords[:, 1] = npSin*self.npCoords[:, 0] + npCos*self.npCoords[:, 1]
+        return type(self)(npCoords)
+
+    #-----
+    def rot3dz(self, ath) -> Coords:
+
+        """ effectue une rotation autour de l'axe z d'un angle ath en radian, voir rot2d """
+
+        return self.rot2d(ath=ath)
+
+    #-----
+    def __eq__(self, coords: Coords) -> bool:
+
+        return type(self) is type(coords) and np.array_equal(self.npCoords, coords.npCoords)
+
+    #-----
+    def __str__(self) -> str:
+
+        return f'{type(self).__name__:<7} --> {len(self)} élément(s) {self.getDim()}D'
+
+#----- Classe représentant une collection de vecteurs 2D ou 3D
+class Vects(Coords):
+
+    """
+
+        Classe Vects
+        ============
+
+        La classe Vects représente N vecteurs 2D ou 3D, voir Coords
+
+        :datas:
+
+            self.npCoords: np.ndarray
+
+        :Example:
+
+        >>> a = Vects([[3., 4., 0.], [1., 0., 0.]])
+        >>> a.norm().tolist()
+        [5.0, 1.0]
+        >>> a.prodvect(Vects([[0., 1., 0.], [0., 1., 0.]])).getList()
+        [(0.0, 0.0, 3.0), (0.0, 0.0, 1.0)]
+        >>> [round(math.degrees(i), 3) for i in a.angle2d()]
+        [53.13, 0.0]
+        >>> a.scaldiv(k=a.norm()).getList()
+        [(0.6, 0.8, 0.0), (1.0, 0.0, 0.0)]
+
+        .. seealso:: Vect2D, Vect3D
+        .. warning::
+        .. note::
+        .. todo::
+
+    """
+
+    __slots__ = ()
+
+    #-----
+    def norm(self) -> np.ndarray:
+
+        """ calcule les N normes """
+
+        return np.sqrt(np.einsum('ij,ij->i', self.npCoords, self.npCoords))
+
+    #-----
+    def angle2d(self) -> np.ndarray:
+
+        """ calcule les N angles 2D (radian) dans le plan xy """
+
+        return np.arctan2(self.npCoords[:, 1], self.npCoords[:, 0])
+
+    #-----
+    def prodvect(self, vects: Vects) -> Vects:
+
+        """ calcule les N produits vectoriels 3D """
+
+        return Vects(np.cross(self.npCoords, vects.npCoords))
+
+    #-----
+    def scalmul(self, k) -> Vects:
+
+        """ multiplie par k (un flottant ou un tableau de N flottants) """
+
+        return Vects(self.npCoords*np.reshape(k, (-1, 1)))
+
+    #-----
+    def scaldiv(self, k) -> Vects:
+
+        """ divise par k (un flottant ou un tableau de N flottants) """
+
+        return Vects(self.npCoords/np.reshape(k, (-1, 1)))
+
+    #-----
+    def __add__(self, vects: Vects) -> Vects:
+
+        return Vects(self.npCoords + vects.npCoords)
+
+#----- Classe représentant une collection de points 2D ou 3D
+class Points(Coords):
+
+    """
+
+        Classe Points
+        =============
+
+        La classe Points représente N points 2D ou 3D, par exemple une polyligne, voir Coords
+
+        :datas:
+
+            self.npCoords: np.ndarray
+
+        :Example:
+
+        >>> a = Points([[10., 10.], [0., 0.]])
+        >>> b = Points([[20., 30.], [3., 4.]])
+        >>> a.dist(b).tolist()
+        [22.360679774997898, 5.0]
+        >>> a.mid(b).getList()
+        [(15.0, 20.0), (1.5, 2.0)]
+        >>> a.lin(k=0.25, points=b).getList()
+        [(12.5, 15.0), (0.75, 1.0)]
+        >>> (b - a).getList()
+        [(10.0, 20.0), (3.0, 4.0)]
+        >>> (a + (b - a)) == b
+        True
+        >>> Points.fromPoints([Point2D(fX=1., fY=2.), Point2D(fX=3., fY=4.)]).getList()
+        [(1.0, 2.0), (3.0, 4.0)]
+
+        .. seealso:: Point2D, Point3D
+        .. warning::
+        .. note::
+        .. todo::
+
+    """
+
+    __slots__ = ()
+
+    #-----
+    @classmethod
+    def fromPoints(cls, lPoints: list) -> Points:
+
+        """ construit la collection à partir d'une liste de Point2D ou de Point3D """
+
+        if lPoints and isinstance(lPoints[0], Point3D):
+            return cls([(i.fX, i.fY, i.fZ) for i in lPoints])
+        return cls([(i.fX, i.fY) for i in lPoints])
+
+    #-----
+    def dist(self, points: Points) -> np.ndarray:
+
+        """ calcule les N distances entre les points de 2 collections """
+
+        return (points - self).norm()
+
+    #-----
+    def mid(self, points: Points) -> Points:
+
+        """ calcule les N millieux entre les points de 2 collections """
+
+        return Points((self.npCoords + points.npCoords)/2.)
+
+    #-----
+    def lin(self, k, points: Points) -> Points:
+
+        """
+            calcule les N combinaisons linéaires self*(1-k) + points*k
+            k est un flottant ou un tableau de N flottants
+        """
+
+        k = np.reshape(k, (-1, 1))
+        return Points(self.npCoords*(1. - k) + points.npCoords*k)
+
+    #-----
+    def __add__(self, vects: Vects) -> Points:
+
+        return Points(self.npCoords + vects.npCoords)
+
+    #-----
+    def __sub__(self, points: Points) -> Vects:
+
+        return Vects(self.npCoords - points.npCoords)
+
 #----- start here
 if __name__ == '__main__':
 
@@ -0,0 +1,250 @@
+#! /bin/env python3
+# -*- coding: utf-8 -*-
+
+################################################################################
+#
+#   This file is part of PYJUNK.
+#
+#   Copyright © 2021 Marc JOURDAIN
+#
+#   Permission is hereby granted, free of charge, to any person obtaining a
+#   copy of this software and associated documentation files (the “Software”),
+#   to deal in the Software without restriction, including without limitation
+#   the rights to use, copy, modify, merge, publish, distribute, sublicense,
+#   and/or sell copies of the Software, and to permit persons to whom the
+#   Software is furnished to do so, subject to the following conditions:
+#
+#   The above copyright notice and this permission notice shall be included
+#   in all copies or substantial portions of the Software.
+#
+#   THE SOFTWARE IS PROVIDED “AS IS”, WITHOUT WARRANTY OF ANY KIND, EXPRESS
+#   OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+#   FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+#   AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+#   LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+#   FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER
+#   DEALINGS IN THE SOFTWARE.
+#
+#   You should have received a copy of the MIT License
+#   along with PYJUNK.  If not, see <https://mit-license.org/>.
+#
+################################################################################
+
+"""
+    Mesures.py rassemble la définition des classes:
+        Mesures
+"""
+
+import sys
+import pathlib
+import time
+import contextlib
+import linecache
+import tracemalloc
+
+try:
+
+    import resource
+
+except ImportError:
+
+    # pas de module resource hors Unix : pas de mesure du RSS
+    resource = None
+
+#----- constantes pour finir le programme
+NORMAL_TERMINATION = 0
+ABNORMAL_TERMINATION = 1
+
+#----- Classe représentant les mesures des étapes du programme
+class Mesures:
+
+    """
+
+        Classe Mesures
+        ==============
+
+        La classe Mesures chronomètre les étapes du programme, temps écoulé (wall)
+        et temps CPU du processus, dans l'ordre où elles sont exécutées.
+        Une étape est mesurée par le gestionnaire de contexte etape.
+        Une classe inactive (bActif = False) ne mesure rien et ne coûte rien.
+        Avec bTraceAlloc, tracemalloc attribue en plus à chaque étape le pic de mémoire
+        allouée, la mémoire nette restant allouée et les nTop lignes source
+        qui ont le plus alloué (en net) pendant l'étape.
+
+        :datas:
+
+            self.bActif:      bool
+            self.bTraceAlloc: bool
+            self.nTop:        int
+            self.lEtapes:     list
+
+        :Example:
+
+        >>> a = Mesures(bActif=True)
+        >>> with a.etape("calcul"):
+        ...     x = sum(range(1000))
+        >>> [i["etape"] for i in a.getEtapes()]
+        ['calcul']
+        >>> a.getEtapes()[0]["fWall"] >= 0.
+        True
+        >>> b = Mesures(bActif=False)
+        >>> with b.etape("calcul"):
+        ...     x = sum(range(1000))
+        >>> b.getEtapes()
+        []
+        >>> c = Mesures(bTraceAlloc=True, nTop=1)
+        >>> with c.etape("liste"):
+        ...     l = [float(i) for i in range(10000)]
+        >>> c.getEtapes()[0]["octetsNets"] > 10000*24
+        True
+        >>> len(c.getEtapes()[0]["topLignes"])
+        1
+        >>> c.stop()
+
+        .. seealso::
+        .. warning::
+        .. note::
+        .. todo::
+
+    """
+
+    #-----
+    def __init__(self, bActif: bool = True, bTraceAlloc: bool = False, nTop: int = 10) -> None:
+
+        self.bActif = bActif or bTraceAlloc
+        self.bTraceAlloc = bTraceAlloc
+        self.nTop = nTop
+        self.lEtapes = []
+
+        if self.bTraceAlloc and not tracemalloc.is_tracing():
+            tracemalloc.start()
+
+    #-----
+    @contextlib.contextmanager
+    def etape(self, sEtape: str):
+
+        """
+            mesure l'étape sEtape, le bloc with est exécuté entre les 2 relevés
+
+            :param: str
+            :rtype: None
+
+        """
+
+        if not self.bActif:
+            yield
+            return
+
+        if self.bTraceAlloc:
+            snapshotAvant = tracemalloc.take_snapshot()
+            tracemalloc.reset_peak()
+            (nAvant, _) = tracemalloc.get_traced_memory()
+
+        fWall = time.perf_counter()
+        fCpu = time.process_time()
+        try:
+            yield
+        finally:
+            dictEtape = {"etape": sEtape,
+                         "fWall": time.perf_counter() - fWall,
+                         "fCpu": time.process_time() - fCpu}
+            if self.bTraceAlloc:
+                (nApres, nPic) = tracemalloc.get_traced_memory()
+                dictEtape["octetsPic"] = nPic - nAvant
+                dictEtape["octetsNets"] = nApres - nAvant
+                dictEtape["topLignes"] = self.compTopLignes(snapshotAvant)
+            self.lEtapes.append(dictEtape)
+
+    #-----
+    def compTopLignes(self, snapshotAvant: tracemalloc.Snapshot) -> list:
+
+        """
+            retourne les nTop lignes source ayant le plus alloué (en net) depuis snapshotAvant,
+            les allocations de tracemalloc, des mesures et des imports (modules gelés, linecache)
+            sont exclues
+        """
+
+        lFiltres = [tracemalloc.Filter(False, tracemalloc.__file__),
+                    tracemalloc.Filter(False, __file__),
+                    tracemalloc.Filter(False, "<frozen *>"),
+                    tracemalloc.Filter(False, linecache.__file__),
+                    tracemalloc.Filter(False, "<unknown>")]
+        snapshotApres = tracemalloc.take_snapshot().filter_traces(lFiltres)
+        lStats = snapshotApres.compare_to(snapshotAvant.filter_traces(lFiltres), 'lineno')
+
+        lTop = []
+        for i in lStats[:self.nTop]:
+            frame = i.traceback[0]
+            lTop.append({"ligne": f'{pathlib.Path(frame.filename).name}:{frame.lineno}',
+                         "octets": i.size_diff,
+                         "blocs": i.count_diff})
+        return lTop
+
+    #-----
+    def stop(self) -> None:
+
+        """ arrête tracemalloc s'il a été démarré pour les mesures """
+
+        if self.bTraceAlloc and tracemalloc.is_tracing():
+            tracemalloc.stop()
+
+    #-----
+    @staticmethod
+    def getRssMax() -> dict:
+
+        """
+            retourne le pic de mémoire résidente (Ko) du processus et de ses enfants
+            (les processus du pool), None si la mesure n'est pas disponible
+        """
+
+        if resource is None:
+            return None
+
+        # ru_maxrss est en octets sous macOS, en Ko ailleurs
+        nDiv = 1024 if sys.platform == 'darwin' else 1
+        return {"processus": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss//nDiv,
+                "enfants": resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss//nDiv}
+
+    #-----
+    def getEtapes(self) -> list:
+
+        """ retourne la liste des mesures, un dict par étape """
+
+        return self.lEtapes
+
+    #-----
+    def __str__(self) -> str:
+
+        fWallTotal = sum(i["fWall"] for i in self.lEtapes)
+        fCpuTotal = sum(i["fCpu"] for i in self.lEtapes)
+
+        strMsg = f'{"Etape":<16s} {"wall (s)":>10s} {"cpu (s)":>10s} {"wall %":>8s}\n'
+        for i in self.lEtapes:
+            fPourcent = 100.*i["fWall"]/fWallTotal if fWallTotal > 0. else 0.
+            strMsg += f'{i["etape"]:<16s} {i["fWall"]:>10.4f} {i["fCpu"]:>10.4f} {fPourcent:>8.1f}\n'
+        strMsg += f'{"Total":<16s} {fWallTotal:>10.4f} {fCpuTotal:>10.4f} {100.:>8.1f}\n'
+
+        if self.bTraceAlloc:
+            for i in self.lEtapes:
+                strMsg += f'\n{i["etape"]} : pic = {i["octetsPic"]/1024.:.1f} Ko, ' \
+                          f'net = {i["octetsNets"]/1024.:.1f} Ko\n'
+                for j in i["topLignes"]:
+                    strMsg += f'    {j["ligne"]:<24s} {j["octets"]/1024.:>10.1f} Ko {j["blocs"]:>8d} blocs\n'
+
+        return strMsg
+
+#----- start here
+if __name__ == '__main__':
+
+    import doctest
+
+    (failureCount, testCount) = doctest.testmod(verbose=False)
+
+    print(f'nombre de tests : {testCount:>3d}, nombre d\'erreurs : {failureCount:>3d}', end='')
+
+    if failureCount != 0:
+        print(f' --> Arrêt du programme {pathlib.Path(__file__)}')
+        sys.exit(ABNORMAL_TERMINATION)
+    else:
+        print(f' --> All Ok {pathlib.Path(__file__)}')
+        sys.exit(NORMAL_TERMINATION)
@@ -37,52 +37,90 @@
         Panneau
         Saildatas
         Loadjson
+    et des fonctions du traitement par lot:
+        listerFichiers
+        getEmpreinte
+        getFichiersSortie
+        getSha256
+        estAJour
+        ecrireEmpreinte
+        traiterVoile
+        createCachePanneaux
+        initProcess
+        traiterVoileProcess
 """
 
 from __future__ import annotations
 
 import sys
+import os
 import pathlib
 import argparse
 import locale
 import json
+import hashlib
+import glob
 import math
-
+import time
+import cProfile
+import pstats
+import importlib.metadata
+from datetime import datetime
+from concurrent.futures import ProcessPoolExecutor
+
+import Geom as ge
 import Direction as di
 import Models as md
 import Chainette as ch
 import Developp as de
+import Cache as ca
+import Stl as st
+import Mesures as me
 
 #----- constantes pour finir le programme
 NORMAL_TERMINATION = 0
 ABNORMAL_TERMINATION = 1
 
-try:
-
-    import ezdxf
+#----- version des calculs d'un panneau, à incrémenter quand leurs résultats changent
+#----- (elle fait partie de l'empreinte des panneaux, les caches de panneaux sont ainsi invalidés)
+VERSION_CALCS = 1
 
-except ImportError:
+#----- date des fichiers générés en mode déterministe, celle des métadonnées fixes d'ezdxf
+DATE_DETERMINISTE = datetime(2000, 1, 1)
 
-    print(f'Probleme de chargement de la librairie ezdxf')
-    print(f'Utiliser votre installateur préféré pour installer ezdxf')
-    sys.exit(ABNORMAL_TERMINATION)
+#----- version du fichier d'empreinte rangé à côté des fichiers générés
+VERSION_EMPREINTE = 1
 
-# instructions pour éviter un warning désagréable de "from stl import mesh"
-if not sys.warnoptions:
-    import warnings
-    warnings.simplefilter("ignore")
+#----- nombre maximum d'intervalles d'une demi chainette en échantillonnage stl adaptatif
+NMAX_POINTS_STL = 500
 
 try:
 
     import numpy as np
-    from stl import mesh
 
 except ImportError:
 
-    print(f'Probleme de chargement de la librairie numpy-stl')
-    print(f'Utiliser votre installateur préféré pour installer numpy-stl')
+    print(f'Probleme de chargement de la librairie numpy')
+    print(f'Utiliser votre installateur préféré pour installer numpy')
     sys.exit(ABNORMAL_TERMINATION)
 
+#----- ezdxf est importé à la demande, seulement quand le dxf est généré
+def importEzdxf():
+
+    """ importe et retourne le module ezdxf """
+
+    try:
+
+        import ezdxf
+
+    except ImportError:
+
+        print(f'Probleme de chargement de la librairie ezdxf')
+        print(f'Utiliser votre installateur préféré pour installer ezdxf')
+        sys.exit(ABNORMAL_TERMINATION)
+
+    return ezdxf
+
 #----- Classe représentant un baton
 class Baton:
 
@@ -190,18 +228,46 @@ class Baton:
         return self.dictV3dBaton
 
     #-----
-    def applyTwists(self, fHtMinChute: float, fHtMaxChute: float, fAtwistr: float) -> dict:
+    def getPoints(self) -> np.ndarray:
+
+        """
+            retourne le tableau (2, 3) des extrémités guindant et chute
 
-        """ applique le twist à chaque extrémités """
+            :param: aucun
+            :rtype: np.ndarray
 
-        dictBaton = self.dictBaton
-        del dictBaton["extremites"]
-        fAtwistrLocal = fAtwistr*(self.fHtChute - fHtMinChute)/(fHtMaxChute - fHtMinChute)
-        lextremites = []
-        for i in self.lextremites:
-            lextremites.append(i.applyTwists(fAtwistr=fAtwistrLocal))
-        dictBaton["extremites"] = lextremites
-        return dictBaton
+        """
+
+        return np.array([[i.p3ddict.p3dx(), i.p3ddict.p3dy(), i.p3ddict.p3dz()] for i in self.lextremites])
+
+    #-----
+    def setPoints(self, npPoints: np.ndarray) -> None:
+
+        """
+            remplace les extrémités par les points du tableau (2, 3) npPoints
+            de nouveaux dict sont construits, le dict d'origine n'est pas modifié
+
+            :param: np.ndarray
+            :rtype: None
+
+            :Example:
+
+            >>> p1 = {"type": "Guindant", "point3D": {"x":10.,"y":10.,"z":10.}}
+            >>> p2 = {"type": "Chute", "point3D": {"x":20.,"y":20.,"z":20.}}
+            >>> a = Baton({"type": "Bas","extremites": [p1, p2]})
+            >>> a.setPoints(np.array([[0., 0., 10.], [0., 10., 20.]]))
+            >>> print(a.getV3dDict())
+            {'vect3D': {'x': 0.0, 'y': 10.0, 'z': 10.0}}
+            >>> p1["point3D"]["x"]
+            10.0
+
+        """
+
+        self.lextremites = [di.Extremite3D.fromTypeXyz(i.getType(), *j)
+                            for (i, j) in zip(self.lextremites, npPoints.tolist())]
+        self.fHtGuindant = self.lextremites[0].getHt()
+        self.fHtChute = self.lextremites[1].getHt()
+        self.dictV3dBaton = self.lextremites[1] - self.lextremites[0]
 
     #-----
     def startCalcs(self, fraction: float) -> dict:
@@ -210,6 +276,29 @@ class Baton:
 
         return self.lextremites[0].lin3d(k=fraction, extremite3D=self.lextremites[1])
 
+    #-----
+    def startCalcsArray(self, npFrac: np.ndarray) -> np.ndarray:
+
+        """
+            calcule d'un bloc les points aux fractions npFrac entre les 2 extrémités du baton
+
+            :param: np.ndarray
+            :rtype: np.ndarray
+
+            :Example:
+
+            >>> p1 = {"type": "Guindant", "point3D": {"x":10.,"y":10.,"z":10.}}
+            >>> p2 = {"type": "Chute", "point3D": {"x":20.,"y":30.,"z":40.}}
+            >>> Baton({"type": "Bas","extremites": [p1, p2]}).startCalcsArray(np.array([0., 0.5]))
+            array([[10., 10., 10.],
+                   [15., 20., 25.]])
+
+        """
+
+        npPoints = self.getPoints()
+        npFrac = npFrac[:, np.newaxis]
+        return npPoints[0]*(1. - npFrac) + npPoints[1]*npFrac
+
     #-----
     def __str__(self) -> str:
 
@@ -296,7 +385,21 @@ class Panneau:
             self.fCouture:     float
             self.dictModel:    dict
             self.model:        Model
-            self.lPoints:      list
+            self.npFrac:       np.ndarray
+            self.npBas:        np.ndarray
+            self.npHaut:       np.ndarray
+            self.npMil:        np.ndarray
+            self.npEcart:      np.ndarray
+            self.npCreux:      np.ndarray
+            self.npV3dMil:     np.ndarray
+            self.npV3dMilNorm: np.ndarray
+            self.npSurface:    np.ndarray
+            self.npFracStl:    np.ndarray
+            self.fErreurSurech: float
+            self.npLongChainettes: np.ndarray
+            self.npNbPointsStl: np.ndarray
+            self.npFxStl:      np.ndarray
+            self.npErreurStl:  np.ndarray
             self.developp:     Developp
 
         .. seealso::
@@ -401,12 +504,44 @@ class Panneau:
             print(f'< !!!! > Pas de clé "model" ou clé incorrecte dans le Json valeur par défaut affectée')
         self.model = md.ModelSwitch(self.dictModel).getModel()
 
-        # la liste des points répartis sur la surface
-        self.lPoints = []
+        # les tableaux des sections, préparés par prepCalcs
+        self.npFrac = None
+        self.npBas = None
+        self.npHaut = None
+        self.npMil = None
+        self.npEcart = None
+        self.npCreux = None
+        self.npV3dMil = None
+        self.npV3dMilNorm = None
+
+        # le tableau des points répartis sur la surface
+        self.npSurface = None
+
+        # avec le sur-échantillonnage stl, les fractions des sections de la surface
+        # et l'écart maximum de creux des chainettes interpolées (None sinon)
+        self.npFracStl = None
+        self.fErreurSurech = None
+
+        # la longueur de la chainette de chaque section
+        self.npLongChainettes = None
+
+        # en échantillonnage stl adaptatif, le nombre d'intervalles de chaque demi chainette,
+        # les abscisses des points en fraction du demi écartement et l'écart mesuré
+        # entre la chainette et ses cordes (None en échantillonnage uniforme)
+        self.npNbPointsStl = None
+        self.npFxStl = None
+        self.npErreurStl = None
 
         # le développé du panneau
         self.developp = de.Developp({"numPanneau": self.numPanneau})
 
+        # les mesures du panneau : itérations des solveurs par section, temps de calcul,
+        # nombre de triangles stl et de polylignes dxf
+        self.dictNitersSections = None
+        self.fTempsCalcs = 0.
+        self.nFacettes = 0
+        self.nPolylignes = 0
+
     #-----
     def getHtsGuindant(self) -> tuple:
 
@@ -422,31 +557,18 @@ class Panneau:
         return self.tHtsChute
 
     #-----
-    def applyTwists(self, fHtMinChute: float, fHtMaxChute: float, fAtwistr: float) -> dict:
-
-        """ lance le calcul du twist de chaque baton """
-
-        dictPanneau = self.dictPanneau
-        del dictPanneau["batons"]
-        lbatons = []
-        for i in self.lbatons:
-            lbatons.append(i.applyTwists(fHtMinChute=fHtMinChute, fHtMaxChute=fHtMaxChute, fAtwistr=fAtwistr))
-        dictPanneau["batons"] = lbatons
-        return dictPanneau
-
-    #-----
-    def startCalcs(self, nStepsDxf: int, nStepsStl: int) -> None:
+    def prepCalcs(self, nStepsDxf: int, fTolDxf: float = None) -> None:
 
-        """ lance les calculs dans un panneau
+        """ prépare les calculs dans un panneau
 
-            c'est la partie importante du programme
             1. on calcule un baton milieu du baton bas et du baton haut
             2. chaque panneau est découpé en nStepsDxf+1 tranches verticales
-            3. ensuite, pour chaque tranche, on cherche la chainette correspondant au creux local
-               et qui s'appuie sur le haut et le bas
-            4. on peut alors calculer le developpé du panneau
-            5. dans chaque chainette découpée en nStepStl+1 de chaque côté on calcule les points
-               de la surface.
+            3. pour chaque tranche on range les points bas, haut, millieu,
+               l'écartement et le creux local de la chainette
+            4. avec fTolDxf (mm), seules les tranches nécessaires sont gardées (choisirSections)
+
+            tout est calculé d'un bloc sous forme de tableaux, les chainettes
+            peuvent ainsi être résolues pour tous les panneaux en un seul appel
 
         """
 
@@ -454,113 +576,635 @@ class Panneau:
         batonMil = BatonMillieu(baton1=self.lbatons[0], baton2=self.lbatons[1])
         direction3DMil = di.Direction3D(dictDirection3D=batonMil.getV3dDict())
         dictV3dMilNorm = direction3DMil.scaldiv3d(direction3DMil.norm3d())
+        self.npV3dMil = np.array([direction3DMil.v3ddict.v3dx(),
+                                  direction3DMil.v3ddict.v3dy(),
+                                  direction3DMil.v3ddict.v3dz()])
+        self.npV3dMilNorm = np.array([dictV3dMilNorm['vect3D']['x'],
+                                      dictV3dMilNorm['vect3D']['y'],
+                                      dictV3dMilNorm['vect3D']['z']])
+
+        # la fraction de chaque section dans la longueur du panneau
+        self.npFrac = np.arange(nStepsDxf+1, dtype=float)/float(nStepsDxf)
+
+        # on applique le découpage aux 3 batons
+        self.npBas = self.lbatons[0].startCalcsArray(npFrac=self.npFrac)
+        self.npHaut = self.lbatons[1].startCalcsArray(npFrac=self.npFrac)
+        self.npMil = batonMil.startCalcsArray(npFrac=self.npFrac)
+
+        # l'écartement et le creux des chainettes locales (pour chaque section)
+        self.npEcart = np.linalg.norm(self.npHaut - self.npBas, axis=1)
+        self.npCreux = np.array([self.model.getCreux(fraction=float(i)) for i in self.npFrac])
 
-        # découpe du panneau en section verticale
-        for i in range(nStepsDxf+1):
-
-            # la fraction dans la longueur du panneau
-            frac = float(i)/float(nStepsDxf)
-
-            # on applique le découpage aux 3 batons
-            dictBas = self.lbatons[0].startCalcs(fraction=frac)
-            dictHaut = self.lbatons[1].startCalcs(fraction=frac)
-            dictMil = batonMil.startCalcs(fraction=frac)
-
-            # le point origine du nouveau repère est la position sur le baton millieu, au format np
-            npMil = np.array([dictMil['point3D']['x'], dictMil['point3D']["y"], dictMil['point3D']["z"]])
-
-            # on calcule le vecteur dictBas <-> dictHaut, l'axe Z', on le norme
-            dictV3dBasHaut = di.Extremite3D(dictExtremite3D=dictHaut) - di.Extremite3D(dictExtremite3D=dictBas)
-            direction3DBasHaut = di.Direction3D(dictDirection3D=dictV3dBasHaut)
-            dictV3dBasHautNorm = direction3DBasHaut.scaldiv3d(direction3DBasHaut.norm3d())
-
-            # puis, par produit vectoriel de dictV3dMil (X') par dictV3dBasHaut (Z'), on obtient l'axe -Y'
-            # on le norme, noter le - dans le scaldiv3d pour avoir le Y'
-            dictV3dY = direction3DMil.prodvect3d(direction=direction3DBasHaut)
-            direction3DY = di.Direction3D(dictDirection3D=dictV3dY)
-            dictV3dYNorm = direction3DY.scaldiv3d(-direction3DY.norm3d())
-
-            # on a donc un nouveau repère, d'où une matrice de passage du nouveau repère à l'ancien
-            # sous format np
-            npPassage = np.array([
-                [dictV3dMilNorm['vect3D']['x'], dictV3dYNorm['vect3D']['x'], dictV3dBasHautNorm['vect3D']['x']],
-                [dictV3dMilNorm['vect3D']['y'], dictV3dYNorm['vect3D']['y'], dictV3dBasHautNorm['vect3D']['y']],
-                [dictV3dMilNorm['vect3D']['z'], dictV3dYNorm['vect3D']['z'], dictV3dBasHautNorm['vect3D']['z']]
-                                 ])
-
-            # on calcule la chainette locale (pour cette section)
-            dictChainette = {}
-            dictChainette["ecartement"] = di.Extremite3D(dictExtremite3D=dictBas) \
-                                         .dist3d(di.Extremite3D(dictExtremite3D=dictHaut))
-            dictChainette["creux"] = self.model.getCreux(fraction=frac)
+        if fTolDxf is not None:
+
+            npGardes = self.choisirSections(fTol=fTolDxf)
+            for i in ("npFrac", "npBas", "npHaut", "npMil", "npEcart", "npCreux"):
+                setattr(self, i, getattr(self, i)[npGardes])
+
+    #-----
+    def choisirSections(self, fTol: float) -> np.ndarray:
+
+        """
+            retourne les indices des sections préparées à garder pour que le contour du développé
+            ne s'écarte pas de plus de fTol (mm) de celui calculé avec toutes les sections
+
+            sans résoudre de chainette : la fraction de longueur de chainette de chaque section
+            est estimée par la parabole (l = e + 8.c²/(3.e)), les contours sont calculés
+            par Developp.compContour et comparés avant leur mise à l'horizontale
+            on part des sections retenues par simplifier sur le profil des sections, puis tant
+            que l'écart dépasse fTol, dans chaque intervalle en défaut la section la plus éloignée
+            de l'interpolation (en fraction) du contour réduit est ajoutée :
+            les sections se concentrent là où le creux et les batons varient
+
+            :param: float
+            :rtype: np.ndarray
+
+            :Example:
+
+            >>> dictBaton = {"type": "Bas", "extremites": [
+            ...     {"type": "Guindant", "point3D": {"x": 0., "y": 0., "z": 0.}},
+            ...     {"type": "Chute", "point3D": {"x": 3000., "y": 0., "z": 300.}}]}
+            >>> dictHaut = {"type": "Haut", "extremites": [
+            ...     {"type": "Guindant", "point3D": {"x": 0., "y": 0., "z": 800.}},
+            ...     {"type": "Chute", "point3D": {"x": 3000., "y": 0., "z": 1000.}}]}
+            >>> a = Panneau.__new__(Panneau)
+            >>> (a.numPanneau, a.fCouture) = (1, 12.)
+            >>> a.lbatons = [Baton(dictBaton), Baton(dictHaut)]
+            >>> a.model = md.ModelTube({"rpdepthmin": 15., "rpdepthmax": 85., "creuxmax": 100.})
+            >>> a.prepCalcs(nStepsDxf=40, fTolDxf=0.5)
+            >>> a.npFrac.size < 41
+            True
+            >>> bool(np.isin([0., 0.15, 0.85, 1.], a.npFrac).all())
+            True
+
+        """
+
+        npFracCurv = 1. + 8.*self.npCreux**2/(3.*self.npEcart**2)
+        npReference = de.Developp.compContour(self.npBas, self.npHaut, self.npMil, npFracCurv)
+
+        # point de départ : le profil de chaque section (demi longueur de chainette et creux)
+        # simplifié à fTol près, sans calcul de développé
+        npProfil = np.column_stack((self.npEcart*npFracCurv/2., self.npCreux))
+        npGardes = Panneau.simplifier(npFrac=self.npFrac, npProfil=npProfil, fTol=fTol)
+        while True:
+
+            # le contour réduit interpolé aux fractions de toutes les sections
+            npContour = de.Developp.compContour(self.npBas[npGardes], self.npHaut[npGardes],
+                                                self.npMil[npGardes], npFracCurv[npGardes])
+            npInterp = np.empty_like(npReference)
+            for (j, k) in np.ndindex(*npReference.shape[1:]):
+                npInterp[:, j, k] = np.interp(self.npFrac, self.npFrac[npGardes], npContour[:, j, k])
+            npEcarts = np.linalg.norm(npReference - npInterp, axis=2).max(axis=1)
+            if npEcarts.max() <= fTol:
+                return npGardes
+
+            # dans chaque intervalle en défaut (extrémité droite comprise, le développé dérivant
+            # d'une section à l'autre) qui a encore des sections non gardées, la plus éloignée
+            # est ajoutée, sans ajout possible le contour réduit est gardé tel quel
+            lAjouts = [i0 + 1 + int(npEcarts[i0+1:i1].argmax())
+                       for (i0, i1) in zip(npGardes[:-1], npGardes[1:])
+                       if i1 - i0 > 1 and npEcarts[i0+1:i1+1].max() > fTol]
+            if not lAjouts:
+                return npGardes
+            npGardes = np.union1d(npGardes, lAjouts)
+
+    #-----
+    @staticmethod
+    def simplifier(npFrac: np.ndarray, npProfil: np.ndarray, fTol: float) -> np.ndarray:
+
+        """
+            retourne les indices des sections à garder par subdivision récursive (Douglas-Peucker) :
+            les 2 sections extrêmes sont gardées, puis dans chaque intervalle la section dont
+            le profil (nSections, nValeurs) s'écarte le plus de l'interpolation linéaire entre
+            les extrémités de l'intervalle est gardée si cet écart dépasse fTol,
+            et l'intervalle est coupé en 2 à cette section
+
+            :param: np.ndarray, np.ndarray, float
+            :rtype: np.ndarray
+
+            :Example:
+
+            >>> npFrac = np.arange(11)/10.
+            >>> Panneau.simplifier(npFrac, np.column_stack((npFrac, np.minimum(npFrac, 0.4))), fTol=0.01)
+            array([ 0,  4, 10])
+            >>> Panneau.simplifier(npFrac, (npFrac**2)[:, np.newaxis], fTol=0.02)
+            array([ 0,  2,  5,  7, 10])
+
+        """
+
+        lGardes = [0, npFrac.size - 1]
+        lIntervalles = [(0, npFrac.size - 1)]
+        while lIntervalles:
+
+            (i0, i1) = lIntervalles.pop()
+            if i1 - i0 < 2:
+                continue
+
+            npT = (npFrac[i0+1:i1] - npFrac[i0])/(npFrac[i1] - npFrac[i0])
+            npInterp = npProfil[i0] + npT[:, np.newaxis]*(npProfil[i1] - npProfil[i0])
+            npEcarts = np.abs(npProfil[i0+1:i1] - npInterp).max(axis=1)
+            k = i0 + 1 + int(npEcarts.argmax())
+            if npEcarts[k - i0 - 1] > fTol:
+                lGardes.append(k)
+                lIntervalles += [(i0, k), (k, i1)]
+
+        return np.array(sorted(lGardes))
+
+    #-----
+    def solveChainettes(self, sSolveur: str, cache: ca.Cache = None) -> tuple:
+
+        """
+            résout les chainettes section par section avec le solveur scalaire sSolveur
+            pour "newton", le "a" de la section précédente sert de point de départ
+            à la section suivante (les sections voisines sont presque identiques)
+            les solutions déjà présentes dans le cache ne sont pas recalculées
+            retourne le tableau des "a" et, par solveur, le tableau des itérations de chaque section
+        """
+
+        npA = np.ones(self.npFrac.size)
+        dictNiters = {"zbrac": np.zeros(self.npFrac.size, dtype=int),
+                      "zbrent": np.zeros(self.npFrac.size, dtype=int),
+                      "znewton": np.zeros(self.npFrac.size, dtype=int)}
+        fInit = None
+        for i in range(self.npFrac.size):
+
+            dictChainette = {"ecartement": float(self.npEcart[i]),
+                             "creux": float(self.npCreux[i]),
+                             "solveur": sSolveur}
+            if fInit is not None:
+                dictChainette["aInit"] = fInit
+            if cache is not None:
+                dictChainette["cache"] = cache
             chainette = ch.Chainettedict(dictChainette)
+            npA[i] = chainette.fA
+
+            # une chainette dégénérée en droite n'est pas un bon point de départ
+            if chainette.fCreux != 0.:
+                fInit = chainette.fA
+
+            for (k, v) in chainette.getNiters().items():
+                dictNiters[k][i] = v
+
+        return (npA, dictNiters)
 
-            # on peut dès lors incrémenter le calcul du développé du panneau pour cette section
-            dictDevelopp = {}
-            dictDevelopp["index"] = i
-            dictDevelopp["dictBas"] = {"point3D": dictBas["point3D"]}
-            dictDevelopp["dictHaut"] = {"point3D": dictHaut["point3D"]}
-            dictDevelopp["dictMil"] = {"point3D": dictMil["point3D"]}
-            dictDevelopp["fCouture"] = self.fCouture
-            dictDevelopp["frac"] = chainette.compCurv(fX=dictChainette["ecartement"]/2.) / \
-                                   (dictChainette["ecartement"]/2.)
-            self.developp.comp(dictDevelopp=dictDevelopp)
+    #-----
+    def startCalcs(self, nStepsDxf: int, nStepsStl: int, npA: np.ndarray = None,
+                   bStl: bool = True, bDxf: bool = True, fTolStl: float = None,
+                   fTolDxf: float = None, nSurechStl: int = 1) -> None:
+
+        """ lance les calculs dans un panneau
+
+            c'est la partie importante du programme
+            1. les sections sont préparées par prepCalcs (si ce n'est déjà fait),
+               avec fTolDxf seules les sections nécessaires au développé sont gardées
+            2. pour chaque tranche, on cherche la chainette correspondant au creux local
+               et qui s'appuie sur le haut et le bas, les "a" peuvent être fournis
+               par l'appelant (résolution globale) sinon toutes les chainettes du panneau
+               sont résolues d'un bloc
+            3. on peut alors calculer le developpé du panneau
+            4. dans chaque chainette découpée en nStepStl+1 de chaque côté on calcule les points
+               de la surface, toutes les sections étant traitées d'un bloc par compSurface.
+               Avec fTolStl (mm), chaque demi chainette est échantillonnée là où elle s'écarte
+               le plus de ses cordes (compAdaptatif), avec un nombre de points propre à chaque section
+               Avec nSurechStl > 1, la surface a nSurechStl sections par intervalle entre 2 sections,
+               les chainettes intermédiaires sont interpolées sans résolution (compSurech)
+            Sans bDxf le développé (3.) n'est pas calculé, sans bStl la surface (4.) non plus.
+
+        """
+
+        fDeb = time.perf_counter()
+
+        if self.npFrac is None:
+            self.prepCalcs(nStepsDxf=nStepsDxf, fTolDxf=fTolDxf)
+
+        dictChainettes = {"ecartement": self.npEcart, "creux": self.npCreux}
+        if npA is not None:
+            dictChainettes["a"] = npA
+        chainettes = ch.Chainettesdict(dictChainettes)
+
+        # la longueur de chainette de chaque section, de part et d'autre du milieu
+        npDist = self.npEcart/2.
+        self.npLongChainettes = 2.*chainettes.compCurv(npX=npDist)
+
+        if bDxf:
+
+            # la fraction de longueur de chainette pour chaque section
+            npFracCurv = self.npLongChainettes/self.npEcart
+
+            # on peut dès lors calculer le développé du panneau section par section
+            (lBas, lHaut, lMil) = (self.npBas.tolist(), self.npHaut.tolist(), self.npMil.tolist())
+            for i in range(self.npFrac.size):
+
+                dictDevelopp = {}
+                dictDevelopp["index"] = i
+                dictDevelopp["endroit3DBas"] = di.Endroit3D.fromXyz(*lBas[i])
+                dictDevelopp["endroit3DHaut"] = di.Endroit3D.fromXyz(*lHaut[i])
+                dictDevelopp["endroit3DMil"] = di.Endroit3D.fromXyz(*lMil[i])
+                dictDevelopp["fCouture"] = self.fCouture
+                dictDevelopp["frac"] = float(npFracCurv[i])
+                self.developp.comp(dictDevelopp=dictDevelopp)
+
+            # on horizontalize le panneau développé
+            self.developp.horiz()
+
+        if bStl:
+
+            # on calcule les points de la surface, toutes les sections d'un bloc
+            dictSurface = {"npBas": self.npBas,
+                           "npHaut": self.npHaut,
+                           "npMil": self.npMil,
+                           "npV3dMil": self.npV3dMil,
+                           "npV3dMilNorm": self.npV3dMilNorm,
+                           "npEcart": self.npEcart,
+                           "chainettes": chainettes,
+                           "nStepsStl": nStepsStl}
+            if nSurechStl > 1:
+                dictSurface.update(self.compSurech(chainettes=chainettes, nSurechStl=nSurechStl))
+            if fTolStl is not None:
+                (dictSurface["npFx"], self.npNbPointsStl, self.npErreurStl) = \
+                    dictSurface["chainettes"].compAdaptatif(fTol=fTolStl, nMax=NMAX_POINTS_STL)
+                self.npFxStl = dictSurface["npFx"]/dictSurface["chainettes"].npDist[:, np.newaxis]
+            self.npSurface = Panneau.compSurface(dictSurface=dictSurface)
+
+        self.fTempsCalcs = time.perf_counter() - fDeb
+
+    #-----
+    def compSurech(self, chainettes: ch.Chainettesdict, nSurechStl: int) -> dict:
+
+        """
+            sur-échantillonne les sections pour la surface : nSurechStl sections par intervalle,
+            les points bas, haut et millieu sont sur les batons (interpolation linéaire exacte),
+            les chainettes sont interpolées par Chainettesdict.compSurech à partir des chainettes
+            résolues des sections, sans aucune résolution
+            l'écart de creux entre ces chainettes et le modèle de creux (celui qu'aurait donné
+            une résolution exacte de chaque section intermédiaire) est rangé dans fErreurSurech
+            retourne le dict des tableaux des sections sur-échantillonnées pour compSurface
+
+            :param: Chainettesdict, int
+            :rtype: dict
+
+            :Example:
+
+            >>> panneau = Panneau.__new__(Panneau)
+            >>> panneau.npFrac = np.array([0., 0.5, 1.])
+            >>> panneau.npBas = np.array([[0., 0., 0.], [50., 0., 0.], [100., 0., 0.]])
+            >>> panneau.npHaut = panneau.npBas + [0., 0., 10.]
+            >>> panneau.npMil = panneau.npBas + [0., 0., 5.]
+            >>> panneau.model = md.ModelParabolique({"rpdepth": 50., "creuxmax": 1.})
+            >>> chainettes = ch.Chainettesdict({"creux": np.array([0., 1., 0.]), "ecartement": np.full(3, 10.)})
+            >>> dictSurech = panneau.compSurech(chainettes, nSurechStl=2)
+            >>> panneau.npFracStl
+            array([0.  , 0.25, 0.5 , 0.75, 1.  ])
+            >>> (dictSurech["npMil"][:, 0], dictSurech["npEcart"])
+            (array([  0.,  25.,  50.,  75., 100.]), array([10., 10., 10., 10., 10.]))
+            >>> print(np.round(dictSurech["chainettes"].npCreux, 6))
+            [0.       0.745758 1.       0.745758 0.      ]
+            >>> round(panneau.fErreurSurech, 6)
+            0.004242
+
+        """
+
+        nSections = self.npFrac.size
+        npT = np.arange(nSurechStl, dtype=float)/float(nSurechStl)
+        self.npFracStl = np.append((self.npFrac[:-1, np.newaxis] + np.diff(self.npFrac)[:, np.newaxis]*npT).ravel(),
+                                   self.npFrac[-1])
+
+        # les batons sont droits, les points des sections intermédiaires sont interpolés exactement
+        npIndices = np.interp(self.npFracStl, self.npFrac, np.arange(nSections, dtype=float))
+        npI = np.minimum(npIndices.astype(int), nSections - 2)
+        npT = (npIndices - npI)[:, np.newaxis]
+        dictSurech = {}
+        for i in ("npBas", "npHaut", "npMil"):
+            npPoints = getattr(self, i)
+            dictSurech[i] = npPoints[npI]*(1. - npT) + npPoints[npI+1]*npT
+        dictSurech["npEcart"] = np.linalg.norm(dictSurech["npHaut"] - dictSurech["npBas"], axis=1)
+        dictSurech["chainettes"] = chainettes.compSurech(npFrac=self.npFrac, npFracFin=self.npFracStl,
+                                                         npEcartFin=dictSurech["npEcart"])
+
+        npCreuxModele = np.array([self.model.getCreux(fraction=float(i)) for i in self.npFracStl])
+        self.fErreurSurech = float(np.abs(dictSurech["chainettes"].npCreux - npCreuxModele).max())
+
+        return dictSurech
+
+    #-----
+    @staticmethod
+    def compSurface(dictSurface: dict) -> np.ndarray:
+
+        """
+            calcule d'un bloc les points de la surface du panneau
+
+            pour chaque section i on construit le repère local (X', Y', Z') :
+                X' le baton millieu normé
+                Z' le vecteur bas -> haut normé
+                Y' = -(X' ^ Z') normé
+            la matrice de passage de chaque section est rangée dans un tableau (nSections, 3, 3)
+            les ordonnées des chainettes sont calculées sur un tableau (nSections, nStepsStl+1)
+            et tous les points sont ramenés dans le repère normal par un seul produit matriciel
+
+            le résultat est un tableau (nSections, nStepsStl+1, 2, 3), l'avant dernier axe
+            correspondant aux 2 côtés symétriques de la chainette (+fX et -fX)
+            il est identique au calcul point par point à 1.e-9 mm près
+            les abscisses peuvent être fournies (clé "npFx", tableau (nSections, nPoints)),
+            sinon elles sont réparties uniformément de 0 à écartement/2
+
+            :param: dict
+            :rtype: np.ndarray
+
+            :Example:
+
+            >>> dictSurface = {"npBas": np.array([[0., 0., 0.], [100., 0., 10.]]),
+            ...                "npHaut": np.array([[0., 0., 100.], [100., 0., 110.]]),
+            ...                "npMil": np.array([[0., 0., 50.], [100., 0., 60.]]),
+            ...                "npV3dMil": np.array([100., 0., 10.]),
+            ...                "npV3dMilNorm": np.array([100., 0., 10.])/math.hypot(100., 10.),
+            ...                "npEcart": np.array([100., 100.]),
+            ...                "chainettes": ch.Chainettesdict({"ecartement": np.array([100., 100.]),
+            ...                                                 "creux": np.array([0., 10.])}),
+            ...                "nStepsStl": 2}
+            >>> npSurface = Panneau.compSurface(dictSurface)
+            >>> npSurface.shape
+            (2, 3, 2, 3)
+            >>> print(np.round(npSurface[0, 2], 3))
+            [[  0.   0. 100.]
+             [  0.   0.   0.]]
+            >>> print(np.round(npSurface[1, 0], 3))
+            [[100. -10.  60.]
+             [100. -10.  60.]]
+
+        """
+
+        npBas = dictSurface["npBas"]
+        npHaut = dictSurface["npHaut"]
+        npMil = dictSurface["npMil"]
+        nSections = npMil.shape[0]
+
+        # les axes Z' de chaque section
+        npV3dBasHaut = npHaut - npBas
+        npV3dBasHautNorm = npV3dBasHaut / np.linalg.norm(npV3dBasHaut, axis=1)[:, np.newaxis]
+
+        # les axes Y', noter le - pour avoir le Y'
+        npV3dY = np.cross(dictSurface["npV3dMil"], npV3dBasHaut)
+        npV3dYNorm = npV3dY / -np.linalg.norm(npV3dY, axis=1)[:, np.newaxis]
+
+        # les matrices de passage, une par section, les axes sont en colonnes
+        npPassage = np.empty((nSections, 3, 3))
+        npPassage[:, :, 0] = dictSurface["npV3dMilNorm"]
+        npPassage[:, :, 1] = npV3dYNorm
+        npPassage[:, :, 2] = npV3dBasHautNorm
+
+        # dans l'espace 2D des chainettes, abscisses et profondeurs
+        npFx = dictSurface.get("npFx")
+        if npFx is None:
+            nStepsStl = dictSurface["nStepsStl"]
+            npFx = np.outer(dictSurface["npEcart"]/(2.*float(nStepsStl)), np.arange(nStepsStl+1, dtype=float))
+        npFy = dictSurface["chainettes"].comp(npX=npFx)
+        nPoints = npFx.shape[1]
+
+        # la chainette étant symétrique, avec un calcul on fait 2 points
+        # dans l'espace de la chainette (0., fY, +-fX)
+        npLocal = np.zeros((nSections, nPoints, 2, 3))
+        npLocal[:, :, :, 1] = npFy[:, :, np.newaxis]
+        npLocal[:, :, 0, 2] = npFx
+        npLocal[:, :, 1, 2] = -npFx
+
+        # on convertit tous ces points dans le repère normal
+        npGlobal = npLocal.reshape(nSections, -1, 3) @ npPassage.transpose(0, 2, 1)
+
+        return npGlobal.reshape(nSections, nPoints, 2, 3) + npMil[:, np.newaxis, np.newaxis, :]
+
+    #-----
+    def getHash(self, nStepsDxf: int, nStepsStl: int, fTolStl: float = None, fTolDxf: float = None,
+                nSurechStl: int = 1) -> str:
+
+        """
+            retourne l'empreinte (sha256) des données d'entrée du panneau : numéro, points
+            des 2 batons (après twist), chainettes, couture, modèle, subdivisions, tolérances stl
+            et dxf, sur-échantillonnage et version des calculs, deux panneaux de même empreinte donnent les mêmes résultats
+
+            :Example:
+
+            >>> dictBaton = {"type": "Bas", "extremites": [
+            ...     {"type": "Guindant", "point3D": {"x": 0., "y": 0., "z": 0.}},
+            ...     {"type": "Chute", "point3D": {"x": 1000., "y": 0., "z": 100.}}]}
+            >>> a = Panneau.__new__(Panneau)
+            >>> (a.numPanneau, a.fChainLuff, a.fChainLeech, a.fCouture) = (1, 2., 2., 12.)
+            >>> a.dictModel = {"nameModel": "ModelFlat"}
+            >>> a.lbatons = [Baton(dictBaton), Baton(dict(dictBaton, type="Haut"))]
+            >>> a.getHash(nStepsDxf=20, nStepsStl=40) == a.getHash(nStepsDxf=20, nStepsStl=40)
+            True
+            >>> a.getHash(nStepsDxf=20, nStepsStl=40) == a.getHash(nStepsDxf=20, nStepsStl=20)
+            False
+            >>> a.getHash(nStepsDxf=20, nStepsStl=40) == a.getHash(nStepsDxf=20, nStepsStl=40, fTolStl=0.5)
+            False
+
+        """
+
+        dictEntrees = {"version": VERSION_CALCS,
+                       "numPanneau": self.numPanneau,
+                       "batons": [i.getPoints().tolist() for i in self.lbatons],
+                       "fChainLuff": self.fChainLuff,
+                       "fChainLeech": self.fChainLeech,
+                       "fCouture": self.fCouture,
+                       "model": self.dictModel,
+                       "nStepsDxf": nStepsDxf,
+                       "nStepsStl": nStepsStl,
+                       "fTolStl": fTolStl,
+                       "fTolDxf": fTolDxf,
+                       "nSurechStl": nSurechStl}
+
+        return hashlib.sha256(json.dumps(dictEntrees, sort_keys=True).encode()).hexdigest()
+
+    #-----
+    def getResultats(self) -> dict:
+
+        """
+            retourne les résultats des calculs du panneau sous forme de dict de tableaux
+            (sections, longueurs de chainettes, itérations, surface et polylignes
+            du développé s'ils ont été calculés), pour les caches de panneaux
+        """
+
+        dictResultats = {"npFrac": self.npFrac,
+                         "npBas": self.npBas,
+                         "npHaut": self.npHaut,
+                         "npMil": self.npMil,
+                         "npEcart": self.npEcart,
+                         "npCreux": self.npCreux,
+                         "npV3dMil": self.npV3dMil,
+                         "npV3dMilNorm": self.npV3dMilNorm,
+                         "npLongChainettes": self.npLongChainettes}
+        for (k, v) in self.dictNitersSections.items():
+            dictResultats[f'niters_{k}'] = v
+        if self.npSurface is not None:
+            dictResultats["npSurface"] = self.npSurface
+        if self.npNbPointsStl is not None:
+            dictResultats["npNbPointsStl"] = self.npNbPointsStl
+            dictResultats["npFxStl"] = self.npFxStl
+            dictResultats["npErreurStl"] = self.npErreurStl
+        if self.npFracStl is not None:
+            dictResultats["npFracStl"] = self.npFracStl
+            dictResultats["fErreurSurech"] = np.array(self.fErreurSurech)
+        if self.developp.points2DMil is not None:
+            dictResultats.update(self.developp.getPolylignes())
+
+        return dictResultats
+
+    #-----
+    def setResultats(self, dictResultats: dict) -> None:
+
+        """ remet en place les résultats retournés par getResultats, sans aucun calcul """
+
+        for i in ("npFrac", "npBas", "npHaut", "npMil", "npEcart", "npCreux", "npV3dMil", "npV3dMilNorm",
+                  "npLongChainettes"):
+            setattr(self, i, dictResultats[i])
+        self.dictNitersSections = {k[len('niters_'):]: v for (k, v) in dictResultats.items()
+                                   if k.startswith('niters_')}
+        self.npSurface = dictResultats.get("npSurface")
+        self.npNbPointsStl = dictResultats.get("npNbPointsStl")
+        self.npFxStl = dictResultats.get("npFxStl")
+        self.npErreurStl = dictResultats.get("npErreurStl")
+        self.npFracStl = dictResultats.get("npFracStl")
+        self.fErreurSurech = float(dictResultats["fErreurSurech"]) if "fErreurSurech" in dictResultats else None
+        if all(i in dictResultats for i in de.POLYLIGNES):
+            self.developp.setPolylignes(dictResultats)
+        self.fTempsCalcs = 0.
+
+    #-----
+    def getMetriques(self) -> dict:
 
-            # on calcule les points de la surface
-            lPointsChainette = []
-            for j in range(nStepsStl+1):
+        """
+            retourne les mesures du panneau calculé : longueurs et surface du développé,
+            longueurs des chainettes au guindant, à la chute et la plus longue
+        """
 
-                # dans l'espace 2D de la chainette, on calcule la profondeur de la chainette
-                fX = (float(j) * dictChainette["ecartement"]) / (2. * float(nStepsStl))
-                fY = chainette.comp(fX=fX)
+        dictMetriques = {"numPanneau": self.numPanneau}
+        dictMetriques.update(self.developp.getMetriques())
+        dictMetriques["chainetteGuindant"] = float(self.npLongChainettes[0])
+        dictMetriques["chainetteChute"] = float(self.npLongChainettes[-1])
+        dictMetriques["chainetteMax"] = float(self.npLongChainettes.max())
 
-                # la chainette étant symétrique, avec un calcul on fait 2 points au format np
-                # et dans l'espace de la chainette
-                npPoint1 = np.array([0., fY, fX])
-                npPoint2 = np.array([0., fY, -fX])
+        return dictMetriques
 
-                # on convertit ce point dans le repère normal
-                npPoint1N = npPassage @ npPoint1 + npMil
-                npPoint2N = npPassage @ npPoint2 + npMil
-                lPointsChainette.append([npPoint1N, npPoint2N])
+    #-----
+    def getNbFacettes(self, nStepsStl: int) -> int:
 
-            self.lPoints.append(lPointsChainette)
+        """
+            retourne le nombre de triangles stl du panneau : 4.nSections.nStepsStl en échantillonnage
+            uniforme (nSections intervalles entre les sections de la surface, choisies ou
+            sur-échantillonnées), en adaptatif chaque bande entre 2 sections de n et m intervalles
+            porte n+m triangles de chaque côté
+        """
 
-        # on horizontalize le panneau développé
-        self.developp.horiz()
+        if self.npNbPointsStl is None:
+            return 4*(self.npSurface.shape[0] - 1)*nStepsStl
+
+        return int(2*(self.npNbPointsStl[:-1] + self.npNbPointsStl[1:]).sum())
 
     #-----
-    def createStl(self, nStepsDxf: int, nStepsStl: int) -> list:
+    def createStl(self, nStepsStl: int, npFacettes: np.ndarray = None) -> np.ndarray:
 
         """
-            retourne le tableau des sommets des triangles dans le panneau
+            retourne le tableau (4.nSections.nStepsStl, 3, 3) des sommets des triangles du panneau,
+            nSections étant le nombre d'intervalles entre les sections de la surface
             en traitant simultanément les 2 côtés de la chainete, on récupère un quadrilatère
             que l'on divise en 2 triangles
+            les sommets sont rangés directement dans npFacettes (une vue du maillage complet)
+            quand il est fourni, l'ordre des triangles est celui de la double boucle
+            sections / points de chainette : côté 0 (11, 21, 22), (11, 12, 22) puis côté 1
+
+            :Example:
+
+            >>> npSurface = np.arange(2*3*2*3, dtype=float).reshape(2, 3, 2, 3)
+            >>> panneau = Panneau.__new__(Panneau)
+            >>> panneau.npSurface = npSurface
+            >>> panneau.npNbPointsStl = None
+            >>> npFacettes = panneau.createStl(nStepsStl=2)
+            >>> npFacettes.shape
+            (8, 3, 3)
+            >>> [[int(k[0]) for k in j] for j in npFacettes[:4]]
+            [[0, 18, 24], [0, 6, 24], [3, 21, 27], [3, 9, 27]]
+
+            en échantillonnage adaptatif (npNbPointsStl), les sections voisines n'ont pas le même
+            nombre de points : chaque bande est triangulée en avançant sur la section dont le
+            prochain point (en fraction de l'écartement) est le plus proche
+
+            >>> panneau.npNbPointsStl = np.array([2, 1])
+            >>> panneau.npFxStl = np.array([[0., 0.5, 1.], [0., 1., 1.]])
+            >>> npFacettes = panneau.createStl(nStepsStl=2)
+            >>> npFacettes.shape
+            (6, 3, 3)
+            >>> [[int(k[0]) for k in j] for j in npFacettes[::2]]
+            [[0, 6, 18], [6, 12, 18], [12, 18, 24]]
         """
 
-        lFacettes = []
-        for i in range(nStepsDxf):
-            lChain1 = self.lPoints[i]
-            lChain2 = self.lPoints[i+1]
-            for j in range(nStepsStl):
-                lPoint11 = lChain1[j]
-                lPoint12 = lChain1[j+1]
-                lPoint21 = lChain2[j]
-                lPoint22 = lChain2[j+1]
-                lFacettes.append([lPoint11[0].tolist(), lPoint21[0].tolist(), lPoint22[0].tolist()])
-                lFacettes.append([lPoint11[0].tolist(), lPoint12[0].tolist(), lPoint22[0].tolist()])
-                lFacettes.append([lPoint11[1].tolist(), lPoint21[1].tolist(), lPoint22[1].tolist()])
-                lFacettes.append([lPoint11[1].tolist(), lPoint12[1].tolist(), lPoint22[1].tolist()])
+        if self.npNbPointsStl is not None:
+            return self.createStlAdaptatif(npFacettes=npFacettes)
+
+        npSurface = self.npSurface
+        nSections = npSurface.shape[0] - 1
+        self.nFacettes = 4*nSections*nStepsStl
+        if npFacettes is None:
+            npFacettes = np.empty((4*nSections*nStepsStl, 3, 3))
+
+        #----- (section, point, côté, triangle, sommet, xyz) -> (triangle, sommet, xyz)
+        npQuads = npFacettes.reshape(nSections, nStepsStl, 2, 2, 3, 3)
+        npQuads[:, :, :, :, 0] = npSurface[:-1, :-1, :, None]
+        npQuads[:, :, :, 0, 1] = npSurface[1:, :-1]
+        npQuads[:, :, :, 1, 1] = npSurface[:-1, 1:]
+        npQuads[:, :, :, :, 2] = npSurface[1:, 1:, :, None]
 
-        return lFacettes
+        return npFacettes
 
     #-----
-    def createDxf(self, drawing: ezdxf.document.Drawing) -> None:
+    def createStlAdaptatif(self, npFacettes: np.ndarray = None) -> np.ndarray:
+
+        """
+            retourne le tableau des sommets des triangles du panneau en échantillonnage adaptatif
+            pour chaque bande entre les sections i et i+1, de n et m intervalles, les n+m points
+            suivants des 2 sections sont fusionnés dans l'ordre de leurs fractions d'écartement :
+            avancer sur la section i donne le triangle (Pk, Pk+1, Ql), sur la section i+1
+            le triangle (Pk, Ql, Ql+1), les 2 côtés de la chainette sont traités ensemble
+        """
+
+        lSections = []
+        lPoints = []
+        for i in range(self.npNbPointsStl.size - 1):
+
+            (n0, n1) = (int(self.npNbPointsStl[i]), int(self.npNbPointsStl[i+1]))
+            npOrdre = np.argsort(np.concatenate((self.npFxStl[i, 1:n0+1], self.npFxStl[i+1, 1:n1+1])),
+                                 kind='stable')
+            npAvance0 = npOrdre < n0
+
+            # les indices courants sur chaque section, avant chaque pas
+            npK = np.cumsum(npAvance0) - npAvance0
+            npL = np.cumsum(~npAvance0) - ~npAvance0
+
+            npSections = np.empty((n0+n1, 3), dtype=int)
+            npSections[:, 0] = i
+            npSections[:, 1] = np.where(npAvance0, i, i+1)
+            npSections[:, 2] = i+1
+            npPts = np.empty((n0+n1, 3), dtype=int)
+            npPts[:, 0] = npK
+            npPts[:, 1] = np.where(npAvance0, npK+1, npL)
+            npPts[:, 2] = np.where(npAvance0, npL, npL+1)
+            lSections.append(npSections)
+            lPoints.append(npPts)
+
+        #----- (triangle, sommet, côté, xyz) -> (triangle, côté, sommet, xyz) -> (triangle, sommet, xyz)
+        npTriangles = self.npSurface[np.concatenate(lSections), np.concatenate(lPoints)]
+        self.nFacettes = 2*npTriangles.shape[0]
+        if npFacettes is None:
+            npFacettes = np.empty((self.nFacettes, 3, 3))
+        npFacettes.reshape(-1, 2, 3, 3)[:] = npTriangles.transpose(0, 2, 1, 3)
+
+        return npFacettes
+
+    #-----
+    def createDxf(self, drawing: ezdxf.document.Drawing, dateCreation: datetime = None) -> None:
 
         """ charge les points du développé de chaque panneau dans un bloc """
 
         blockPanneau = drawing.blocks.new(name='Panel #'+str(self.numPanneau))
-        self.developp.createDxf(block=blockPanneau)
+        self.nPolylignes = self.developp.createDxf(block=blockPanneau, dateCreation=dateCreation)
 
     #-----
     def __str__(self) -> None:
@@ -593,6 +1237,9 @@ class Saildatas:
             self.fileStl:        str
             self.nStepsDxf:      int
             self.nStepsStl:      int
+            self.fTolStl:        float
+            self.fTolDxf:        float
+            self.nSurechStl:     int
             self.fAtwist:        float
             self.fAtwistr:       float
             self.lpanneaux:      list
@@ -600,6 +1247,8 @@ class Saildatas:
             self.fHtMaxChute:    float
             self.fHtMinGuindant: float
             self.fHtMaxGuindant: float
+            self.dictNiters:     dict
+            self.lRecalculs:     list
 
         .. seealso::
         .. warning::
@@ -658,6 +1307,39 @@ class Saildatas:
         else:
             print(f'< !!!! > Pas de clé "nStepsStl" ou clé incorrecte dans le Json valeur par défaut affectée')
 
+        # fTolStl : flottant compris entre > 0. et <= 100. (mm), facultatif, par défaut None
+        # avec fTolStl les chainettes sont échantillonnées selon leur courbure pour le stl
+        self.fTolStl = None
+        if "fTolStl" in self.dictVoile:
+            if isinstance(self.dictVoile["fTolStl"], float) and \
+               self.dictVoile["fTolStl"] > 0. and \
+               self.dictVoile["fTolStl"] <= 100.:
+                self.fTolStl = self.dictVoile["fTolStl"]
+            else:
+                print(f'< !!!! > Clé "fTolStl" incorrecte dans le Json échantillonnage stl uniforme affecté')
+
+        # fTolDxf : flottant compris entre > 0. et <= 100. (mm), facultatif, par défaut None
+        # avec fTolDxf seules les nStepsDxf+1 sections nécessaires au développé sont gardées
+        self.fTolDxf = None
+        if "fTolDxf" in self.dictVoile:
+            if isinstance(self.dictVoile["fTolDxf"], float) and \
+               self.dictVoile["fTolDxf"] > 0. and \
+               self.dictVoile["fTolDxf"] <= 100.:
+                self.fTolDxf = self.dictVoile["fTolDxf"]
+            else:
+                print(f'< !!!! > Clé "fTolDxf" incorrecte dans le Json découpage uniforme affecté')
+
+        # nSurechStl : entier compris entre >= 1 et <= 20, facultatif, par défaut 1
+        # nombre de sections stl par intervalle entre 2 sections, les intermédiaires sont interpolées
+        self.nSurechStl = 1
+        if "nSurechStl" in self.dictVoile:
+            if isinstance(self.dictVoile["nSurechStl"], int) and \
+               self.dictVoile["nSurechStl"] >= 1 and \
+               self.dictVoile["nSurechStl"] <= 20:
+                self.nSurechStl = self.dictVoile["nSurechStl"]
+            else:
+                print(f'< !!!! > Clé "nSurechStl" incorrecte dans le Json valeur par défaut affectée')
+
         # fAtwist : flottant compris entre >= 0. et <= 24., par défaut 0.
         # A noter que le twist est appliqué tribord amures (donc négatif)
         self.fAtwist = 0.
@@ -690,67 +1372,274 @@ class Saildatas:
         self.fHtMinGuindant = min(self.tHtsGuindant)
         self.fHtMaxGuindant = max(self.tHtsGuindant)
 
+        # les itérations des solveurs de chainettes
+        self.dictNiters = {}
+
+        # pour chaque panneau, calculé (True) ou repris du cache des panneaux (False)
+        self.lRecalculs = []
+
     #-----
-    def applyTwists(self) -> dict:
+    def applyTwists(self) -> None:
 
         """
             le calcul du twist est une rotation autour de z de tout les panneaux
             on l'effectue vers tribord cad avec un angle négatif
             la quantité de rotation est linéaire selon la hauteur de la chute
+            toutes les extrémités de tous les batons sont tournées d'un bloc, sur place,
+            sans modifier le dict de la voile, et avant prepCalcs
+            si toutes les chutes sont à la même hauteur, aucun twist n'est appliqué
         """
 
-        dictTwist = self.dictVoile
-        del dictTwist["panneaux"]
-        panneaux = []
-        for i in self.lpanneaux:
-            panneaux.append(i.applyTwists(fHtMinChute=self.fHtMinChute, \
-                                          fHtMaxChute=self.fHtMaxChute, \
-                                          fAtwistr=self.fAtwistr))
-        dictTwist["panneaux"] = panneaux
-        return dictTwist
+        lbatons = [j for i in self.lpanneaux for j in i.lbatons]
+
+        # (nBatons, 2 extrémités, xyz) et l'angle de chaque baton selon sa hauteur de chute
+        npPoints = np.array([i.getPoints() for i in lbatons])
+        npHtChute = np.array([i.fHtChute for i in lbatons])
+        if self.fHtMaxChute > self.fHtMinChute:
+            npAtwistr = self.fAtwistr*(npHtChute - self.fHtMinChute)/(self.fHtMaxChute - self.fHtMinChute)
+        else:
+            npAtwistr = np.zeros_like(npHtChute)
+
+        pointsTwist = ge.Points(npPoints.reshape(-1, 3)).rot3dz(ath=np.repeat(npAtwistr, 2))
+        npTwist = pointsTwist.getArray().reshape(npPoints.shape)
+
+        for (i, j) in zip(lbatons, npTwist):
+            i.setPoints(j)
 
     #-----
-    def startCalcs(self) -> None:
+    def startCalcs(self, sSolveur: str = "table", cache: ca.Cache = None, nJobs: int = 1,
+                   bStl: bool = True, bDxf: bool = True, cachePanneaux: ca.Cache = None) -> None:
 
-        """ le calcul des différentes sections, baton milieu, etc """
+        """
+            le calcul des différentes sections, baton milieu, etc
+            avec le solveur "table", les chainettes de toutes les sections de tous
+            les panneaux sont résolues en un seul appel, avec les solveurs "newton"
+            et "brent" elles sont résolues section par section
+            le cache éventuel évite de résoudre à nouveau une chainette déjà connue
+            avec nJobs > 1, les panneaux (indépendants une fois les chainettes résolues)
+            sont calculés dans un pool de processus, les résultats sont rangés dans
+            l'ordre des panneaux : la sortie est identique au calcul séquentiel
+            bStl et bDxf limitent les calculs à ce que demandent les sorties
+            avec un cache des panneaux (Cache en mémoire ou Cachedisque), les résultats d'un
+            panneau dont les données d'entrée (son empreinte) sont déjà connues sont repris
+            du cache, seuls les autres panneaux sont calculés
+            avec fTolStl, la surface est échantillonnée selon la courbure des chainettes
+            avec fTolDxf, les sections sont placées là où le creux et les batons varient
+            avec nSurechStl > 1, la surface a des sections intermédiaires interpolées
+        """
 
-        for i in self.lpanneaux:
-            i.startCalcs(nStepsDxf=self.nStepsDxf, nStepsStl=self.nStepsStl)
+        # les panneaux repris du cache et ceux à calculer
+        lCles = []
+        self.lRecalculs = [True]*len(self.lpanneaux)
+        if cachePanneaux is not None:
+            for (k, i) in enumerate(self.lpanneaux):
+                tCle = (i.getHash(nStepsDxf=self.nStepsDxf, nStepsStl=self.nStepsStl,
+                                  fTolStl=self.fTolStl, fTolDxf=self.fTolDxf, nSurechStl=self.nSurechStl),
+                        sSolveur, bStl, bDxf)
+                dictResultats = cachePanneaux.get(tCle)
+                if dictResultats is not None:
+                    i.setResultats(dictResultats)
+                    self.lRecalculs[k] = False
+                else:
+                    lCles.append(tCle)
+        lCalculs = [i for (i, b) in zip(self.lpanneaux, self.lRecalculs) if b]
+
+        for i in lCalculs:
+            i.prepCalcs(nStepsDxf=self.nStepsDxf, fTolDxf=self.fTolDxf)
+
+        lA = []
+        if not lCalculs:
+
+            pass
+
+        elif sSolveur == "table":
+
+            dictChainettes = {"ecartement": np.concatenate([i.npEcart for i in lCalculs]),
+                              "creux": np.concatenate([i.npCreux for i in lCalculs])}
+            if cache is not None:
+                dictChainettes["cache"] = cache
+            chainettes = ch.Chainettesdict(dictChainettes)
+            (npNitersZbrac, npNitersZbrent) = chainettes.getNiters()
+
+            nDeb = 0
+            for i in lCalculs:
+                nFin = nDeb + i.npFrac.size
+                lA.append(chainettes.npA[nDeb:nFin])
+                i.dictNitersSections = {"zbrac": npNitersZbrac[nDeb:nFin],
+                                        "zbrent": npNitersZbrent[nDeb:nFin],
+                                        "znewton": np.zeros(nFin - nDeb, dtype=int)}
+                nDeb = nFin
+
+        else:
+
+            for i in lCalculs:
+                (npA, i.dictNitersSections) = i.solveChainettes(sSolveur=sSolveur, cache=cache)
+                lA.append(npA)
+
+        self.dictNiters = {k: int(sum(i.dictNitersSections[k].sum() for i in lCalculs))
+                           for k in ("zbrac", "zbrent", "znewton")}
+
+        if nJobs > 1 and len(lCalculs) > 1:
+
+            with ProcessPoolExecutor(max_workers=min(nJobs, len(lCalculs))) as executor:
+                lResults = list(executor.map(Saildatas.calcPanneau,
+                                             lCalculs,
+                                             [self.nStepsDxf]*len(lCalculs),
+                                             [self.nStepsStl]*len(lCalculs),
+                                             lA,
+                                             [bStl]*len(lCalculs),
+                                             [bDxf]*len(lCalculs),
+                                             [self.fTolStl]*len(lCalculs),
+                                             [self.nSurechStl]*len(lCalculs)))
+            for (i, (npSurface, npLongChainettes, tStl, developp, fTempsCalcs)) in zip(lCalculs, lResults):
+                i.npSurface = npSurface
+                i.npLongChainettes = npLongChainettes
+                (i.npNbPointsStl, i.npFxStl, i.npErreurStl, i.npFracStl, i.fErreurSurech) = tStl
+                i.developp = developp
+                i.fTempsCalcs = fTempsCalcs
+
+        else:
+
+            for (i, npA) in zip(lCalculs, lA):
+                i.startCalcs(nStepsDxf=self.nStepsDxf, nStepsStl=self.nStepsStl, npA=npA, bStl=bStl, bDxf=bDxf,
+                             fTolStl=self.fTolStl, nSurechStl=self.nSurechStl)
+
+        # les panneaux calculés sont rangés dans le cache des panneaux
+        if cachePanneaux is not None:
+            for (tCle, i) in zip(lCles, lCalculs):
+                cachePanneaux.put(tCle, i.getResultats())
 
     #-----
-    def createStl(self) -> None:
+    @staticmethod
+    def calcPanneau(panneau: Panneau, nStepsDxf: int, nStepsStl: int, npA: np.ndarray,
+                    bStl: bool = True, bDxf: bool = True, fTolStl: float = None, nSurechStl: int = 1) -> tuple:
 
-        """ la création du fichier stl """
+        """
+            calcule un panneau dans un processus du pool et retourne la grille de la surface,
+            les longueurs de chainettes, l'échantillonnage stl adaptatif et sur-échantillonné,
+            le développé et le temps de calcul
+        """
 
-        lFacettes = []
-        for i in self.lpanneaux:
-            lFacettes += i.createStl(nStepsDxf=self.nStepsDxf, nStepsStl=self.nStepsStl)
-        voileStl = mesh.Mesh(np.zeros(len(lFacettes), dtype=mesh.Mesh.dtype))
-        voileStl.vectors = lFacettes
-        voileStl.save(self.fileStl)
+        panneau.startCalcs(nStepsDxf=nStepsDxf, nStepsStl=nStepsStl, npA=npA, bStl=bStl, bDxf=bDxf,
+                           fTolStl=fTolStl, nSurechStl=nSurechStl)
+        return (panneau.npSurface, panneau.npLongChainettes,
+                (panneau.npNbPointsStl, panneau.npFxStl, panneau.npErreurStl,
+                 panneau.npFracStl, panneau.fErreurSurech),
+                panneau.developp, panneau.fTempsCalcs)
+
+    #-----
+    def createStl(self, bMemmap: bool = False, bDeterministe: bool = False) -> None:
+
+        """
+            la création du fichier stl
+            avec bMemmap, le maillage est construit directement dans le fichier projeté en mémoire
+            avec bDeterministe, l'entête porte une date fixe : le fichier ne dépend que des données
+        """
+
+        #----- le maillage est alloué une seule fois, chaque panneau remplit sa tranche
+        npDebuts = np.cumsum([0] + [i.getNbFacettes(nStepsStl=self.nStepsStl)
+                                    for i in self.lpanneaux])
+        dictStl = {"fileStl": self.fileStl,
+                   "nFacettes": int(npDebuts[-1]),
+                   "memmap": bMemmap}
+        if bDeterministe:
+            dictStl["dateCreation"] = DATE_DETERMINISTE
+        voileStl = st.Fichierstl(dictStl)
+        for (n, i) in enumerate(self.lpanneaux):
+            i.createStl(nStepsStl=self.nStepsStl,
+                        npFacettes=voileStl.npSommets[npDebuts[n]:npDebuts[n+1]])
+
+        #----- les normales de toutes les facettes en un seul calcul
+        voileStl.compNormales()
+        voileStl.save()
         print(f'Fichier stl "{self.fileStl}" --> créé')
 
     #-----
-    def createDxf(self) -> None:
+    def createDxf(self, bDeterministe: bool = False) -> None:
+
+        """
+            la création du fichier dxf
+            avec bDeterministe, les dates (inscriptions et entête) et les GUID de l'entête
+            sont fixes : le fichier ne dépend que des données
+        """
 
-        """ la création du fichier stl """
+        #----- les métadonnées fixes d'ezdxf (marqueurs, dates, GUID) en mode déterministe,
+        #----- elles sont écrites à la création du dessin comme à la sauvegarde
+        ezdxf = importEzdxf()
+        bFixe = ezdxf.options.write_fixed_meta_data_for_testing
+        ezdxf.options.write_fixed_meta_data_for_testing = bDeterministe
+        try:
 
-        #----- definition du dessin
-        drawingDraw = ezdxf.new(dxfversion='AC1032', setup=True)
+            #----- definition du dessin
+            drawingDraw = ezdxf.new(dxfversion='AC1032', setup=True)
 
-        #----- definition d'un layer de base
-        layerVoile = drawingDraw.layers.new(name='Voile')
-        layerVoile.off()
-        layerVoile.lock()
+            #----- definition d'un layer de base
+            layerVoile = drawingDraw.layers.new(name='Voile')
+            layerVoile.off()
+            layerVoile.lock()
 
-        #----- mise en place du dessin de chaque développé
-        for i in self.lpanneaux:
-            i.createDxf(drawing=drawingDraw)
+            #----- mise en place du dessin de chaque développé
+            for i in self.lpanneaux:
+                i.createDxf(drawing=drawingDraw, dateCreation=DATE_DETERMINISTE if bDeterministe else None)
+
+            #----- ezdxf range les classes requises dans l'ordre d'un set (variable d'une exécution
+            #----- à l'autre), en mode déterministe elles sont ajoutées puis triées par nom avant la sauvegarde
+            if bDeterministe:
+                drawingDraw.classes.add_required_classes(drawingDraw.dxfversion)
+                drawingDraw.classes.classes = dict(sorted(drawingDraw.classes.classes.items()))
+
+            #----- on sauve
+            drawingDraw.saveas(self.fileDxf)
+
+        finally:
+
+            ezdxf.options.write_fixed_meta_data_for_testing = bFixe
 
-        #----- on sauve
-        drawingDraw.saveas(self.fileDxf)
         print(f'Fichier dxf "{self.fileDxf}" --> créé')
 
+    #-----
+    def getReport(self) -> dict:
+
+        """
+            retourne les mesures de la voile pour le rapport Json : totaux, puis par panneau
+            le temps de calcul, les triangles, les polylignes et pour chaque section
+            l'écartement, le creux et les itérations des solveurs de chainettes
+        """
+
+        lPanneaux = []
+        for (i, bRecalcule) in zip(self.lpanneaux, self.lRecalculs):
+            dictSections = {"frac": i.npFrac.tolist(),
+                            "ecartement": i.npEcart.tolist(),
+                            "creux": i.npCreux.tolist()}
+            for (k, v) in i.dictNitersSections.items():
+                dictSections[k] = v.tolist()
+            if i.npFracStl is not None:
+                dictSections["fracStl"] = i.npFracStl.tolist()
+            if i.npNbPointsStl is not None:
+                dictSections["nPointsStl"] = i.npNbPointsStl.tolist()
+                dictSections["erreurStl"] = i.npErreurStl.tolist()
+            lPanneaux.append({"numPanneau": i.numPanneau,
+                              "recalcule": bRecalcule,
+                              "fTempsCalcs": i.fTempsCalcs,
+                              "nFacettes": i.nFacettes,
+                              "nPolylignes": i.nPolylignes,
+                              "fErreurStl": None if i.npErreurStl is None else float(i.npErreurStl.max()),
+                              "fErreurSurech": i.fErreurSurech,
+                              "sections": dictSections})
+
+        return {"nPanneaux": len(self.lpanneaux),
+                "nStepsDxf": self.nStepsDxf,
+                "nStepsStl": self.nStepsStl,
+                "fTolStl": self.fTolStl,
+                "fTolDxf": self.fTolDxf,
+                "nSections": sum(i.npFrac.size for i in self.lpanneaux),
+                "nSurechStl": self.nSurechStl,
+                "fAtwist": self.fAtwist,
+                "niters": self.dictNiters,
+                "nFacettes": sum(i.nFacettes for i in self.lpanneaux),
+                "nPolylignes": sum(i.nPolylignes for i in self.lpanneaux),
+                "panneaux": lPanneaux}
+
     #-----
     def __str__(self) -> str:
 
@@ -759,6 +1648,12 @@ class Saildatas:
         strMsg += f'--> Fichier stl                : {self.fileStl}\n'
         strMsg += f'--> Nombre de subdivisions dxf : {self.nStepsDxf:>9d}\n'
         strMsg += f'--> Nombre de subdivisions stl : {self.nStepsStl:>9d}\n'
+        if self.fTolStl is not None:
+            strMsg += f'--> Tolérance stl adaptative   : {self.fTolStl:>9.3f} mm\n'
+        if self.fTolDxf is not None:
+            strMsg += f'--> Tolérance dxf adaptative   : {self.fTolDxf:>9.3f} mm\n'
+        if self.nSurechStl > 1:
+            strMsg += f'--> Sur-échantillonnage stl    : {self.nSurechStl:>9d}\n'
         strMsg += f'--> Angle de Twist             : {self.fAtwist:>9.3f}° <=> {self.fAtwistr:>9.3f} rad\n'
 
         for i in self.lpanneaux:
@@ -812,48 +1707,202 @@ class Loadjson:
 
         return self.params
 
-#----- start here
-if __name__ == '__main__':
+#----- liste des fichiers Json à traiter : fichiers, répertoires ou motifs glob
+def listerFichiers(lFIn: list) -> list:
 
-    import doctest
+    """
+        retourne la liste ordonnée et sans doublon des fichiers Json désignés,
+        un répertoire donne ses fichiers *.json, un motif glob ses correspondances,
+        un nom qui ne correspond à rien est conservé pour être signalé en erreur
 
-    (failureCount, testCount) = doctest.testmod(verbose=False)
+        :param: list
+        :rtype: list
 
-    print(f'nombre de tests : {testCount:>3d}, nombre d\'erreurs : {failureCount:>3d}', end='')
+        :Example:
 
-    if failureCount != 0:
-        print(f' --> Arrêt du programme {pathlib.Path(__file__)}')
-        sys.exit(ABNORMAL_TERMINATION)
-    else:
-        print(f' --> All Ok {pathlib.Path(__file__)}')
+        >>> import tempfile
+        >>> sDir = tempfile.mkdtemp()
+        >>> for i in ('b.json', 'a.json', 'c.txt'):
+        ...     open(os.path.join(sDir, i), 'w').close()
+        >>> [os.path.basename(i) for i in listerFichiers([sDir])]
+        ['a.json', 'b.json']
+        >>> [os.path.basename(i) for i in listerFichiers([os.path.join(sDir, '*.json'), os.path.join(sDir, 'a.json')])]
+        ['a.json', 'b.json']
+        >>> listerFichiers(['absent.json'])
+        ['absent.json']
 
-    locale.setlocale(locale.LC_ALL, 'fr_FR.UTF-8')
+    """
 
-    sProg = f'pyjunk.py'
-    sDescription = f'Développé d\'une voile Junk'
-    sEpilog = f'Author : Marc JOURDAIN 2021'
+    lFichiers = []
+    for i in lFIn:
+        if os.path.isdir(i):
+            lFichiers.extend(sorted(glob.glob(os.path.join(i, '*.json'))))
+        elif glob.has_magic(i):
+            lFichiers.extend(sorted(glob.glob(i)))
+        else:
+            lFichiers.append(i)
 
-    parser = argparse.ArgumentParser(prog=sProg,
-                                     description=sDescription,
-                                     epilog=sEpilog)
+    return list(dict.fromkeys(lFichiers))
 
-    msgHelpinJson = f'fichier de paramétrage au format Json'
-    parser.add_argument(f'--fIn',
-                        action='store',
-                        required=True,
-                        help=msgHelpinJson)
+#----- empreinte des entrées d'un traitement : Json, code, versions et options
+def getEmpreinte(sFileIn: str, options: argparse.Namespace) -> str:
 
-    options = parser.parse_args()
+    """
+        retourne l'empreinte (sha256) de tout ce dont dépendent les fichiers générés :
+        le contenu du Json, le code de Pyjunk (les sources du répertoire), les versions
+        de numpy et d'ezdxf et les options qui changent les sorties
+    """
+
+    hashEmpreinte = hashlib.sha256()
+    with open(sFileIn, 'rb') as fileIn:
+        hashEmpreinte.update(fileIn.read())
+    for i in sorted(pathlib.Path(__file__).resolve().parent.glob('*.py')):
+        hashEmpreinte.update(i.name.encode())
+        hashEmpreinte.update(i.read_bytes())
+
+    dictVersions = {}
+    for i in ("numpy", "ezdxf"):
+        try:
+            dictVersions[i] = importlib.metadata.version(i)
+        except importlib.metadata.PackageNotFoundError:
+            dictVersions[i] = None
+    dictOptions = {"solveur": options.solveur,
+                   "stl": not options.dxf_only,
+                   "dxf": not options.stl_only,
+                   "deterministe": options.deterministic,
+                   "versions": dictVersions}
+    hashEmpreinte.update(json.dumps(dictOptions, sort_keys=True).encode())
+
+    return hashEmpreinte.hexdigest()
 
-    print(f'Lecture du fichier Json : {options.fIn}')
+#-----
+def getFichiersSortie(dictVoile: dict, bStl: bool, bDxf: bool) -> tuple:
+
+    """
+        retourne le fichier d'empreinte (à côté du premier fichier généré)
+        et le dict des fichiers générés
+    """
+
+    dictFichiers = {k: dictVoile.get(f'file{k}') for (k, b) in (("stl", bStl), ("dxf", bDxf)) if b}
+    sFichier = next(iter(dictFichiers.values()))
+
+    return (f'{sFichier}.empreinte', dictFichiers)
+
+#-----
+def getSha256(sFichier: str) -> str:
+
+    """ retourne le sha256 du contenu d'un fichier """
+
+    with open(sFichier, 'rb') as fileIn:
+        return hashlib.sha256(fileIn.read()).hexdigest()
+
+#-----
+def estAJour(dictVoile: dict, sEmpreinte: str, bStl: bool, bDxf: bool) -> bool:
+
+    """
+        vrai si le fichier d'empreinte porte la même empreinte et que les fichiers
+        générés sont toujours là, inchangés (même sha256 qu'à leur création)
+
+        :param: dict, str, bool, bool
+        :rtype: bool
+
+        :Example:
+
+        >>> import tempfile
+        >>> sDir = tempfile.mkdtemp()
+        >>> dictVoile = {"filestl": os.path.join(sDir, 'voile.stl')}
+        >>> (sJson, sStl) = (os.path.join(sDir, 'voile.json'), dictVoile["filestl"])
+        >>> for (i, j) in ((sJson, b'{"voile": {}}'), (sStl, b'solid')):
+        ...     with open(i, 'wb') as fileOut:
+        ...         n = fileOut.write(j)
+        >>> options = argparse.Namespace(solveur='table', stl_only=True, dxf_only=False, deterministic=True)
+        >>> sEmpreinte = getEmpreinte(sJson, options)
+        >>> ecrireEmpreinte(dictVoile, sEmpreinte, bStl=True, bDxf=False)
+        >>> sorted(os.listdir(sDir))
+        ['voile.json', 'voile.stl', 'voile.stl.empreinte']
+        >>> estAJour(dictVoile, sEmpreinte, bStl=True, bDxf=False)
+        True
+
+        un octet de plus dans le Json change l'empreinte, un fichier généré modifié n'est plus à jour
+
+        >>> with open(sJson, 'ab') as fileOut:
+        ...     n = fileOut.write(b' ')
+        >>> estAJour(dictVoile, getEmpreinte(sJson, options), bStl=True, bDxf=False)
+        False
+        >>> with open(sStl, 'ab') as fileOut:
+        ...     n = fileOut.write(b' ')
+        >>> estAJour(dictVoile, sEmpreinte, bStl=True, bDxf=False)
+        False
+
+    """
+
+    (fileEmpreinte, dictFichiers) = getFichiersSortie(dictVoile, bStl, bDxf)
+    try:
+
+        with open(fileEmpreinte, 'r') as fileIn:
+            dictEmpreinte = json.load(fileIn)
+        if dictEmpreinte.get("version") != VERSION_EMPREINTE or dictEmpreinte.get("empreinte") != sEmpreinte:
+            return False
+        for (k, v) in dictFichiers.items():
+            if dictEmpreinte["fichiers"][k] != {"nom": v, "sha256": getSha256(v)}:
+                return False
+
+    except (OSError, KeyError, TypeError, json.JSONDecodeError):
+
+        return False
+
+    return True
+
+#-----
+def ecrireEmpreinte(dictVoile: dict, sEmpreinte: str, bStl: bool, bDxf: bool) -> None:
+
+    """ écrit le fichier d'empreinte des fichiers qui viennent d'être générés """
+
+    (fileEmpreinte, dictFichiers) = getFichiersSortie(dictVoile, bStl, bDxf)
+    dictEmpreinte = {"version": VERSION_EMPREINTE,
+                     "empreinte": sEmpreinte,
+                     "fichiers": {k: {"nom": v, "sha256": getSha256(v)} for (k, v) in dictFichiers.items()}}
+    with open(fileEmpreinte, 'w') as fileOut:
+        json.dump(dictEmpreinte, fileOut, indent=4)
+
+#----- traitement complet d'un fichier Json de voile
+def traiterVoile(sFileIn: str, options: argparse.Namespace, cache: ca.Cache,
+                 cachePanneaux: ca.Cachedisque = None) -> dict:
+
+    """
+        lit le Json, calcule la voile et génère les fichiers demandés par les options,
+        une erreur (y compris un sys.exit des classes) n'arrête que cette voile
+        retourne le bilan : statut, temps, triangles, polylignes et le rapport éventuel
+
+        :param: str, argparse.Namespace, Cache, Cachedisque
+        :rtype: dict
+
+    """
+
+    print(f'Lecture du fichier Json : {sFileIn}')
     print()
 
+    # les sorties demandées
+    bStl = not options.dxf_only
+    bDxf = not options.stl_only
+
+    bProfile = options.profile or options.profile_out is not None
+    bTraceAlloc = options.trace_alloc is not None
+    mesures = me.Mesures(bActif=bProfile or options.report is not None,
+                         bTraceAlloc=bTraceAlloc,
+                         nTop=options.trace_alloc if bTraceAlloc else 10)
+
+    dictBilan = {"fIn": sFileIn, "statut": "ok", "message": "", "fTemps": 0.,
+                 "nFacettes": 0, "nPolylignes": 0, "rapport": None}
+    fDebut = time.perf_counter()
+
     # tentative ouverture du fichier fIn
     try:
 
-        fIn = open(f'{options.fIn}', 'r')
-        encode = Loadjson(fileIn=fIn)
-        dictParams = encode.getDict()
+        with mesures.etape("Loadjson"):
+            with open(f'{sFileIn}', 'r') as fIn:
+                encode = Loadjson(fileIn=fIn)
+            dictParams = encode.getDict()
         if "_comment" in dictParams:
             print(f'--> {dictParams["_comment"]}')
         if "_date" in dictParams:
@@ -866,33 +1915,365 @@ if __name__ == '__main__':
             print(f'program aborted')
             sys.exit(ABNORMAL_TERMINATION)
 
-        # Dans un premier temps, on construit la voile de base à partir des données du Json
-        junkSailBase = Saildatas(dictParams["voile"])
-        # Dans un second temps, on reconstruit la voile twistée à partir du dict twisté
-        # renvoyé par la fonction Panneau.applyTwists
-        junkSailTwist = Saildatas(junkSailBase.applyTwists())
+        # si le Json, le code et les options n'ont pas changé, les fichiers sont à jour
+        sEmpreinte = getEmpreinte(sFileIn, options)
+        if options.skip_unchanged and estAJour(dictParams["voile"], sEmpreinte, bStl, bDxf):
+            print(f'Fichiers de "{sFileIn}" --> à jour')
+            dictBilan["statut"] = "à jour"
+            dictBilan["message"] = f'fichiers inchangés'
+            dictBilan["fTemps"] = time.perf_counter() - fDebut
+            return dictBilan
+
+        # Dans un premier temps, on construit la voile à partir des données du Json
+        with mesures.etape("Saildatas"):
+            junkSailTwist = Saildatas(dictParams["voile"])
+        # Dans un second temps, on applique le twist sur place aux extrémités des batons
+        with mesures.etape("applyTwists"):
+            junkSailTwist.applyTwists()
         # Dans un troisième temps, on lance les calculs sur la voile twistée
-        junkSailTwist.startCalcs()
+        with mesures.etape("startCalcs"):
+            junkSailTwist.startCalcs(sSolveur=options.solveur, cache=cache, nJobs=options.jobs,
+                                     bStl=bStl, bDxf=bDxf, cachePanneaux=cachePanneaux)
+
+        print(f'{cache}')
+        if bProfile or options.report is not None:
+            print(f'Chainettes (solveur {options.solveur}) : '
+                  f'itérations zbrac = {junkSailTwist.dictNiters["zbrac"]}, '
+                  f'zbrent = {junkSailTwist.dictNiters["zbrent"]}, '
+                  f'znewton = {junkSailTwist.dictNiters["znewton"]}')
+        if cachePanneaux is not None:
+            print(f'Panneaux recalculés : {sum(junkSailTwist.lRecalculs)}/{len(junkSailTwist.lpanneaux)}, '
+                  f'{cachePanneaux}')
 
-        #print(f'{junkSailBase}')
         #print(f'{junkSailTwist}')
 
         # générer le stl
-        junkSailTwist.createStl()
-
-        # générer le dxf
-        junkSailTwist.createDxf()
+        if bStl:
+            with mesures.etape("createStl"):
+                junkSailTwist.createStl(bMemmap=options.memmap, bDeterministe=options.deterministic)
+
+        # générer le dxf, ezdxf est importé avant l'étape pour que son import n'y soit pas mesuré
+        if bDxf:
+            importEzdxf()
+            with mesures.etape("createDxf"):
+                junkSailTwist.createDxf(bDeterministe=options.deterministic)
+
+        # l'empreinte des entrées, rangée à côté des fichiers générés pour une chaîne de fabrication
+        if options.skip_unchanged or options.deterministic:
+            ecrireEmpreinte(dictParams["voile"], sEmpreinte, bStl, bDxf)
+
+        dictVoile = junkSailTwist.getReport()
+        dictBilan["nFacettes"] = dictVoile["nFacettes"]
+        dictBilan["nPolylignes"] = dictVoile["nPolylignes"]
+
+        if options.report is not None:
+            dictBilan["rapport"] = {"version": 1,
+                                    "fIn": sFileIn,
+                                    "solveur": options.solveur,
+                                    "jobs": options.jobs,
+                                    "etapes": mesures.getEtapes(),
+                                    "voile": dictVoile,
+                                    "fichiers": {k: {"nom": v, "octets": os.path.getsize(v)}
+                                                 for (k, v, b) in (("stl", junkSailTwist.fileStl, bStl),
+                                                                   ("dxf", junkSailTwist.fileDxf, bDxf)) if b},
+                                    "cache": cache.getStats(),
+                                    "cachePanneaux": cachePanneaux.getStats() if cachePanneaux is not None else None,
+                                    "rssMaxKo": me.Mesures.getRssMax()}
+        if bTraceAlloc or bProfile:
+            print()
+            print(f'{mesures}', end='')
 
     except IOError as err:
 
-        print(f'{options.fIn} : No such file')
+        print(f'{sFileIn} : No such file')
         print(f'program aborted')
-        #sys.exit(ABNORMAL_TERMINATION)
+        dictBilan["statut"] = "erreur"
+        dictBilan["message"] = f'{err.strerror}'
+
+    except SystemExit:
+
+        dictBilan["statut"] = "erreur"
+        dictBilan["message"] = f'arrêt du traitement'
+
+    except Exception as err:
+
+        print(f'{sFileIn} : {type(err).__name__} {err}')
+        print(f'program aborted')
+        dictBilan["statut"] = "erreur"
+        dictBilan["message"] = f'{type(err).__name__}'
 
     finally:
 
-        print(f'{options.fIn} --> closed')
+        mesures.stop()
+        print(f'{sFileIn} --> closed')
+        print()
+
+    dictBilan["fTemps"] = time.perf_counter() - fDebut
+
+    return dictBilan
+
+#----- caches des chainettes et des panneaux propres à chaque processus du traitement par lot
+cacheProcess = None
+cachePanneauxProcess = None
+
+#-----
+def createCachePanneaux(options: argparse.Namespace) -> ca.Cachedisque:
+
+    """ retourne le cache disque des panneaux demandé par les options, None sinon """
+
+    if options.dCache is None:
+        return None
+
+    return ca.Cachedisque({"dirCache": options.dCache, "nMaxOctets": options.nCacheMo*1024*1024})
+
+#-----
+def initProcess(options: argparse.Namespace) -> None:
+
+    """
+        initialise un processus du traitement par lot : le cache des chainettes
+        est relu une fois puis sert à toutes les voiles traitées par ce processus,
+        il n'est pas sauvé (seul le processus principal écrit le fichier cache),
+        le répertoire du cache des panneaux est partagé par tous les processus
+    """
+
+    global cacheProcess
+    global cachePanneauxProcess
+
+    locale.setlocale(locale.LC_ALL, 'fr_FR.UTF-8')
+    dictCache = {"nMax": options.nCache}
+    if options.fCache is not None:
+        dictCache["fileCache"] = options.fCache
+    cacheProcess = ca.Cache(dictCache)
+    cacheProcess.load()
+    cachePanneauxProcess = createCachePanneaux(options)
+
+#-----
+def traiterVoileProcess(sFileIn: str, options: argparse.Namespace) -> dict:
+
+    """ traite une voile dans un processus du traitement par lot """
+
+    return traiterVoile(sFileIn, options, cacheProcess, cachePanneauxProcess)
+
+#----- bilan du traitement par lot
+def afficherBilan(lBilans: list) -> int:
+
+    """
+        affiche le bilan du lot (s'il y a plusieurs fichiers) et retourne le code de fin du programme,
+        seules les voiles en erreur font échouer le lot, les fichiers à jour ne sont pas des erreurs
+
+        :param: list
+        :rtype: int
+
+        :Example:
+
+        >>> afficherBilan([{"fIn": "a.json", "statut": "à jour", "message": "", "fTemps": 0.,
+        ...                 "nFacettes": 0, "nPolylignes": 0}])
+        0
+        >>> afficherBilan([{"fIn": "a.json", "statut": "à jour", "message": "fichiers inchangés", "fTemps": 0.,
+        ...                 "nFacettes": 0, "nPolylignes": 0},
+        ...                {"fIn": "b.json", "statut": "erreur", "message": "arrêt du traitement", "fTemps": 0.,
+        ...                 "nFacettes": 0, "nPolylignes": 0}])
+        Fichier  statut  temps (s)   facettes polylignes  message
+        a.json   à jour      0.000          0          0  fichiers inchangés
+        b.json   erreur      0.000          0          0  arrêt du traitement
+        2 fichiers, 0 ok, 1 à jour, 1 en erreur, 0.000 s
+        1
+
+    """
+
+    nErreurs = sum(1 for i in lBilans if i["statut"] == "erreur")
+    nAJour = sum(1 for i in lBilans if i["statut"] == "à jour")
+    if len(lBilans) > 1:
+        nLargeur = max(len('Fichier'), *(len(i["fIn"]) for i in lBilans))
+        print(f'{"Fichier":<{nLargeur}s} {"statut":>7s} {"temps (s)":>10s} {"facettes":>10s} '
+              f'{"polylignes":>10s}  message')
+        for i in lBilans:
+            print(f'{i["fIn"]:<{nLargeur}s} {i["statut"]:>7s} {i["fTemps"]:>10.3f} {i["nFacettes"]:>10d} '
+                  f'{i["nPolylignes"]:>10d}  {i["message"]}')
+        print(f'{len(lBilans)} fichiers, {len(lBilans) - nAJour - nErreurs} ok, {nAJour} à jour, '
+              f'{nErreurs} en erreur, {sum(i["fTemps"] for i in lBilans):.3f} s')
+
+    return NORMAL_TERMINATION if nErreurs == 0 else ABNORMAL_TERMINATION
+
+#----- start here
+if __name__ == '__main__':
+
+    # les doctests ne sont pas lancés ici, voir Tests.py
+    locale.setlocale(locale.LC_ALL, 'fr_FR.UTF-8')
+
+    sProg = f'pyjunk.py'
+    sDescription = f'Développé d\'une voile Junk'
+    sEpilog = f'Author : Marc JOURDAIN 2021'
+
+    parser = argparse.ArgumentParser(prog=sProg,
+                                     description=sDescription,
+                                     epilog=sEpilog)
+
+    msgHelpinJson = f'fichiers de paramétrage au format Json, répertoires (*.json) ou motifs glob'
+    parser.add_argument(f'--fIn',
+                        action='store',
+                        nargs='+',
+                        required=True,
+                        help=msgHelpinJson)
+
+    msgHelpBatchJobs = f'nombre de processus pour traiter les fichiers Json en parallèle (par défaut 1)'
+    parser.add_argument(f'--batch-jobs',
+                        action='store',
+                        type=int,
+                        default=1,
+                        help=msgHelpBatchJobs)
+
+    msgHelpSolveur = f'solveur des chainettes : table (par défaut), newton ou brent'
+    parser.add_argument(f'--solveur',
+                        action='store',
+                        choices=['table', 'newton', 'brent'],
+                        default='table',
+                        help=msgHelpSolveur)
+
+    msgHelpCache = f'fichier cache des chainettes au format Json (conservé d\'une exécution à l\'autre)'
+    parser.add_argument(f'--fCache',
+                        action='store',
+                        default=None,
+                        help=msgHelpCache)
+
+    msgHelpnCache = f'nombre maximal d\'entrées du cache des chainettes (par défaut 100000)'
+    parser.add_argument(f'--nCache',
+                        action='store',
+                        type=int,
+                        default=100000,
+                        help=msgHelpnCache)
+
+    msgHelpdCache = f'répertoire du cache disque des résultats de panneaux (seuls les panneaux modifiés ' \
+                    f'sont recalculés d\'une exécution à l\'autre)'
+    parser.add_argument(f'--dCache',
+                        action='store',
+                        default=None,
+                        help=msgHelpdCache)
+
+    msgHelpnCacheMo = f'taille maximale en Mo du cache disque des panneaux (par défaut 500)'
+    parser.add_argument(f'--nCacheMo',
+                        action='store',
+                        type=int,
+                        default=500,
+                        help=msgHelpnCacheMo)
+
+    msgHelpJobs = f'nombre de processus pour le calcul des panneaux (par défaut 1)'
+    parser.add_argument(f'--jobs',
+                        action='store',
+                        type=int,
+                        default=1,
+                        help=msgHelpJobs)
+
+    msgHelpProfile = f'chronomètre chaque étape (wall et cpu) et exécute le programme sous cProfile'
+    parser.add_argument(f'--profile',
+                        action='store_true',
+                        default=False,
+                        help=msgHelpProfile)
+
+    msgHelpProfileOut = f'fichier pstats de sortie du profilage (implique --profile)'
+    parser.add_argument(f'--profile-out',
+                        action='store',
+                        default=None,
+                        help=msgHelpProfileOut)
+
+    msgHelpReport = f'fichier Json du rapport d\'exécution (étapes, panneaux, sections, fichiers, mémoire)'
+    parser.add_argument(f'--report',
+                        action='store',
+                        default=None,
+                        help=msgHelpReport)
+
+    msgHelpTraceAlloc = f'attribue les allocations mémoire (tracemalloc) à chaque étape et affiche ' \
+                        f'les N lignes source qui allouent le plus (par défaut 10)'
+    parser.add_argument(f'--trace-alloc',
+                        action='store',
+                        type=int,
+                        nargs='?',
+                        const=10,
+                        default=None,
+                        help=msgHelpTraceAlloc)
+
+    groupSorties = parser.add_mutually_exclusive_group()
+    msgHelpStlOnly = f'ne génère que le fichier stl (ni développé, ni ezdxf)'
+    groupSorties.add_argument(f'--stl-only',
+                              action='store_true',
+                              default=False,
+                              help=msgHelpStlOnly)
+    msgHelpDxfOnly = f'ne génère que le fichier dxf (pas de surface 3D)'
+    groupSorties.add_argument(f'--dxf-only',
+                              action='store_true',
+                              default=False,
+                              help=msgHelpDxfOnly)
+
+    msgHelpDeterministic = f'fichiers générés identiques d\'une exécution à l\'autre (dates et GUID fixes)'
+    parser.add_argument(f'--deterministic',
+                        action='store_true',
+                        default=False,
+                        help=msgHelpDeterministic)
+
+    msgHelpSkipUnchanged = f'ne fait rien si le Json, le code et les options n\'ont pas changé depuis ' \
+                           f'la génération des fichiers (fichier .empreinte à côté des sorties)'
+    parser.add_argument(f'--skip-unchanged',
+                        action='store_true',
+                        default=False,
+                        help=msgHelpSkipUnchanged)
+
+    msgHelpMemmap = f'construit le maillage stl directement dans le fichier projeté en mémoire'
+    parser.add_argument(f'--memmap',
+                        action='store_true',
+                        default=False,
+                        help=msgHelpMemmap)
+
+    options = parser.parse_args()
+
+    lFichiers = listerFichiers(options.fIn)
+
+    # le profilage, uniquement si demandé, ne couvre que le processus principal
+    bProfile = options.profile or options.profile_out is not None
+    profiler = cProfile.Profile() if bProfile else None
+    if profiler is not None:
+        profiler.enable()
+
+    # le cache des chainettes, relu depuis le disque s'il est demandé, sert à toutes les voiles
+    dictCache = {"nMax": options.nCache}
+    if options.fCache is not None:
+        dictCache["fileCache"] = options.fCache
+    cacheChainettes = ca.Cache(dictCache)
+    cacheChainettes.load()
+    cachePanneaux = createCachePanneaux(options)
+
+    if options.batch_jobs > 1 and len(lFichiers) > 1:
+        with ProcessPoolExecutor(max_workers=options.batch_jobs,
+                                 initializer=initProcess,
+                                 initargs=(options,)) as executor:
+            lBilans = list(executor.map(traiterVoileProcess, lFichiers, [options]*len(lFichiers)))
+    else:
+        lBilans = [traiterVoile(i, options, cacheChainettes, cachePanneaux) for i in lFichiers]
+
+    cacheChainettes.save()
+
+    if options.report is not None:
+        lRapports = [i["rapport"] for i in lBilans if i["rapport"] is not None]
+        if len(lFichiers) == 1:
+            dictReport = lRapports[0] if len(lRapports) == 1 else None
+        else:
+            dictReport = {"version": 1, "voiles": lRapports}
+        if dictReport is not None:
+            with open(options.report, 'w') as fileReport:
+                json.dump(dictReport, fileReport, indent=4)
+            print(f'Fichier rapport "{options.report}" --> créé')
+
+    if profiler is not None:
+        profiler.disable()
+        statsProfile = pstats.Stats(profiler).sort_stats(pstats.SortKey.CUMULATIVE)
+        if options.profile_out is not None:
+            statsProfile.dump_stats(options.profile_out)
+            print(f'Fichier pstats "{options.profile_out}" --> créé')
+        else:
+            statsProfile.print_stats(20)
+
+    # le bilan du lot
+    nTermination = afficherBilan(lBilans)
 
     print()
     print(f'Fin du programme')
-    sys.exit(NORMAL_TERMINATION)
+    sys.exit(nTermination)
@@ -0,0 +1,190 @@
+#! /bin/env python3
+# -*- coding: utf-8 -*-
+
+################################################################################
+#
+#   This file is part of PYJUNK.
+#
+#   Copyright © 2021 Marc JOURDAIN
+#
+#   Permission is hereby granted, free of charge, to any person obtaining a
+#   copy of this software and associated documentation files (the “Software”),
+#   to deal in the Software without restriction, including without limitation
+#   the rights to use, copy, modify, merge, publish, distribute, sublicense,
+#   and/or sell copies of the Software, and to permit persons to whom the
+#   Software is furnished to do so, subject to the following conditions:
+#
+#   The above copyright notice and this permission notice shall be included
+#   in all copies or substantial portions of the Software.
+#
+#   THE SOFTWARE IS PROVIDED “AS IS”, WITHOUT WARRANTY OF ANY KIND, EXPRESS
+#   OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+#   FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+#   AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+#   LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+#   FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER
+#   DEALINGS IN THE SOFTWARE.
+#
+#   You should have received a copy of the MIT License
+#   along with PYJUNK.  If not, see <https://mit-license.org/>.
+#
+################################################################################
+
+"""
+    Stl.py rassemble la définition des classes:
+        Fichierstl
+"""
+
+import sys
+import pathlib
+from datetime import datetime
+
+import numpy as np
+
+#----- constantes pour finir le programme
+NORMAL_TERMINATION = 0
+ABNORMAL_TERMINATION = 1
+
+#----- une facette du format stl binaire : normale, 3 sommets, attribut (50 octets)
+DTYPE_FACETTE = np.dtype([("normale", "<f4", (3,)),
+                          ("sommets", "<f4", (3, 3)),
+                          ("attribut", "<u2")])
+
+#----- Classe représentant un fichier stl binaire
+class Fichierstl:
+
+    """
+
+        Classe Fichierstl
+        =================
+
+        La classe Fichierstl écrit un fichier stl binaire construit par dict.
+        Entête (80 octets), nombre de facettes (uint32) et facettes (50 octets chacune)
+        forment un seul tableau structuré numpy, rempli sur place puis écrit en une fois.
+        Avec la clé "memmap", ce tableau est directement le fichier projeté en mémoire :
+        le maillage n'existe alors jamais en double dans la RAM.
+
+        :datas:
+
+            self.dictStl:    dict
+            self.fileStl:    str
+            self.nFacettes:  int
+            self.bMemmap:    bool
+            self.dateCreation: datetime
+            self.npBuffer:   np.ndarray
+            self.npSommets:  np.ndarray
+            self.npNormales: np.ndarray
+
+        :Example:
+
+        >>> import os, tempfile
+        >>> fileStl = os.path.join(tempfile.mkdtemp(), 'test.stl')
+        >>> a = Fichierstl({"fileStl": fileStl, "nFacettes": 2})
+        >>> a.npSommets[0] = [[0, 0, 0], [1, 0, 0], [0, 1, 0]]
+        >>> a.npSommets[1] = [[0, 0, 0], [0, 2, 0], [0, 0, 2]]
+        >>> a.compNormales()
+        >>> a.npNormales.tolist()
+        [[0.0, 0.0, 1.0], [4.0, 0.0, 0.0]]
+        >>> a.save()
+        >>> os.path.getsize(fileStl)
+        184
+        >>> npFile = np.fromfile(fileStl, dtype=a.npBuffer.dtype)
+        >>> int(npFile["nFacettes"][0])
+        2
+        >>> print(a)
+        Fichier stl --> 2 facettes, 184 octets, memmap = False
+        >>> b = Fichierstl({"fileStl": fileStl, "nFacettes": 0, "dateCreation": datetime(2000, 1, 1)})
+        >>> bytes(b.npBuffer["entete"][0])
+        b'Pyjunk 2000-01-01 00:00:00 test.stl'
+
+        .. seealso::
+        .. warning:: les normales ne sont pas normées, comme dans numpy-stl
+        .. note::
+        .. todo::
+
+    """
+
+    #-----
+    def __init__(self, dictStl: dict) -> None:
+
+        self.dictStl = dictStl
+
+        # fileStl : obligatoire
+        if "fileStl" in self.dictStl and isinstance(self.dictStl["fileStl"], str):
+            self.fileStl = self.dictStl["fileStl"]
+        else:
+            print(f'< !!!! > Clé "fileStl" absente ou incorrecte pour le fichier stl')
+            print(f'program aborted')
+            sys.exit(ABNORMAL_TERMINATION)
+
+        # nFacettes : obligatoire, entier >= 0
+        if "nFacettes" in self.dictStl and isinstance(self.dictStl["nFacettes"], int) \
+           and self.dictStl["nFacettes"] >= 0:
+            self.nFacettes = self.dictStl["nFacettes"]
+        else:
+            print(f'< !!!! > Clé "nFacettes" absente ou incorrecte pour le fichier stl')
+            print(f'program aborted')
+            sys.exit(ABNORMAL_TERMINATION)
+
+        # memmap : facultatif, faux par défaut
+        self.bMemmap = bool(self.dictStl.get("memmap", False))
+
+        # dateCreation : facultatif, la date de l'entête, maintenant par défaut
+        # (une date fixe rend le fichier identique d'une exécution à l'autre)
+        self.dateCreation = self.dictStl.get("dateCreation", datetime.now())
+
+        dtypeFichier = np.dtype([("entete", "S80"),
+                                 ("nFacettes", "<u4"),
+                                 ("facettes", DTYPE_FACETTE, (self.nFacettes,))])
+        if self.bMemmap:
+            self.npBuffer = np.memmap(self.fileStl, dtype=dtypeFichier, mode='w+', shape=(1,))
+        else:
+            self.npBuffer = np.zeros(1, dtype=dtypeFichier)
+
+        nomFichier = pathlib.Path(self.fileStl).name
+        self.npBuffer["entete"] = f'Pyjunk {self.dateCreation:%Y-%m-%d %H:%M:%S} {nomFichier}'.encode()[:80]
+        self.npBuffer["nFacettes"] = self.nFacettes
+
+        # vues (nFacettes, 3, 3) et (nFacettes, 3) sur le tampon, remplies sur place
+        self.npSommets = self.npBuffer["facettes"][0]["sommets"]
+        self.npNormales = self.npBuffer["facettes"][0]["normale"]
+
+    #-----
+    def compNormales(self) -> None:
+
+        """ calcule en une fois les normales (v1 - v0) ^ (v2 - v0) de toutes les facettes """
+
+        self.npNormales[:] = np.cross(self.npSommets[:, 1] - self.npSommets[:, 0],
+                                      self.npSommets[:, 2] - self.npSommets[:, 0])
+
+    #-----
+    def save(self) -> None:
+
+        """ écrit le tampon dans le fichier en un seul appel (ou vide la projection mémoire) """
+
+        if self.bMemmap:
+            self.npBuffer.flush()
+        else:
+            self.npBuffer.tofile(self.fileStl)
+
+    #-----
+    def __str__(self) -> str:
+
+        return f'Fichier stl --> {self.nFacettes} facettes, {self.npBuffer.nbytes} octets, ' \
+               f'memmap = {self.bMemmap}'
+
+#----- start here
+if __name__ == '__main__':
+
+    import doctest
+
+    (failureCount, testCount) = doctest.testmod(verbose=False)
+
+    print(f'nombre de tests : {testCount:>3d}, nombre d\'erreurs : {failureCount:>3d}', end='')
+
+    if failureCount != 0:
+        print(f' --> Arrêt du programme {pathlib.Path(__file__)}')
+        sys.exit(ABNORMAL_TERMINATION)
+    else:
+        print(f' --> All Ok {pathlib.Path(__file__)}')
+        sys.exit(NORMAL_TERMINATION)
@@ -0,0 +1,401 @@
+#! /bin/env python3
+# -*- coding: utf-8 -*-
+
+################################################################################
+#
+#   This file is part of PYJUNK.
+#
+#   Copyright © 2021 Marc JOURDAIN
+#
+#   Permission is hereby granted, free of charge, to any person obtaining a
+#   copy of this software and associated documentation files (the “Software”),
+#   to deal in the Software without restriction, including without limitation
+#   the rights to use, copy, modify, merge, publish, distribute, sublicense,
+#   and/or sell copies of the Software, and to permit persons to whom the
+#   Software is furnished to do so, subject to the following conditions:
+#
+#   The above copyright notice and this permission notice shall be included
+#   in all copies or substantial portions of the Software.
+#
+#   THE SOFTWARE IS PROVIDED “AS IS”, WITHOUT WARRANTY OF ANY KIND, EXPRESS
+#   OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+#   FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+#   AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+#   LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+#   FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER
+#   DEALINGS IN THE SOFTWARE.
+#
+#   You should have received a copy of the MIT License
+#   along with PYJUNK.  If not, see <https://mit-license.org/>.
+#
+################################################################################
+
+"""
+    Sweep.py rassemble la définition des classes:
+        Sweep
+
+    Balayage de paramètres : à partir d'un Json de voile, chaque variante surcharge
+    quelques paramètres (grille et/ou liste de variantes) et est évaluée dans le même
+    interpréteur. Les panneaux dont les données d'entrée n'ont pas changé sont repris
+    du cache des panneaux, seuls les autres sont recalculés. Les mesures de chaque panneau
+    de chaque variante (longueurs du développé, longueurs de chainettes, surface) sont
+    écrites dans un fichier csv, les fichiers stl et dxf seulement si demandé.
+
+    Une surcharge s'écrit param=v1,v2,... pour la voile (fAtwist, nStepsDxf, nStepsStl)
+    ou param@n=v1,v2,... pour le panneau n (param@* pour tous les panneaux qui ont ce
+    paramètre), le paramètre est cherché dans le panneau (fChainLuff, fChainLeech, fCouture),
+    puis dans son modèle (nameModel) et enfin dans les paramètres du modèle (creuxmax,
+    rpdepth, rpdepthmin, rpdepthmax).
+
+    Usage : src/Sweep.py --fIn voile.json [--grille creuxmax@5=60,80,100 fAtwist=0,5,10]
+                         [--variantes variantes.json] [--fOut sweep.csv] [--dCache cache] [--sorties]
+"""
+
+import sys
+import os
+import io
+import argparse
+import locale
+import contextlib
+import copy
+import csv
+import itertools
+import json
+import time
+
+import Cache as ca
+import Pyjunk as pj
+
+#----- constantes pour finir le programme
+NORMAL_TERMINATION = 0
+ABNORMAL_TERMINATION = 1
+
+#----- les colonnes des mesures d'un panneau dans le fichier csv
+METRIQUES = ("longueurBas", "longueurHaut", "longueurGuindant", "longueurChute", "surface",
+             "chainetteGuindant", "chainetteChute", "chainetteMax")
+
+#----- Classe représentant un balayage de paramètres sur une voile
+class Sweep:
+
+    """
+
+        Classe Sweep
+        ============
+
+        La classe Sweep évalue les variantes d'une voile de base, chaque variante
+        étant un dict surcharge -> valeur. Le cache des chainettes et le cache des
+        panneaux sont partagés par toutes les variantes.
+
+        :datas:
+
+            self.dictSweep:      dict
+            self.dictVoile:      dict
+            self.lvariantes:     list
+            self.sSolveur:       str
+            self.cacheChainettes: Cache
+            self.cachePanneaux:  Cache ou Cachedisque
+
+        :Example:
+
+        >>> a = Sweep({"voile": {"fAtwist": 10.}, "variantes": [{"fAtwist": 0.}]})
+        >>> print(a)
+        Sweep --> 1 variantes, solveur table
+        <BLANKLINE>
+
+        .. seealso:: Pyjunk.Saildatas
+        .. warning::
+        .. note::
+        .. todo::
+
+    """
+
+    #-----
+    def __init__(self, dictSweep: dict) -> None:
+
+        self.dictSweep = dictSweep
+
+        # voile : dict de la voile de base
+        if "voile" in self.dictSweep and isinstance(self.dictSweep["voile"], dict):
+            self.dictVoile = self.dictSweep["voile"]
+        else:
+            print(f'< !!!! > Pas de clé "voile" ou clé incorrecte pour le balayage')
+            print(f'program aborted')
+            sys.exit(ABNORMAL_TERMINATION)
+
+        # variantes : liste de dict, par défaut la seule voile de base
+        self.lvariantes = [{}]
+        if "variantes" in self.dictSweep and isinstance(self.dictSweep["variantes"], list):
+            self.lvariantes = self.dictSweep["variantes"]
+
+        # solveur : "table", "newton" ou "brent", par défaut "table"
+        self.sSolveur = self.dictSweep.get("solveur", "table")
+
+        # les caches partagés par toutes les variantes, celui des panneaux sur disque
+        # si un répertoire est donné (il survit alors d'un balayage à l'autre)
+        self.cacheChainettes = ca.Cache({"nMax": self.dictSweep.get("nCache", 100000)})
+        if "dirCache" in self.dictSweep:
+            self.cachePanneaux = ca.Cachedisque({"dirCache": self.dictSweep["dirCache"]})
+        else:
+            self.cachePanneaux = ca.Cache({"nMax": self.dictSweep.get("nCachePanneaux", 10000)})
+
+    #-----
+    @staticmethod
+    def getVariantes(lGrille: list, lListe: list = None) -> list:
+
+        """
+            retourne les variantes : le produit cartésien des surcharges de la grille
+            (chaque surcharge s'écrit param[@panneau]=v1,v2,...), combiné avec chaque
+            variante de la liste éventuelle
+
+            :param: list, list
+            :rtype: list
+
+            :Example:
+
+            >>> Sweep.getVariantes(["creuxmax@5=60,80", "fAtwist=0,10"])
+            [{'creuxmax@5': 60, 'fAtwist': 0}, {'creuxmax@5': 60, 'fAtwist': 10}, \
+{'creuxmax@5': 80, 'fAtwist': 0}, {'creuxmax@5': 80, 'fAtwist': 10}]
+            >>> Sweep.getVariantes(["fCouture@*=10.5"], [{"fAtwist": 0.}, {"fAtwist": 5.}])
+            [{'fAtwist': 0.0, 'fCouture@*': 10.5}, {'fAtwist': 5.0, 'fCouture@*': 10.5}]
+            >>> Sweep.getVariantes(["creuxmax@5=60,8O"])
+            Traceback (most recent call last):
+            ...
+            SystemExit: 1
+
+        """
+
+        lAxes = []
+        for i in lGrille:
+            (sSurcharge, sep, sValeurs) = i.partition('=')
+            if not sep or not sValeurs:
+                print(f'< !!!! > Surcharge "{i}" incorrecte, param[@panneau]=v1,v2,... attendu')
+                print(f'program aborted')
+                sys.exit(ABNORMAL_TERMINATION)
+            try:
+
+                lAxes.append([(sSurcharge, json.loads(j)) for j in sValeurs.split(',')])
+
+            except json.JSONDecodeError:
+
+                print(f'< !!!! > Valeurs "{sValeurs}" de la surcharge "{sSurcharge}" incorrectes, '
+                      f'valeurs Json attendues')
+                print(f'program aborted')
+                sys.exit(ABNORMAL_TERMINATION)
+
+        lVariantes = []
+        for dictListe in (lListe if lListe else [{}]):
+            for tPoint in itertools.product(*lAxes):
+                lVariantes.append(dict(dictListe, **dict(tPoint)))
+
+        return lVariantes
+
+    #-----
+    @staticmethod
+    def appliquer(dictVoile: dict, dictVariante: dict) -> dict:
+
+        """
+            retourne une copie de la voile où les surcharges de la variante sont appliquées,
+            chaque valeur prend le type (float, int) de la valeur qu'elle remplace,
+            une valeur qui n'est pas un nombre ne peut remplacer un nombre
+
+            :param: dict, dict
+            :rtype: dict
+
+            :Example:
+
+            >>> dictVoile = {"fAtwist": 10., "panneaux": [
+            ...     {"numPanneau": 1, "fCouture": 12., "model": {"nameModel": "ModelFlat"}},
+            ...     {"numPanneau": 2, "fCouture": 12.,
+            ...      "model": {"nameModel": "ModelParabolique", "paramModel": {"rpdepth": 35., "creuxmax": 80.}}}]}
+            >>> a = Sweep.appliquer(dictVoile, {"fAtwist": 5, "creuxmax@*": 60, "fCouture@1": 10})
+            >>> (a["fAtwist"], a["panneaux"][0]["fCouture"], a["panneaux"][1]["model"]["paramModel"])
+            (5.0, 10.0, {'rpdepth': 35.0, 'creuxmax': 60.0})
+            >>> dictVoile["fAtwist"]
+            10.0
+            >>> Sweep.appliquer(dictVoile, {"creuxmax@2": "x"})
+            Traceback (most recent call last):
+            ...
+            SystemExit: 1
+
+        """
+
+        dictCopie = copy.deepcopy(dictVoile)
+
+        for (sSurcharge, valeur) in dictVariante.items():
+
+            (sParam, sep, sPanneau) = sSurcharge.partition('@')
+            if not sep:
+                lDicts = [dictCopie]
+            else:
+                lDicts = [i for i in dictCopie.get("panneaux", [])
+                          if sPanneau == '*' or str(i.get("numPanneau")) == sPanneau]
+                # le paramètre est cherché dans le panneau, son modèle puis les paramètres du modèle
+                lDicts = [next((j for j in (i, i.get("model", {}), i.get("model", {}).get("paramModel", {}))
+                                if sParam in j), None) for i in lDicts]
+                lDicts = [i for i in lDicts if i is not None or sPanneau != '*']
+
+            if not lDicts or None in lDicts or sParam not in lDicts[0]:
+                print(f'< !!!! > Paramètre "{sSurcharge}" absent de la voile')
+                print(f'program aborted')
+                sys.exit(ABNORMAL_TERMINATION)
+
+            for i in lDicts:
+                if isinstance(i[sParam], (int, float)):
+                    if isinstance(valeur, bool) or not isinstance(valeur, (int, float)):
+                        print(f'< !!!! > Valeur {valeur!r} du paramètre "{sSurcharge}" incorrecte, '
+                              f'nombre attendu')
+                        print(f'program aborted')
+                        sys.exit(ABNORMAL_TERMINATION)
+                    i[sParam] = type(i[sParam])(valeur)
+                else:
+                    i[sParam] = valeur
+
+        return dictCopie
+
+    #-----
+    def evaluer(self, dictVariante: dict, sSuffixe: str = None) -> tuple:
+
+        """
+            évalue une variante et retourne la voile calculée et le temps de calcul,
+            avec un suffixe les fichiers stl et dxf de la variante sont générés
+            (nom de base + suffixe), sans suffixe seul le développé est calculé
+        """
+
+        fDeb = time.perf_counter()
+
+        dictVoile = Sweep.appliquer(self.dictVoile, dictVariante)
+        if sSuffixe is not None:
+            for i in ("filestl", "filedxf"):
+                (sBase, sExt) = os.path.splitext(dictVoile[i])
+                dictVoile[i] = f'{sBase}{sSuffixe}{sExt}'
+
+        voile = pj.Saildatas(dictVoile)
+        voile.applyTwists()
+        voile.startCalcs(sSolveur=self.sSolveur, cache=self.cacheChainettes,
+                         bStl=sSuffixe is not None, cachePanneaux=self.cachePanneaux)
+        if sSuffixe is not None:
+            voile.createStl()
+            voile.createDxf()
+
+        return (voile, time.perf_counter() - fDeb)
+
+    #-----
+    def run(self, fileCsv: str, bSorties: bool = False, bVerbeux: bool = False) -> int:
+
+        """
+            évalue toutes les variantes et écrit une ligne csv par panneau de chaque variante :
+            numéro de variante, surcharges, statut, temps, panneau recalculé ou repris, mesures
+            une variante en erreur (sys.exit des classes ou exception) n'arrête pas le balayage
+            retourne le nombre de variantes en erreur
+        """
+
+        lSurcharges = list(dict.fromkeys(k for i in self.lvariantes for k in i))
+        lColonnes = ["variante", *lSurcharges, "statut", "fTemps", "numPanneau", "recalcule", *METRIQUES]
+
+        nErreurs = 0
+        with open(fileCsv, 'w', newline='') as fileOut:
+
+            writer = csv.DictWriter(fileOut, fieldnames=lColonnes)
+            writer.writeheader()
+
+            for (n, i) in enumerate(self.lvariantes):
+
+                dictLigne = {"variante": n, **i}
+                sSuffixe = f'_v{n:03d}' if bSorties else None
+                fileMessages = io.StringIO()
+                try:
+
+                    with contextlib.redirect_stdout(sys.stdout if bVerbeux else fileMessages):
+                        (voile, fTemps) = self.evaluer(i, sSuffixe=sSuffixe)
+
+                except SystemExit:
+
+                    nErreurs += 1
+                    writer.writerow(dict(dictLigne, statut="erreur"))
+                    print(f'variante {n:>4d} {i} --> erreur')
+                    print(f'{fileMessages.getvalue()}', end='')
+                    continue
+
+                except Exception as err:
+
+                    nErreurs += 1
+                    writer.writerow(dict(dictLigne, statut="erreur"))
+                    print(f'variante {n:>4d} {i} --> erreur')
+                    print(f'{fileMessages.getvalue()}', end='')
+                    print(f'{type(err).__name__} {err}')
+                    print(f'program aborted')
+                    continue
+
+                for (panneau, bRecalcule) in zip(voile.lpanneaux, voile.lRecalculs):
+                    writer.writerow(dict(dictLigne, statut="ok", fTemps=fTemps, recalcule=int(bRecalcule),
+                                         **panneau.getMetriques()))
+                print(f'variante {n:>4d} {i} --> {sum(voile.lRecalculs)}/{len(voile.lpanneaux)} '
+                      f'panneaux recalculés en {fTemps:.3f} s')
+
+        print(f'Fichier csv "{fileCsv}" --> créé')
+        print(f'Panneaux  : {self.cachePanneaux}')
+        print(f'Chainettes: {self.cacheChainettes}')
+
+        return nErreurs
+
+    #-----
+    def __str__(self) -> str:
+
+        strMsg = f'Sweep --> {len(self.lvariantes)} variantes, solveur {self.sSolveur}\n'
+        return strMsg
+
+#----- start here
+if __name__ == '__main__':
+
+    # les doctests ne sont pas lancés ici, voir Tests.py
+    locale.setlocale(locale.LC_ALL, 'fr_FR.UTF-8')
+
+    parser = argparse.ArgumentParser(prog='sweep.py',
+                                     description='Balayage de paramètres d\'une voile Junk',
+                                     epilog='Author : Marc JOURDAIN 2021')
+    parser.add_argument('--fIn', required=True,
+                        help='fichier Json de la voile de base')
+    parser.add_argument('--grille', nargs='+', default=[],
+                        help='surcharges param[@panneau]=v1,v2,... dont on fait le produit cartésien')
+    parser.add_argument('--variantes', default=None,
+                        help='fichier Json d\'une liste de variantes (dict surcharge -> valeur)')
+    parser.add_argument('--solveur', choices=['table', 'newton', 'brent'], default='table',
+                        help='solveur des chainettes : table (par défaut), newton ou brent')
+    parser.add_argument('--fOut', default='sweep.csv',
+                        help='fichier csv des mesures (par défaut sweep.csv)')
+    parser.add_argument('--dCache', default=None,
+                        help='répertoire du cache disque des panneaux (conservé d\'un balayage à l\'autre)')
+    parser.add_argument('--sorties', action='store_true', default=False,
+                        help='génère aussi les fichiers stl et dxf de chaque variante (suffixe _vNNN)')
+    parser.add_argument('--verbeux', action='store_true', default=False,
+                        help='affiche les messages de Pyjunk pour chaque variante')
+    options = parser.parse_args()
+
+    try:
+
+        with open(options.fIn, 'r') as fileIn:
+            dictParams = pj.Loadjson(fileIn=fileIn).getDict()
+        lListe = None
+        if options.variantes is not None:
+            with open(options.variantes, 'r') as fileIn:
+                lListe = json.load(fileIn)
+
+    except (IOError, json.JSONDecodeError) as err:
+
+        print(f'{err}')
+        print(f'program aborted')
+        sys.exit(ABNORMAL_TERMINATION)
+
+    dictSweep = {"voile": dictParams.get("voile"),
+                 "variantes": Sweep.getVariantes(options.grille, lListe),
+                 "solveur": options.solveur}
+    if options.dCache is not None:
+        dictSweep["dirCache"] = options.dCache
+    sweep = Sweep(dictSweep)
+    print(f'{sweep}')
+
+    nErreurs = sweep.run(fileCsv=options.fOut, bSorties=options.sorties, bVerbeux=options.verbeux)
+
+    print()
+    print(f'Fin du programme')
+    sys.exit(NORMAL_TERMINATION if nErreurs == 0 else ABNORMAL_TERMINATION)
@@ -0,0 +1,73 @@
+#! /bin/env python3
+# -*- coding: utf-8 -*-
+
+################################################################################
+#
+#   This file is part of PYJUNK.
+#
+#   Copyright © 2021 Marc JOURDAIN
+#
+#   Permission is hereby granted, free of charge, to any person obtaining a
+#   copy of this software and associated documentation files (the “Software”),
+#   to deal in the Software without restriction, including without limitation
+#   the rights to use, copy, modify, merge, publish, distribute, sublicense,
+#   and/or sell copies of the Software, and to permit persons to whom the
+#   Software is furnished to do so, subject to the following conditions:
+#
+#   The above copyright notice and this permission notice shall be included
+#   in all copies or substantial portions of the Software.
+#
+#   THE SOFTWARE IS PROVIDED “AS IS”, WITHOUT WARRANTY OF ANY KIND, EXPRESS
+#   OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+#   FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+#   AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+#   LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+#   FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER
+#   DEALINGS IN THE SOFTWARE.
+#
+#   You should have received a copy of the MIT License
+#   along with PYJUNK.  If not, see <https://mit-license.org/>.
+#
+################################################################################
+
+"""
+    Tests.py lance, dans un seul interpréteur, les doctests de tous les modules de Pyjunk.
+    Les tests ne sont plus exécutés par le programme lui même (voir pyjunk.sh et tests.sh).
+"""
+
+import sys
+import pathlib
+import importlib
+import doctest
+
+sys.path.insert(0, str(pathlib.Path(__file__).resolve().parent))
+
+#----- constantes pour finir le programme
+NORMAL_TERMINATION = 0
+ABNORMAL_TERMINATION = 1
+
+#----- les modules testés, dans l'ordre des dépendances
+MODULES = ("Geom", "Direction", "Models", "Zbrent", "Zbrac", "Znewton", "Cache", "Stl", "Mesures",
+           "Chainette", "Developp", "Pyjunk", "Sweep")
+
+#----- start here
+if __name__ == '__main__':
+
+    nFailures = 0
+    nTests = 0
+    for i in MODULES:
+
+        module = importlib.import_module(i)
+        (failureCount, testCount) = doctest.testmod(module, verbose=False)
+        nFailures += failureCount
+        nTests += testCount
+        print(f'{i:<10s} nombre de tests : {testCount:>3d}, nombre d\'erreurs : {failureCount:>3d}')
+
+    print(f'{"Total":<10s} nombre de tests : {nTests:>3d}, nombre d\'erreurs : {nFailures:>3d}', end='')
+
+    if nFailures != 0:
+        print(f' --> Arrêt du programme {pathlib.Path(__file__)}')
+        sys.exit(ABNORMAL_TERMINATION)
+    else:
+        print(f' --> All Ok {pathlib.Path(__file__)}')
+        sys.exit(NORMAL_TERMINATION)
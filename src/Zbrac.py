@@ -33,11 +33,14 @@
 """
     Zbrac.py rassemble la définition des classes:
         Zbrac
+        ZbracArray
 """
 
 import sys
 import pathlib
 
+import numpy as np
+
 #----- constantes pour finir le programme
 NORMAL_TERMINATION = 0
 ABNORMAL_TERMINATION = 1
@@ -212,6 +215,172 @@ class Zbrac:
 
         return self.nIter
 
+#----- Classe permettant de calculer des encadrements pour un tableau de points
+class ZbracArray:
+
+    """
+
+        Classe ZbracArray
+        =================
+
+        La classe ZbracArray applique la technique de Zbrac à un tableau de points fX
+        Chaque élément a ses propres paramètres (tableaux de même taille que fX),
+        les itérations sont menées simultanément sur tous les éléments non encore encadrés.
+        La fonction doit accepter des tableaux : func(npX, *npParams)
+
+        :datas:
+
+            self.func:     fonction vectorisée
+            self.param:    tuple de np.ndarray
+            self.nError:   int
+            self.npError:  np.ndarray (int)
+            self.npNiters: np.ndarray (int)
+            self.npX0:     np.ndarray
+            self.npX1:     np.ndarray
+
+        :Example:
+
+        >>> def f(x, k): return (2.*x-k)*(2.*x+k)
+        >>> Zc = ZbracArray(f, np.array([1., 2.]))
+        >>> Zc.solve(np.array([5., 5.]), 'C')
+        0
+        >>> Zc.getFresult()
+        (array([0.625, 1.25 ]), array([0.3125, 0.625 ]))
+        >>> Zc.getNiters()
+        array([5, 4])
+
+        .. seealso:: Zbrac
+        .. warning::
+        .. note::
+        .. todo::
+
+    """
+
+    __iter = 20
+    __factor = 2.
+    __sens1 = {'C':1./__factor, 'D':__factor}
+    __sens2 = {'C':__factor, 'D':1./__factor}
+
+    #-----
+    def __init__(self, func, *param) -> None:
+
+        self.func = func
+        self.param = tuple(np.asarray(i, dtype=float) for i in param)
+
+        self.nError = 0
+        self.npError = np.zeros(0, dtype=int)
+        self.npNiters = np.zeros(0, dtype=int)
+
+        self.npX0 = np.zeros(0)
+        self.npX1 = np.zeros(0)
+
+    #-----
+    def solve(self, npX: np.ndarray, sSens: str) -> int:
+
+        """
+            lance le solveur sur un tableau de points de départ
+
+            :param npX: bornes
+            :type npX: np.ndarray
+            :param sSens: sens 'C' croissant 'D' décroissant
+            :type sSens: string
+            :return: 0 ok (tous les éléments encadrés) 1 pas ok
+            :rtype: int
+
+            >>> def f(x, k): return (2.*x-k)*(2.*x+k)
+            >>> Zc = ZbracArray(f, np.array([1., 2.]))
+            >>> Zc.solve(np.array([5., 5.]), 'E')
+            Mauvaise indication du sens
+            1
+            >>> Zc.solve(np.array([-5., -5.]), 'D')
+            0
+            >>> Zc = ZbracArray(f, np.array([1., 1.e12]))
+            >>> Zc.solve(np.array([5., 5.]), 'C')
+            Maximum number of iterations exceeded in zbrac (1 élément(s))
+            1
+            >>> Zc.npError
+            array([0, 1])
+
+        """
+
+        if sSens not in ('C', 'D'):
+
+            print(f'Mauvaise indication du sens')
+            self.nError = 1
+            return self.nError
+
+        self.npX0 = np.array(npX, dtype=float)
+        self.npX1 = self.npX0.copy()
+        self.npNiters = np.ones(self.npX0.shape, dtype=int)
+        self.npError = np.ones(self.npX0.shape, dtype=int)
+
+        # on ne travaille que sur les éléments non encore encadrés
+        npIdx = np.arange(self.npX0.size)
+        npX0 = self.npX0.copy()
+        npY0 = self.func(npX0, *self.param)
+        nIter = 1
+        with np.errstate(over='ignore', invalid='ignore'):
+
+            while nIter < ZbracArray.__iter and npIdx.size > 0:
+
+                npX1 = np.where(npX0*npY0 > 0., npX0*ZbracArray.__sens1[sSens], npX0*ZbracArray.__sens2[sSens])
+                npY1 = self.func(npX1, *(i[npIdx] for i in self.param))
+                nIter += 1
+
+                # les éléments encadrés sont rangés et sortent du calcul
+                npFound = ~(npY0*npY1 > 0.)
+                npDone = npIdx[npFound]
+                self.npX0[npDone] = npX0[npFound]
+                self.npX1[npDone] = npX1[npFound]
+                self.npNiters[npDone] = nIter
+                self.npError[npDone] = 0
+
+                npIdx = npIdx[~npFound]
+                npX0 = npX1[~npFound]
+                npY0 = npY1[~npFound]
+
+        self.npX0[npIdx] = npX0
+        self.npX1[npIdx] = npX0
+        self.npNiters[npIdx] = nIter
+
+        if npIdx.size > 0:
+            print(f'Maximum number of iterations exceeded in zbrac ({npIdx.size} élément(s))')
+            self.nError = 1
+            return self.nError
+
+        self.nError = 0
+        return self.nError
+
+    #-----
+    def getFresult(self) -> (np.ndarray, np.ndarray):
+
+        """
+            retourne le résultat, les 2 tableaux des bornes
+            nécessite d'avoir lancer le solve et d'avoir tester le code erreur
+
+            :param: aucun
+            :return: le résultat
+            :rtype: tuple de 2 np.ndarray
+
+        """
+
+        return (self.npX0, self.npX1)
+
+    #-----
+    def getNiters(self) -> np.ndarray:
+
+        """
+            retourne le nombre d'itérations effectuées par élément
+            nécessite d'avoir lancer le solve et d'avoir tester le code erreur
+
+            :param: aucun
+            :return: le nombre d'itérations
+            :rtype: np.ndarray
+
+        """
+
+        return self.npNiters
+
 #----- start here
 if __name__ == '__main__':
 
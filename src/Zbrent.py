@@ -33,11 +33,14 @@
 """
     Zbrent.py rassemble la définition des classes:
         Zbrent
+        ZbrentArray
 """
 
 import sys
 import pathlib
 
+import numpy as np
+
 #----- constantes pour finir le programme
 NORMAL_TERMINATION = 0
 ABNORMAL_TERMINATION = 1
@@ -286,6 +289,223 @@ class Zbrent:
 
         return self.nIter
 
+#----- Classe pour rechercher les zéros d'une fonction sur un tableau de bornes
+class ZbrentArray:
+
+    """
+
+        Classe ZbrentArray
+        ==================
+
+        La classe ZbrentArray applique l'algorithme de Zbrent à des tableaux de bornes.
+        Chaque élément a ses propres paramètres (tableaux de même taille que les bornes),
+        les itérations de Brent sont menées simultanément sur tous les éléments
+        non encore convergés, les éléments convergés sortent du calcul.
+        La fonction doit accepter des tableaux : func(npX, *npParams)
+
+        :datas:
+
+            self.func:     fonction vectorisée
+            self.fErr:     float
+            self.param:    tuple de np.ndarray
+            self.nError:   int
+            self.npError:  np.ndarray (int)
+            self.npResult: np.ndarray
+            self.npNiters: np.ndarray (int)
+
+        :Example:
+
+        >>> def f(x, k): return (2.*x-k)*(2.*x+k)
+        >>> Zb = ZbrentArray(f, 1.e-8, np.array([1., 2.]))
+        >>> Zb.solve(np.array([0.3, 0.3]), np.array([1.3, 1.3]))
+        0
+        >>> Zb.getFresult()
+        array([0.5, 1. ])
+        >>> Zb.getNiters()
+        array([6, 6])
+
+        .. seealso:: Zbrent
+        .. warning::
+        .. note::
+        .. todo::
+
+    """
+
+    __itmax = 100
+    __eps = 3.e-12
+
+    #-----
+    def __init__(self, func, fErr:float, *param) -> None:
+
+        self.func = func
+        self.fErr = fErr
+        self.param = tuple(np.asarray(i, dtype=float) for i in param)
+
+        self.nError = 0
+        self.npError = np.zeros(0, dtype=int)
+        self.npResult = np.zeros(0)
+        self.npNiters = np.zeros(0, dtype=int)
+
+    #-----
+    def solve(self, npX1: np.ndarray, npX2: np.ndarray) -> int:
+
+        """
+            lance le solveur entre deux tableaux de bornes
+
+            :param npX1: bornes 1
+            :param npX2: bornes 2
+            :type npX1: np.ndarray
+            :type npX2: np.ndarray
+            :return: 0 ok (tous les éléments convergés) 1 pas ok
+            :rtype: int
+
+            >>> def f(x, k): return (2.*x-k)*(2.*x+k)
+            >>> Zb = ZbrentArray(f, 1.e-8, np.array([1., 2., 7.]))
+            >>> Zb.solve(np.array([0.3, 0.3, 0.3]), np.array([1.3, 1.3, 1.3]))
+            a =  [0.3] fa =  [-48.64]
+            b =  [1.3] fb =  [-42.24]
+            error in zbrent (1 élément(s))
+            1
+            >>> Zb.npError
+            array([0, 0, 1])
+
+        """
+
+        npA = np.array(npX1, dtype=float)
+        npB = np.array(npX2, dtype=float)
+
+        self.npResult = npB.copy()
+        self.npNiters = np.zeros(npB.shape, dtype=int)
+        self.npError = np.zeros(npB.shape, dtype=int)
+
+        npFa = self.func(npA, *self.param)
+        npFb = self.func(npB, *self.param)
+
+        # les éléments non encadrés sont en erreur et ne participent pas au calcul
+        npBad = ((npFa > 0.) & (npFb > 0.)) | ((npFa < 0.) & (npFb < 0.))
+        if npBad.any():
+            print('a = ', npA[npBad], 'fa = ', npFa[npBad])
+            print('b = ', npB[npBad], 'fb = ', npFb[npBad])
+            print(f'error in zbrent ({np.count_nonzero(npBad)} élément(s))')
+            self.npError[npBad] = 1
+
+        npIdx = np.flatnonzero(~npBad)
+        npA = npA[npIdx]
+        npB = npB[npIdx]
+        npFa = npFa[npIdx]
+        npFb = npFb[npIdx]
+        npC = npB.copy()
+        npFc = npFb.copy()
+        npD = np.zeros_like(npB)
+        npE = np.zeros_like(npB)
+
+        nIter = 0
+        with np.errstate(divide='ignore', invalid='ignore', over='ignore'):
+
+            while nIter < ZbrentArray.__itmax and npIdx.size > 0:
+
+                # b et c de même signe : on repart de a
+                npSame = ((npFb > 0.) & (npFc > 0.)) | ((npFb < 0.) & (npFc < 0.))
+                npC = np.where(npSame, npA, npC)
+                npFc = np.where(npSame, npFa, npFc)
+                npD = np.where(npSame, npB - npA, npD)
+                npE = np.where(npSame, npD, npE)
+
+                # b doit être la meilleure estimation
+                npSwap = np.abs(npFc) < np.abs(npFb)
+                npA = np.where(npSwap, npB, npA)
+                npB = np.where(npSwap, npC, npB)
+                npC = np.where(npSwap, npA, npC)
+                npFa = np.where(npSwap, npFb, npFa)
+                npFb = np.where(npSwap, npFc, npFb)
+                npFc = np.where(npSwap, npFa, npFc)
+
+                npTol1 = 2.*ZbrentArray.__eps*np.abs(npB) + .5*self.fErr
+                npXm = .5*(npC - npB)
+
+                # les éléments convergés sont rangés et sortent du calcul
+                npConv = (np.abs(npXm) <= npTol1) | (npFb == 0.)
+                if npConv.any():
+                    self.npResult[npIdx[npConv]] = npB[npConv]
+                    self.npNiters[npIdx[npConv]] = nIter
+                    npKeep = ~npConv
+                    npIdx = npIdx[npKeep]
+                    npA, npB, npC = npA[npKeep], npB[npKeep], npC[npKeep]
+                    npD, npE = npD[npKeep], npE[npKeep]
+                    npFa, npFb, npFc = npFa[npKeep], npFb[npKeep], npFc[npKeep]
+                    npTol1, npXm = npTol1[npKeep], npXm[npKeep]
+                    if npIdx.size == 0:
+                        break
+
+                # interpolation inverse quadratique ou sécante si possible, bissection sinon
+                npInterp = (np.abs(npE) >= npTol1) & (np.abs(npFa) > np.abs(npFb))
+                npS = npFb/npFa
+                npQ1 = npFa/npFc
+                npR = npFb/npFc
+                npSecant = npA == npC
+                npP = np.where(npSecant,
+                               2.*npXm*npS,
+                               npS*(2.*npXm*npQ1*(npQ1 - npR) - (npB - npA)*(npR - 1.)))
+                npQ = np.where(npSecant,
+                               1. - npS,
+                               (npQ1 - 1.)*(npR - 1.)*(npS - 1.))
+                npQ = np.where(npP > 0., -npQ, npQ)
+                npP = np.abs(npP)
+
+                npAccept = npInterp & (2.*npP < np.minimum(3.*npXm*npQ - np.abs(npTol1*npQ),
+                                                           np.abs(npE*npQ)))
+                npE = np.where(npAccept, npD, npXm)
+                npD = np.where(npAccept, npP/npQ, npXm)
+
+                npA = npB
+                npFa = npFb
+
+                npB = np.where(np.abs(npD) > npTol1,
+                               npB + npD,
+                               np.where(npXm >= 0., npB + np.abs(npTol1), npB - np.abs(npTol1)))
+
+                npFb = self.func(npB, *(i[npIdx] for i in self.param))
+                nIter += 1
+
+        if npIdx.size > 0:
+            print(f'Maximum number of iterations exceeded in zbrent ({npIdx.size} élément(s))')
+            self.npResult[npIdx] = npB
+            self.npNiters[npIdx] = nIter
+            self.npError[npIdx] = 1
+
+        self.nError = int(self.npError.any())
+        return self.nError
+
+    #-----
+    def getFresult(self) -> np.ndarray:
+
+        """
+            retourne le tableau des résultats
+            nécessite d'avoir lancer le solve et d'avoir tester le code erreur
+
+            :param: aucun
+            :return: le résultat
+            :rtype: np.ndarray
+
+        """
+
+        return self.npResult
+
+    #-----
+    def getNiters(self) -> np.ndarray:
+
+        """
+            retourne le nombre d'itérations effectuées par élément
+            nécessite d'avoir lancer le solve et d'avoir tester le code erreur
+
+            :param: aucun
+            :return: le nombre d'itérations
+            :rtype: np.ndarray
+
+        """
+
+        return self.npNiters
+
 #----- start here
 if __name__ == '__main__':
 
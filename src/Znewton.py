@@ -0,0 +1,260 @@
+#! /bin/env python3
+# -*- coding: utf-8 -*-
+
+################################################################################
+#
+#   This file is part of PYJUNK.
+#
+#   Copyright © 2021 Marc JOURDAIN
+#
+#   Permission is hereby granted, free of charge, to any person obtaining a
+#   copy of this software and associated documentation files (the “Software”),
+#   to deal in the Software without restriction, including without limitation
+#   the rights to use, copy, modify, merge, publish, distribute, sublicense,
+#   and/or sell copies of the Software, and to permit persons to whom the
+#   Software is furnished to do so, subject to the following conditions:
+#
+#   The above copyright notice and this permission notice shall be included
+#   in all copies or substantial portions of the Software.
+#
+#   THE SOFTWARE IS PROVIDED “AS IS”, WITHOUT WARRANTY OF ANY KIND, EXPRESS
+#   OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+#   FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+#   AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+#   LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+#   FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER
+#   DEALINGS IN THE SOFTWARE.
+#
+#   You should have received a copy of the MIT License
+#   along with PYJUNK.  If not, see <https://mit-license.org/>.
+#
+################################################################################
+
+"""
+    Znewton.py rassemble la définition des classes:
+        Znewton
+"""
+
+import sys
+import pathlib
+
+#----- constantes pour finir le programme
+NORMAL_TERMINATION = 0
+ABNORMAL_TERMINATION = 1
+
+#----- Classe pour rechercher le zéro d'une fonction par Newton-Raphson sécurisé
+class Znewton:
+
+    """
+
+        Classe Znewton
+        ==============
+
+        La classe Znewton permet de trouver le zéro d'une fonction dont on connait
+        la dérivée. Cet algorithme est inspiré des Numerical Recipes
+        chapitre 9.4 Newton-Raphson Method Using Derivative (rtsafe)
+        page 366 dans Numerical Recipes in C
+        Le zéro doit être encadré, on part d'un point de départ (par exemple la solution
+        d'un problème voisin) et si un pas de Newton sort de l'encadrement ou ne converge pas
+        assez vite, on fait un pas de bissection.
+
+        :datas:
+
+            self.func:    fonction
+            self.dfunc:   dérivée de la fonction
+            self.fErr:    float
+            self.param:   tuple
+            self.nError:  int
+            self.fResult: float
+            self.nIter:   int
+
+        :Example:
+
+        >>> def f(x): return (2.*x-1.)*(2.*x+1.)
+        >>> def df(x): return 8.*x
+        >>> Zn = Znewton(f, df, 1.e-8)
+        >>> Zn.solve(0.3, 1.3)
+        0
+        >>> Zn.getFresult()
+        0.5
+        >>> Zn.getNiters()
+        5
+        >>> Zn.solve(0.3, 1.3, 0.51)
+        0
+        >>> Zn.getNiters()
+        3
+        >>> Zn.solve(2.,3.)
+        a =  2.0 fa =  15.0
+        b =  3.0 fb =  35.0
+        error in znewton
+        1
+
+        .. seealso:: Zbrent
+        .. warning::
+        .. note::
+        .. todo::
+
+    """
+
+    __itmax = 100
+
+    #-----
+    def __init__(self, func, dfunc, fErr:float, *param) -> None:
+
+        self.func = func
+        self.dfunc = dfunc
+        self.fErr = fErr
+        self.param = param
+
+        self.nError = 0
+        self.fResult = 0.
+        self.nIter = 0
+
+    #-----
+    def solve(self, fX1:float, fX2:float, fX0:float = None) -> int:
+
+        """
+            lance le solveur entre deux bornes à partir d'un point de départ
+            par défaut le point de départ est le milieu des bornes
+
+            :param fX1: borne 1
+            :param fX2: borne 2
+            :param fX0: point de départ
+            :type fX1: float
+            :type fX2: float
+            :type fX0: float
+            :return: 0 ok 1 pas ok
+            :rtype: int
+
+            >>> def f(x): return (2.*x-1.)*(2.*x+1.)
+            >>> def df(x): return 8.*x
+            >>> Zn = Znewton(f, df, 1.e-8)
+            >>> Zn.solve(1.3, 0.3, 5.)
+            0
+            >>> Zn.getFresult()
+            0.5
+
+        """
+
+        self.nIter = 0
+
+        fFl = self.func(fX1, *self.param)
+        fFh = self.func(fX2, *self.param)
+
+        if (fFl > 0. and fFh > 0.) or (fFl < 0. and fFh < 0.):
+
+            print('a = ', fX1, 'fa = ', fFl)
+            print('b = ', fX2, 'fb = ', fFh)
+            print('error in znewton')
+            self.nError = 1
+            return self.nError
+
+        if fFl == 0.:
+            self.fResult = fX1
+            self.nError = 0
+            return self.nError
+
+        if fFh == 0.:
+            self.fResult = fX2
+            self.nError = 0
+            return self.nError
+
+        # orientation de l'encadrement de sorte que f(fXl) < 0
+        if fFl < 0.:
+            fXl = fX1
+            fXh = fX2
+        else:
+            fXl = fX2
+            fXh = fX1
+
+        # point de départ, ramené au milieu s'il est hors de l'encadrement
+        fRts = .5*(fX1 + fX2)
+        if fX0 is not None and min(fX1, fX2) <= fX0 <= max(fX1, fX2):
+            fRts = fX0
+
+        fDxold = abs(fX2 - fX1)
+        fDx = fDxold
+        fF = self.func(fRts, *self.param)
+        fDf = self.dfunc(fRts, *self.param)
+
+        while self.nIter < Znewton.__itmax:
+
+            self.nIter += 1
+
+            # bissection si Newton sort de l'encadrement ou ne décroit pas assez vite
+            if (((fRts - fXh)*fDf - fF)*((fRts - fXl)*fDf - fF) > 0.) or \
+               (abs(2.*fF) > abs(fDxold*fDf)):
+
+                fDxold = fDx
+                fDx = .5*(fXh - fXl)
+                fRts = fXl + fDx
+
+            else:
+
+                fDxold = fDx
+                fDx = fF/fDf
+                fRts -= fDx
+
+            if abs(fDx) < self.fErr:
+
+                self.fResult = fRts
+                self.nError = 0
+                return self.nError
+
+            fF = self.func(fRts, *self.param)
+            fDf = self.dfunc(fRts, *self.param)
+
+            if fF < 0.:
+                fXl = fRts
+            else:
+                fXh = fRts
+
+        print(f'Maximum number of iterations exceeded in znewton')
+        self.nError = 1
+        return self.nError
+
+    #-----
+    def getFresult(self) -> float:
+
+        """
+            retourne le résultat
+            nécessite d'avoir lancer le solve et d'avoir tester le code erreur
+
+            :param: aucun
+            :return: le résultat
+            :rtype: float
+
+        """
+
+        return self.fResult
+
+    #-----
+    def getNiters(self) -> int:
+
+        """
+            retourne le nombre d'itérations effectuées
+            nécessite d'avoir lancer le solve et d'avoir tester le code erreur
+
+            :param: aucun
+            :return: le nombre d'itérations
+            :rtype: int
+
+        """
+
+        return self.nIter
+
+#----- start here
+if __name__ == '__main__':
+
+    import doctest
+
+    (failureCount, testCount) = doctest.testmod(verbose=False)
+
+    print(f'nombre de tests : {testCount:>3d}, nombre d\'erreurs : {failureCount:>3d}', end='')
+
+    if failureCount != 0:
+        print(f' --> Arrêt du programme {pathlib.Path(__file__)}')
+        sys.exit(ABNORMAL_TERMINATION)
+    else:
+        print(f' --> All Ok {pathlib.Path(__file__)}')
+        sys.exit(NORMAL_TERMINATION)
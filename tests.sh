@@ -0,0 +1,7 @@
+#
+# Lanceur des tests de Pyjunk : les doctests de tous les modules dans un seul interpréteur
+#
+
+SRC="./src"
+
+${SRC}/Tests.py
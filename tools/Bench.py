@@ -0,0 +1,214 @@
+#! /bin/env python3
+# -*- coding: utf-8 -*-
+
+################################################################################
+#
+#   This file is part of PYJUNK.
+#
+#   Copyright © 2021 Marc JOURDAIN
+#
+#   Permission is hereby granted, free of charge, to any person obtaining a
+#   copy of this software and associated documentation files (the “Software”),
+#   to deal in the Software without restriction, including without limitation
+#   the rights to use, copy, modify, merge, publish, distribute, sublicense,
+#   and/or sell copies of the Software, and to permit persons to whom the
+#   Software is furnished to do so, subject to the following conditions:
+#
+#   The above copyright notice and this permission notice shall be included
+#   in all copies or substantial portions of the Software.
+#
+#   THE SOFTWARE IS PROVIDED “AS IS”, WITHOUT WARRANTY OF ANY KIND, EXPRESS
+#   OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+#   FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+#   AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+#   LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+#   FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER
+#   DEALINGS IN THE SOFTWARE.
+#
+#   You should have received a copy of the MIT License
+#   along with PYJUNK.  If not, see <https://mit-license.org/>.
+#
+################################################################################
+
+"""
+    Bench.py mesure le temps de chaque étape de Pyjunk sur des voiles synthétiques.
+
+    Les voiles sont générées en mémoire avec les fonctions de CreateJson.py :
+    nPanneaux panneaux empilés, des modèles alternés (tube, parabolique, plat),
+    pour toutes les combinaisons de nPanneaux, nStepsDxf, nStepsStl et fAtwist demandées.
+    Les étapes chronométrées sont : load, twist, startCalcs, createStl, createDxf.
+    Les résultats sont écrits dans un fichier Json (un cas par ligne de "resultats")
+    pour suivre les régressions et les courbes de montée en charge d'un commit à l'autre.
+
+    Usage : tools/Bench.py [--panneaux 1 7 50] [--stepsDxf 5 50 500] [--stepsStl 5 50 500]
+                           [--twist 0 10] [--repeat 1] [--maxFacettes 2000000] [--fOut bench.json]
+"""
+
+import sys
+import os
+import io
+import pathlib
+import argparse
+import contextlib
+import json
+import platform
+import subprocess
+import tempfile
+import time
+from datetime import datetime
+
+pathTools = pathlib.Path(__file__).resolve().parent
+sys.path.insert(0, str(pathTools.parent / 'src'))
+sys.path.insert(0, str(pathTools))
+
+import numpy as np
+
+import CreateJson as cj
+import Pyjunk as pj
+
+#----- constantes pour finir le programme
+NORMAL_TERMINATION = 0
+ABNORMAL_TERMINATION = 1
+
+#----- version du format du fichier de résultats
+VERSION_BENCH = 1
+
+#----- les étapes chronométrées
+ETAPES = ("load", "twist", "startCalcs", "createStl", "createDxf")
+
+#----- les modèles affectés tour à tour aux panneaux
+MODELES = (
+    {"nameModel": "ModelTube", "paramModel": {"rpdepthmin": 15.0, "rpdepthmax": 85.0, "creuxmax": 100.0}},
+    {"nameModel": "ModelParabolique", "paramModel": {"rpdepth": 35.0, "creuxmax": 80.0}},
+    {"nameModel": "ModelFlat"}
+)
+
+#-----
+def createVoile(nPanneaux: int, nStepsDxf: int, nStepsStl: int, fAtwist: float, pathOut: str) -> dict:
+
+    """
+        retourne le dict Json d'une voile synthétique de nPanneaux panneaux de 700 mm,
+        les fichiers dxf et stl sont écrits dans pathOut
+    """
+
+    listeBatonsxyz = [([0., 0., 700.*i], [3480.83, 0., 700.*i + 365.85]) for i in range(nPanneaux + 1)]
+    listePanneauxDesc = [(i + 1, 2.0, 2.0, 12.0, MODELES[i % len(MODELES)]) for i in range(nPanneaux)]
+    dictVoile = {"filedxf": os.path.join(pathOut, 'bench.dxf'),
+                 "filestl": os.path.join(pathOut, 'bench.stl'),
+                 "nStepsDxf": nStepsDxf,
+                 "nStepsStl": nStepsStl,
+                 "fAtwist": fAtwist}
+
+    return cj.createDict(dictVoile, cj.createPanneaux(listePanneauxDesc, cj.createBatons(listeBatonsxyz)),
+                         _comment="voile synthétique (Bench.py)")
+
+#-----
+def runCas(dictGlobal: dict) -> dict:
+
+    """ exécute une fois le pipeline de Pyjunk et retourne le temps (s) de chaque étape """
+
+    dictTemps = {}
+    with contextlib.redirect_stdout(io.StringIO()):
+
+        fDeb = time.perf_counter()
+        voile = pj.Saildatas(json.loads(json.dumps(dictGlobal["voile"])))
+        dictTemps["load"] = time.perf_counter() - fDeb
+
+        fDeb = time.perf_counter()
+        voile.applyTwists()
+        dictTemps["twist"] = time.perf_counter() - fDeb
+
+        fDeb = time.perf_counter()
+        voile.startCalcs()
+        dictTemps["startCalcs"] = time.perf_counter() - fDeb
+
+        fDeb = time.perf_counter()
+        voile.createStl()
+        dictTemps["createStl"] = time.perf_counter() - fDeb
+
+        fDeb = time.perf_counter()
+        voile.createDxf()
+        dictTemps["createDxf"] = time.perf_counter() - fDeb
+
+    return dictTemps
+
+#-----
+def getCommit() -> str:
+
+    """ retourne le commit courant du dépôt, None hors d'un dépôt git """
+
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=pathTools, capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+#-----
+def runBench(options: argparse.Namespace) -> dict:
+
+    """ exécute tous les cas, garde pour chaque étape le meilleur temps des repeat exécutions """
+
+    lResultats = []
+    with tempfile.TemporaryDirectory() as pathOut:
+
+        for nPanneaux in options.panneaux:
+            for nStepsDxf in options.stepsDxf:
+                for nStepsStl in options.stepsStl:
+                    for fAtwist in options.twist:
+
+                        nFacettes = 4*nPanneaux*nStepsDxf*nStepsStl
+                        dictCas = {"nPanneaux": nPanneaux, "nStepsDxf": nStepsDxf, "nStepsStl": nStepsStl,
+                                   "fAtwist": fAtwist, "nFacettes": nFacettes}
+                        if nFacettes > options.maxFacettes:
+                            dictCas["ignore"] = True
+                            lResultats.append(dictCas)
+                            continue
+
+                        dictGlobal = createVoile(nPanneaux, nStepsDxf, nStepsStl, fAtwist, pathOut)
+                        lTemps = [runCas(dictGlobal) for _ in range(options.repeat)]
+                        dictCas["temps"] = {i: min(j[i] for j in lTemps) for i in ETAPES}
+                        dictCas["total"] = sum(dictCas["temps"].values())
+                        lResultats.append(dictCas)
+
+                        print(f'{nPanneaux:>4d} {nStepsDxf:>4d} {nStepsStl:>4d} {fAtwist:>5.1f} '
+                              f'{nFacettes:>9d} ' + ' '.join(f'{dictCas["temps"][i]:>10.4f}' for i in ETAPES) +
+                              f' {dictCas["total"]:>10.4f}')
+
+    return {"version": VERSION_BENCH,
+            "date": f'{datetime.now():%Y-%m-%dT%H:%M:%S}',
+            "commit": getCommit(),
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "machine": platform.machine(),
+            "nCpus": os.cpu_count(),
+            "repeat": options.repeat,
+            "resultats": lResultats}
+
+#----- start here
+if __name__ == '__main__':
+
+    parser = argparse.ArgumentParser(description='Bench de Pyjunk sur des voiles synthétiques')
+    parser.add_argument('--panneaux', type=int, nargs='+', default=[1, 7, 50],
+                        help='nombres de panneaux (1 à 50)')
+    parser.add_argument('--stepsDxf', type=int, nargs='+', default=[5, 50, 500],
+                        help='nombres de subdivisions dxf (5 à 500)')
+    parser.add_argument('--stepsStl', type=int, nargs='+', default=[5, 50, 500],
+                        help='nombres de subdivisions stl (5 à 500)')
+    parser.add_argument('--twist', type=float, nargs='+', default=[0., 10.],
+                        help='angles de twist en degrés (0 à 24)')
+    parser.add_argument('--repeat', type=int, default=1,
+                        help='nombre d\'exécutions par cas, le meilleur temps est gardé')
+    parser.add_argument('--maxFacettes', type=int, default=2000000,
+                        help='les cas de plus de maxFacettes triangles stl sont ignorés')
+    parser.add_argument('--fOut', default='bench.json',
+                        help='fichier Json des résultats')
+    options = parser.parse_args()
+
+    print(f'nPan  Dxf  Stl twist nFacettes ' + ' '.join(f'{i:>10s}' for i in ETAPES) + f' {"total":>10s}')
+    dictBench = runBench(options)
+
+    with open(options.fOut, 'w') as fileOut:
+        json.dump(dictBench, fileOut, indent=4)
+    print(f'Fichier des résultats "{options.fOut}" --> créé')
+
+    sys.exit(NORMAL_TERMINATION)
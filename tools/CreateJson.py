@@ -30,11 +30,16 @@
 #
 ################################################################################
 
+"""
+    CreateJson.py génère le fichier Json de paramétrage d'une voile junk
+    à partir des tables listeBatonsxyz et listePanneauxDesc ci-dessous.
+    Les fonctions createBatons, createPanneaux et createDict sont réutilisables
+    (par exemple par tools/Bench.py pour générer des voiles synthétiques).
+"""
+
 import json
 import locale
 
-locale.setlocale(locale.LC_ALL, 'fr_FR.UTF-8')
-
 # paramétres globaux
 _comment = "paramétrage d'une voile junk (Johanna)"
 _date = "date de création 2021/02/04"
@@ -84,47 +89,79 @@ listePanneauxDesc = [
                         })
 ]
 
-listeBatons = []
-for i in listeBatonsxyz:
-    dictPointGuindant = {"type": "Guindant", "point3D": {"x": i[0][0], "y": i[0][1], "z": i[0][2]}}
-    dictPointChute    = {"type": "Chute",    "point3D": {"x": i[1][0], "y": i[1][1], "z": i[1][2]}}
-    listeBatons.append([dictPointGuindant, dictPointChute])
-
-listePanneaux = []
-j = 0
-for i in listePanneauxDesc:
-    dictPanneau = {}
-    dictPanneau["numPanneau"] = i[0]
-    dictPanneau["batons"] = [{"type": "Bas", "extremites": listeBatons[j]}, {"type": "Haut", "extremites": listeBatons[j+1]}]
-    dictPanneau["_comment-fChainLuff"]  = "Côté guidant pourcentage de fLluff valant creux de la chainette (flottant compris entre >= 0. et <= 10., par défaut 2.)"
-    dictPanneau["fChainLuff"] = i[1]
-    dictPanneau["_comment-fChainLeech"] = "Côté chute pourcentage de fLleech valant creux de la chainette (flottant compris entre >= 0. et <= 10., par défaut 2.)"
-    dictPanneau["fChainLeech"] = i[2]
-    dictPanneau["_comment-fCouture"] = "Largeur de la couture (flottant compris entre >= 0. et <= 24., par défaut 12.°)"
-    dictPanneau["fCouture"] = i[3]
-    dictPanneau["_comment-model"] = "Model tube, un modèle avec un creux donné entre deux positions définies en pourcentage"
-    dictPanneau["model"] = i[4]
-    listePanneaux.append(dictPanneau)
-    j += 1
-
-dictGlobal = {
-    "_comment": _comment,
-    "_date": _date,
-    "_auteur": _auteur,
-    "voile": {
-        "_comment-filedxf": "Ficher dxf de sortie",
-        "filedxf": filedxf,
-        "_comment-filestl": "Ficher stl de sortie",
-        "filestl": filestl,
-        "_comment-nStepsDxf": "Nombre de pas de subdivision (entier compris entre >= 5 et <= 500, par défaut 20)",
-        "nStepsDxf": nStepsDxf,
-        "_comment-nStepsStl": "Nombre de pas de subdivision (entier compris entre >= 5 et <= 500, par défaut 20)",
-        "nStepsStl": nStepsStl,
-        "_comment-fAtwist": "Angle en degrés du vrillage de la voile (flottant compris entre >= 0. et <= 24., par défaut 0°)",
-        "fAtwist": fAtwist,
-        "_comment-panneaux": "Description des différents panneaux du bas vers le haut, chaque panneau est décrit par 2 batons, bas et haut",
-        "panneaux": listePanneaux
+#-----
+def createBatons(listeBatonsxyz: list) -> list:
+
+    """ retourne la liste des couples d'extrémités (guindant, chute) de chaque baton """
+
+    listeBatons = []
+    for i in listeBatonsxyz:
+        dictPointGuindant = {"type": "Guindant", "point3D": {"x": i[0][0], "y": i[0][1], "z": i[0][2]}}
+        dictPointChute    = {"type": "Chute",    "point3D": {"x": i[1][0], "y": i[1][1], "z": i[1][2]}}
+        listeBatons.append([dictPointGuindant, dictPointChute])
+
+    return listeBatons
+
+#-----
+def createPanneaux(listePanneauxDesc: list, listeBatons: list) -> list:
+
+    """ retourne la liste des dict panneaux, le panneau j s'appuie sur les batons j et j+1 """
+
+    listePanneaux = []
+    j = 0
+    for i in listePanneauxDesc:
+        dictPanneau = {}
+        dictPanneau["numPanneau"] = i[0]
+        dictPanneau["batons"] = [{"type": "Bas", "extremites": listeBatons[j]}, {"type": "Haut", "extremites": listeBatons[j+1]}]
+        dictPanneau["_comment-fChainLuff"]  = "Côté guidant pourcentage de fLluff valant creux de la chainette (flottant compris entre >= 0. et <= 10., par défaut 2.)"
+        dictPanneau["fChainLuff"] = i[1]
+        dictPanneau["_comment-fChainLeech"] = "Côté chute pourcentage de fLleech valant creux de la chainette (flottant compris entre >= 0. et <= 10., par défaut 2.)"
+        dictPanneau["fChainLeech"] = i[2]
+        dictPanneau["_comment-fCouture"] = "Largeur de la couture (flottant compris entre >= 0. et <= 24., par défaut 12.°)"
+        dictPanneau["fCouture"] = i[3]
+        dictPanneau["_comment-model"] = "Model tube, un modèle avec un creux donné entre deux positions définies en pourcentage"
+        dictPanneau["model"] = i[4]
+        listePanneaux.append(dictPanneau)
+        j += 1
+
+    return listePanneaux
+
+#-----
+def createDict(dictVoile: dict, listePanneaux: list,
+               _comment: str = _comment, _date: str = _date, _auteur: str = _auteur) -> dict:
+
+    """
+        retourne le dict global du Json
+        dictVoile contient filedxf, filestl, nStepsDxf, nStepsStl et fAtwist
+    """
+
+    return {
+        "_comment": _comment,
+        "_date": _date,
+        "_auteur": _auteur,
+        "voile": {
+            "_comment-filedxf": "Ficher dxf de sortie",
+            "filedxf": dictVoile["filedxf"],
+            "_comment-filestl": "Ficher stl de sortie",
+            "filestl": dictVoile["filestl"],
+            "_comment-nStepsDxf": "Nombre de pas de subdivision (entier compris entre >= 5 et <= 500, par défaut 20)",
+            "nStepsDxf": dictVoile["nStepsDxf"],
+            "_comment-nStepsStl": "Nombre de pas de subdivision (entier compris entre >= 5 et <= 500, par défaut 20)",
+            "nStepsStl": dictVoile["nStepsStl"],
+            "_comment-fAtwist": "Angle en degrés du vrillage de la voile (flottant compris entre >= 0. et <= 24., par défaut 0°)",
+            "fAtwist": dictVoile["fAtwist"],
+            "_comment-panneaux": "Description des différents panneaux du bas vers le haut, chaque panneau est décrit par 2 batons, bas et haut",
+            "panneaux": listePanneaux
+        }
     }
-}
 
-print(f'{json.dumps(dictGlobal, indent=4)}')
\ No newline at end of file
+#----- start here
+if __name__ == '__main__':
+
+    locale.setlocale(locale.LC_ALL, 'fr_FR.UTF-8')
+
+    dictGlobal = createDict({"filedxf": filedxf, "filestl": filestl, "nStepsDxf": nStepsDxf,
+                             "nStepsStl": nStepsStl, "fAtwist": fAtwist},
+                            createPanneaux(listePanneauxDesc, createBatons(listeBatonsxyz)))
+
+    print(f'{json.dumps(dictGlobal, indent=4)}')
@@ -0,0 +1,199 @@
+#! /bin/env python3
+# -*- coding: utf-8 -*-
+
+################################################################################
+#
+#   This file is part of PYJUNK.
+#
+#   Copyright © 2021 Marc JOURDAIN
+#
+#   Permission is hereby granted, free of charge, to any person obtaining a
+#   copy of this software and associated documentation files (the “Software”),
+#   to deal in the Software without restriction, including without limitation
+#   the rights to use, copy, modify, merge, publish, distribute, sublicense,
+#   and/or sell copies of the Software, and to permit persons to whom the
+#   Software is furnished to do so, subject to the following conditions:
+#
+#   The above copyright notice and this permission notice shall be included
+#   in all copies or substantial portions of the Software.
+#
+#   THE SOFTWARE IS PROVIDED “AS IS”, WITHOUT WARRANTY OF ANY KIND, EXPRESS
+#   OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+#   FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+#   AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+#   LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+#   FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER
+#   DEALINGS IN THE SOFTWARE.
+#
+#   You should have received a copy of the MIT License
+#   along with PYJUNK.  If not, see <https://mit-license.org/>.
+#
+################################################################################
+
+"""
+    MicroBench.py mesure le débit (appels/s) et la mémoire allouée par appel des
+    primitives de Pyjunk : Geom, Direction, Developp2D, Chainette, les solveurs et les modèles.
+
+    Chaque primitive est appelée en boucle jusqu'à durer au moins fDuree secondes.
+    La mémoire est mesurée par tracemalloc sur un appel : le pic alloué pendant l'appel
+    et ce qui reste alloué après l'appel, en octets.
+    Pour les primitives vectorisées (Points, Chainettesdict, ...) les valeurs sont ramenées
+    à un élément (colonne nElem) pour comparer directement avec la version objet.
+
+    Usage : tools/MicroBench.py [--filtre <texte>] [--fDuree 0.2] [--fOut microbench.json]
+"""
+
+import sys
+import pathlib
+import argparse
+import json
+import time
+import tracemalloc
+
+pathTools = pathlib.Path(__file__).resolve().parent
+sys.path.insert(0, str(pathTools.parent / 'src'))
+
+import numpy as np
+
+import Geom as ge
+import Direction as di
+import Models as md
+import Zbrac as zc
+import Zbrent as zb
+import Znewton as zn
+import Chainette as ch
+import Developp as de
+
+#----- constantes pour finir le programme
+NORMAL_TERMINATION = 0
+ABNORMAL_TERMINATION = 1
+
+#----- version du format du fichier de résultats
+VERSION_MICROBENCH = 1
+
+#----- nombre d'éléments des primitives vectorisées
+N_ELEM = 1000
+
+#-----
+def createPrimitives() -> list:
+
+    """ retourne la liste des (nom, nElem, fonction sans argument) à mesurer """
+
+    p3dA = ge.Point3D(fX=10., fY=20., fZ=30.)
+    p3dB = ge.Point3D(fX=40., fY=-20., fZ=35.)
+    v3d = ge.Vect3D(fX=1., fY=2., fZ=3.)
+    endroit3DA = di.Endroit3D({"point3D": {"x": 10., "y": 20., "z": 30.}})
+    endroit3DB = di.Endroit3D({"point3D": {"x": 40., "y": -20., "z": 35.}})
+    endroit2DDeb = di.Endroit2D({"point2D": {"x": 0., "y": 100.}})
+    endroit2DFin = di.Endroit2D({"point2D": {"x": 50., "y": 102.}})
+    dictCalc = {"c0": ge.Point2D(fX=0., fY=0.), "r0": 110., "c1": ge.Point2D(fX=0., fY=100.), "r1": 52.}
+    dictCouture = {"endroitDeb": endroit2DDeb, "endroitFin": endroit2DFin, "fCouture": 12.}
+
+    npRng = np.random.default_rng(0)
+    pointsA = ge.Points(npRng.uniform(-1000., 1000., (N_ELEM, 3)))
+    pointsB = ge.Points(npRng.uniform(-1000., 1000., (N_ELEM, 3)))
+    npAth = npRng.uniform(-0.5, 0.5, N_ELEM)
+
+    fDist = 8.87136508906719
+    chainette = ch.Chainettedict({"creux": 1., "ecartement": fDist})
+    zBrac = zc.Zbrac(chainette.compBis, fDist)
+    zBrac.solve(fDist/2., "D")
+    (fX1, fX2) = zBrac.getFresult()
+    npDist = npRng.uniform(1000., 4000., N_ELEM)
+    npCreux = npDist*npRng.uniform(0.01, 0.1, N_ELEM)
+
+    lModeles = [md.ModelSwitch({"nameModel": "ModelFlat"}).getModel(),
+                md.ModelSwitch({"nameModel": "ModelParabolique",
+                                "paramModel": {"rpdepth": 35.0, "creuxmax": 80.0}}).getModel(),
+                md.ModelSwitch({"nameModel": "ModelTube",
+                                "paramModel": {"rpdepthmin": 15.0, "rpdepthmax": 85.0, "creuxmax": 100.0}}).getModel()]
+
+    lPrimitives = [
+        ("Geom.Point3D.dist3d",              1,      lambda: p3dA.dist3d(p3dB)),
+        ("Geom.Points.dist",                 N_ELEM, lambda: pointsA.dist(pointsB)),
+        ("Geom.Vect3D.rot3dz",               1,      lambda: v3d.rot3dz(ath=0.1)),
+        ("Geom.Points.rot3dz",               N_ELEM, lambda: pointsA.rot3dz(ath=npAth)),
+        ("Direction.Endroit3D.lin3d",        1,      lambda: di.Endroit3D(endroit3DA.lin3d(k=0.3, endroit3D=endroit3DB))),
+        ("Direction.Endroit3D.linEndroit3D", 1,      lambda: endroit3DA.linEndroit3D(k=0.3, endroit3D=endroit3DB)),
+        ("Developp.Developp2D.calc",         1,      lambda: de.Developp2D.calc(dictCalc=dictCalc)),
+        ("Developp.Developp2D.couture",      1,      lambda: de.Developp2D.couture(dictCouture=dictCouture)),
+        ("Chainette.Chainettedict(table)",   1,      lambda: ch.Chainettedict({"creux": 1., "ecartement": fDist})),
+        ("Chainette.Chainettedict(newton)",  1,      lambda: ch.Chainettedict({"creux": 1., "ecartement": fDist,
+                                                                             "solveur": "newton"})),
+        ("Chainette.Chainettedict(brent)",   1,      lambda: ch.Chainettedict({"creux": 1., "ecartement": fDist,
+                                                                             "solveur": "brent"})),
+        ("Chainette.Chainettesdict",         N_ELEM, lambda: ch.Chainettesdict({"ecartement": npDist,
+                                                                               "creux": npCreux})),
+        ("Zbrac.Zbrac.solve",                1,      lambda: zc.Zbrac(chainette.compBis, fDist).solve(fDist/2., "D")),
+        ("Zbrent.Zbrent.solve",              1,      lambda: zb.Zbrent(chainette.compBis, 1.e-8, fDist).solve(fX1, fX2)),
+        ("Znewton.Znewton.solve",            1,      lambda: zn.Znewton(chainette.compBis, chainette.compBisDeriv,
+                                                                        1.e-8, fDist).solve(fX1, fX2, fDist)),
+    ]
+    for i in lModeles:
+        lPrimitives.append((f'Models.{type(i).__name__}.getCreux', 1, lambda i=i: i.getCreux(0.37)))
+
+    return lPrimitives
+
+#-----
+def mesure(fonction, fDuree: float) -> dict:
+
+    """
+        retourne le nombre d'appels par seconde et la mémoire (octets) allouée par appel :
+        le pic pendant l'appel et ce qui reste alloué après
+    """
+
+    fonction()
+
+    # on double le nombre d'appels jusqu'à durer au moins fDuree
+    nAppels = 1
+    while True:
+        fDeb = time.perf_counter()
+        for _ in range(nAppels):
+            fonction()
+        fTemps = time.perf_counter() - fDeb
+        if fTemps >= fDuree:
+            break
+        nAppels *= 2
+
+    tracemalloc.start()
+    tracemalloc.reset_peak()
+    (nAvant, _) = tracemalloc.get_traced_memory()
+    resultat = fonction()
+    (nApres, nPic) = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del resultat
+
+    return {"appelsParSeconde": nAppels/fTemps, "octetsPic": nPic - nAvant, "octetsRetenus": nApres - nAvant}
+
+#----- start here
+if __name__ == '__main__':
+
+    parser = argparse.ArgumentParser(description='Micro bench des primitives de Pyjunk')
+    parser.add_argument('--filtre', default='',
+                        help='ne mesure que les primitives dont le nom contient ce texte')
+    parser.add_argument('--fDuree', type=float, default=0.2,
+                        help='durée minimale (s) de mesure de chaque primitive')
+    parser.add_argument('--fOut', default=None,
+                        help='fichier Json des résultats (facultatif)')
+    options = parser.parse_args()
+
+    print(f'{"primitive":<36s} {"nElem":>6s} {"appels/s":>12s} {"µs/elem":>9s} '
+          f'{"pic o/elem":>11s} {"retenu o/elem":>14s}')
+
+    lResultats = []
+    for (sNom, nElem, fonction) in createPrimitives():
+        if options.filtre not in sNom:
+            continue
+        dictMesure = mesure(fonction, options.fDuree)
+        fElemParSeconde = dictMesure["appelsParSeconde"]*nElem
+        print(f'{sNom:<36s} {nElem:>6d} {dictMesure["appelsParSeconde"]:>12.0f} {1.e6/fElemParSeconde:>9.3f} '
+              f'{dictMesure["octetsPic"]/nElem:>11.1f} {dictMesure["octetsRetenus"]/nElem:>14.1f}')
+        lResultats.append({"primitive": sNom, "nElem": nElem, **dictMesure})
+
+    if options.fOut is not None:
+        with open(options.fOut, 'w') as fileOut:
+            json.dump({"version": VERSION_MICROBENCH, "fDuree": options.fDuree, "resultats": lResultats},
+                      fileOut, indent=4)
+        print(f'Fichier des résultats "{options.fOut}" --> créé')
+
+    sys.exit(NORMAL_TERMINATION)
@@ -0,0 +1,94 @@
+#! /bin/env python3
+# -*- coding: utf-8 -*-
+"""
+    SkipUnchanged.py vérifie de bout en bout le mode --skip-unchanged de Pyjunk.
+
+    Le Json donné est copié dans un répertoire temporaire (sorties comprises), Pyjunk est lancé
+    2 fois avec --deterministic --skip-unchanged : les 2 exécutions doivent finir normalement
+    (code 0), la seconde ne rien recalculer (fichiers à jour) et les fichiers générés
+    doivent rester identiques.
+
+    Usage : tools/SkipUnchanged.py [--fIn examples/johanna.json] [--stl-only]
+"""
+
+import sys
+import os
+import pathlib
+import argparse
+import hashlib
+import json
+import subprocess
+import tempfile
+
+pathTools = pathlib.Path(__file__).resolve().parent
+filePyjunk = pathTools.parent / 'src' / 'Pyjunk.py'
+
+#----- constantes pour finir le programme
+NORMAL_TERMINATION = 0
+ABNORMAL_TERMINATION = 1
+
+#-----
+def getSha256(sFichier: str) -> str:
+
+    """ retourne le sha256 du contenu d'un fichier """
+
+    with open(sFichier, 'rb') as fileIn:
+        return hashlib.sha256(fileIn.read()).hexdigest()
+
+#-----
+def lancer(lArgs: list) -> subprocess.CompletedProcess:
+
+    """ lance Pyjunk avec les arguments lArgs et retourne le processus terminé """
+
+    return subprocess.run([sys.executable, str(filePyjunk), *lArgs], capture_output=True, text=True)
+
+#----- start here
+if __name__ == '__main__':
+
+    parser = argparse.ArgumentParser(description='Vérification de bout en bout de --skip-unchanged')
+    parser.add_argument('--fIn', default=str(pathTools.parent / 'examples' / 'johanna.json'),
+                        help='fichier Json de la voile (par défaut examples/johanna.json)')
+    parser.add_argument('--stl-only', action='store_true', default=False,
+                        help='ne génère que le fichier stl')
+    options = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as sDir:
+
+        with open(options.fIn, 'r') as fileIn:
+            dictJson = json.load(fileIn)
+        lSorties = ["filestl"] if options.stl_only else ["filestl", "filedxf"]
+        for i in lSorties:
+            dictJson["voile"][i] = os.path.join(sDir, os.path.basename(dictJson["voile"][i]))
+        fileJson = os.path.join(sDir, os.path.basename(options.fIn))
+        with open(fileJson, 'w') as fileOut:
+            json.dump(dictJson, fileOut, indent=4)
+
+        lArgs = ['--fIn', fileJson, '--deterministic', '--skip-unchanged']
+        if options.stl_only:
+            lArgs.append('--stl-only')
+
+        lErreurs = []
+        lEmpreintes = []
+        for n in range(2):
+            processus = lancer(lArgs)
+            print(f'exécution {n + 1} --> code {processus.returncode}')
+            if processus.returncode != NORMAL_TERMINATION:
+                lErreurs.append(f'exécution {n + 1} : code {processus.returncode}\n{processus.stdout}'
+                                f'{processus.stderr}')
+            lEmpreintes.append([getSha256(dictJson["voile"][i]) for i in lSorties
+                                if os.path.exists(dictJson["voile"][i])])
+
+        if '--> à jour' not in processus.stdout:
+            lErreurs.append(f'la seconde exécution a recalculé la voile')
+        if lEmpreintes[0] != lEmpreintes[1] or len(lEmpreintes[1]) != len(lSorties):
+            lErreurs.append(f'les fichiers générés ont changé entre les 2 exécutions')
+
+    for i in lErreurs:
+        print(f'< !!!! > {i}')
+
+    if lErreurs:
+        print(f'program aborted')
+        sys.exit(ABNORMAL_TERMINATION)
+
+    print(f'--skip-unchanged --> Ok')
+    sys.exit(NORMAL_TERMINATION)